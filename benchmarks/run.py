@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Benchmark the portfolio pipeline on synthetic data.
+
+Times (best of --repeat runs) and measures the peak Python heap (tracemalloc,
+one extra run) of each stage at the requested sizes, then compares the
+results with benchmarks/baselines.json. Any stage that got slower or
+hungrier than its baseline by more than the tolerance fails the run.
+
+Usage:
+    python benchmarks/run.py                        # 1k and 10k against the baselines
+    python benchmarks/run.py --sizes 1k,10k,100k,1m
+    python benchmarks/run.py --only generate_html --save
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import synthetic  # noqa: E402
+
+BASELINES = Path(__file__).parent / "baselines.json"
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SIZES = "1k,10k"
+
+# Differences below these are noise, whatever the ratio
+MIN_SECONDS_DELTA = 0.005
+MIN_MB_DELTA = 1.0
+
+Setup = Callable[[int, Path], Callable[[], Any]]
+
+
+def bench_save_portfolio(count: int, workdir: Path) -> Callable[[], Any]:
+    """PortfolioUpdater._save_portfolio: streamed JSON, split files, snapshot."""
+    import update_portfolio_repos as updater_module
+    updater_module.PORTFOLIO_JSON = workdir / "portfolio.json"
+    updater_module.PORTFOLIO_SNAPSHOT = workdir / "portfolio.snap"
+    updater_module.CACHE_DIR = workdir / "cache"
+    updater = updater_module.PortfolioUpdater()
+    updater.portfolio_data = synthetic.portfolio(count)
+    return updater._save_portfolio
+
+
+def bench_user_portal(count: int, workdir: Path) -> Callable[[], Any]:
+    """generate_user_portal_data: grouping projects by account."""
+    import update_portfolio_repos as updater_module
+    for source in synthetic.SOURCES:
+        os.environ[f"{source.upper()}_USERNAME"] = f"bench-{source}"
+    data = synthetic.portfolio(count)
+    return lambda: updater_module.generate_user_portal_data(data)
+
+
+def bench_generate_html(count: int, workdir: Path) -> Callable[[], Any]:
+    """scripts/generate_portfolio.py::generate_html: the single-page site."""
+    import generate_portfolio
+    generate_portfolio.TEMPLATE_HTML = str(ROOT / "portfolio_template.html")
+    generate_portfolio.OUTPUT_HTML = str(workdir / "index.html")
+    data = synthetic.portfolio(count)
+    return lambda: generate_portfolio.generate_html(data)
+
+
+def _generator(output_dir: Path, cache_dir: Path, projects: List[Dict[str, Any]]):
+    from digitname.portfolio import PortfolioGenerator
+    generator = PortfolioGenerator({"output_dir": output_dir, "cache_dir": cache_dir})
+    generator._fetch_github_projects = lambda username: [dict(p) for p in projects]
+    return generator
+
+
+def bench_portfolio_generate(count: int, workdir: Path) -> Callable[[], Any]:
+    """PortfolioGenerator.generate: a full build into an empty directory."""
+    projects = synthetic.generator_projects(count)
+    builds = iter(range(1_000_000))
+
+    def run():
+        build = workdir / f"build-{next(builds)}"
+        generator = _generator(build / "site", build / "cache", projects)
+        generator.generate({"github": {"username": "bench"}})
+    return run
+
+
+def bench_portfolio_regenerate(count: int, workdir: Path) -> Callable[[], Any]:
+    """PortfolioGenerator.generate after one project changed."""
+    projects = synthetic.generator_projects(count)
+    generator = _generator(workdir / "site", workdir / "cache", projects)
+    generator.generate({"github": {"username": "bench"}})
+
+    def run():
+        projects[count // 2]["stars"] += 1
+        generator.generate({"github": {"username": "bench"}})
+    return run
+
+
+def bench_api_portfolio(count: int, workdir: Path) -> Callable[[], Any]:
+    """GET /api/portfolio with the store loaded."""
+    from fastapi.testclient import TestClient
+
+    from digitname import main
+    from digitname.jsonstream import write_json
+    from digitname.store import PortfolioStore
+
+    path = workdir / "portfolio.json"
+    write_json(path, synthetic.portfolio(count))
+    main.portfolio_store = PortfolioStore(path, check_interval=3600)
+    main.portfolio_store.get()
+    client = TestClient(main.app)
+
+    def run():
+        response = client.get("/api/portfolio")
+        assert response.status_code == 200
+    return run
+
+
+#: name -> (setup, largest size it is run at)
+BENCHMARKS: Dict[str, Any] = {
+    "save_portfolio": (bench_save_portfolio, 1_000_000),
+    "user_portal": (bench_user_portal, 1_000_000),
+    "generate_html": (bench_generate_html, 1_000_000),
+    # One page per project; a million pages is a job for the build farm
+    "portfolio_generate": (bench_portfolio_generate, 100_000),
+    "portfolio_regenerate": (bench_portfolio_regenerate, 100_000),
+    "api_portfolio": (bench_api_portfolio, 1_000_000),
+}
+
+
+def measure(setup: Setup, count: int, repeat: int) -> Dict[str, float]:
+    """Best time of ``repeat`` runs and the traced heap peak of one more."""
+    with tempfile.TemporaryDirectory() as tmp, \
+            contextlib.redirect_stdout(io.StringIO()):
+        run = setup(count, Path(tmp))
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            started = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - started)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"seconds": round(min(times), 4), "peak_mb": round(peak / 2**20, 2)}
+
+
+def regressions(key: str, result: Dict[str, float], baseline: Dict[str, float],
+                time_tolerance: float, memory_tolerance: float) -> List[str]:
+    """Descriptions of the ways ``result`` is worse than ``baseline``."""
+    found = []
+    seconds, base_seconds = result["seconds"], baseline.get("seconds")
+    if (base_seconds is not None and seconds > base_seconds * (1 + time_tolerance)
+            and seconds - base_seconds > MIN_SECONDS_DELTA):
+        found.append(f"{key}: {seconds:.4f}s vs baseline {base_seconds:.4f}s")
+    peak, base_peak = result["peak_mb"], baseline.get("peak_mb")
+    if (base_peak is not None and peak > base_peak * (1 + memory_tolerance)
+            and peak - base_peak > MIN_MB_DELTA):
+        found.append(f"{key}: {peak:.2f} MB vs baseline {base_peak:.2f} MB")
+    return found
+
+
+def load_baselines() -> Dict[str, Any]:
+    try:
+        with open(BASELINES, encoding="utf-8") as f:
+            return json.load(f).get("results", {})
+    except FileNotFoundError:
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the portfolio pipeline on synthetic data.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma-separated sizes out of {', '.join(SIZES)} "
+                             "(default: %(default)s)")
+    parser.add_argument("--only", help="comma-separated benchmark names")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed runs per benchmark (default: %(default)s)")
+    parser.add_argument("--time-tolerance", type=float, default=0.5,
+                        help="allowed slowdown over the baseline "
+                             "(default: %(default)s)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.2,
+                        help="allowed memory growth over the baseline "
+                             "(default: %(default)s)")
+    parser.add_argument("--save", action="store_true",
+                        help="store the results as the new baselines")
+    args = parser.parse_args()
+
+    try:
+        sizes = [(label, SIZES[label])
+                 for label in args.sizes.lower().split(",") if label]
+    except KeyError as e:
+        parser.error(f"unknown size {e}; choose from {', '.join(SIZES)}")
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark {', '.join(unknown)}; "
+                     f"choose from {', '.join(BENCHMARKS)}")
+
+    baselines = load_baselines()
+    results: Dict[str, Dict[str, float]] = {}
+    failures: List[str] = []
+
+    print(f"⏱️  {'benchmark':<32} {'seconds':>10} {'peak MB':>10}   baseline")
+    for name in names:
+        setup, max_count = BENCHMARKS[name]
+        for label, count in sizes:
+            if count > max_count:
+                continue
+            key = f"{name}@{label}"
+            result = results[key] = measure(setup, count, args.repeat)
+            baseline = baselines.get(key)
+            found = regressions(key, result, baseline, args.time_tolerance,
+                                args.memory_tolerance) if baseline else []
+            failures.extend(found)
+            status = "❌" if found else ("✅" if baseline else "🆕")
+            reference = (f"{baseline['seconds']:.4f}s / {baseline['peak_mb']:.2f} MB"
+                         if baseline else "-")
+            print(f"{status} {key:<32} {result['seconds']:>10.4f} "
+                  f"{result['peak_mb']:>10.2f}   {reference}")
+
+    if args.save:
+        merged = {**baselines, **results}
+        with open(BASELINES, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": dict(sorted(merged.items())),
+            }, f, indent=2)
+            f.write("\n")
+        print(f"💾 Saved {len(results)} baselines to {BASELINES}")
+    elif failures:
+        print("\n❌ Performance regressions:")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
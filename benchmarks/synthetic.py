@@ -0,0 +1,107 @@
+"""
+Synthetic portfolio data at arbitrary scale.
+
+Records follow the shapes the real pipeline produces: ``portfolio.json``
+projects as written by ``scripts/update_portfolio_repos.py``, ``data.json``
+domain entries, and the provider records ``PortfolioGenerator`` renders. The
+same ``seed`` always yields the same data.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+SOURCES = ("github", "gitlab", "npm", "pypi", "dockerhub", "huggingface", "packagist")
+LANGUAGES = ("Python", "JavaScript", "TypeScript", "Go", "Rust", "PHP", "Shell", None)
+WORDS = (
+    "api", "async", "cache", "cli", "cloud", "data", "domain", "engine", "fast",
+    "graph", "http", "json", "kit", "lite", "monitor", "parser", "portal", "query",
+    "render", "search", "server", "stream", "sync", "tool", "web", "prywatność",
+    "zażółć", "analiza", "moduł",
+)
+THEMES = ("Blog", "E-commerce", "Portfolio", "SaaS", "Landing page", "Documentation")
+TECHNOLOGIES = (
+    "React", "Vue", "Angular", "Django", "FastAPI", "Cloudflare", "Open Graph",
+    "JSON-LD",
+)
+
+EPOCH = datetime(2024, 1, 1)
+
+
+def _words(rng: random.Random, count: int) -> List[str]:
+    return [rng.choice(WORDS) for _ in range(count)]
+
+
+def _timestamp(rng: random.Random) -> str:
+    moment = EPOCH - timedelta(seconds=rng.randrange(3 * 365 * 86400))
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def portfolio(count: int, seed: int = 0) -> Dict[str, Any]:
+    """A ``portfolio.json`` document with ``count`` projects."""
+    rng = random.Random(seed)
+    projects = []
+    for index in range(count):
+        source = SOURCES[index % len(SOURCES)]
+        name = f"{'-'.join(_words(rng, 2))}-{index}"
+        projects.append({
+            "name": name,
+            "full_name": f"user/{name}",
+            "description": " ".join(_words(rng, rng.randint(4, 20))).capitalize() + ".",
+            "url": f"https://example.com/{source}/{name}",
+            "language": rng.choice(LANGUAGES),
+            "stars": int(rng.paretovariate(1.2)) - 1,
+            "forks": rng.randrange(50),
+            "topics": _words(rng, rng.randint(0, 5)),
+            "updated_at": _timestamp(rng),
+            "source": source,
+        })
+    projects.sort(key=lambda p: p["updated_at"], reverse=True)
+    by_source: Dict[str, int] = {}
+    for project in projects:
+        by_source[project["source"]] = by_source.get(project["source"], 0) + 1
+    return {
+        "last_updated": EPOCH.isoformat(),
+        "projects": projects,
+        "stats": {"total_projects": count, "sources": by_source},
+    }
+
+
+def domains(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """``data.json`` entries for ``count`` domains."""
+    rng = random.Random(seed)
+    entries = []
+    for index in range(count):
+        domain = f"{rng.choice(WORDS)}{index}.com".replace("ż", "z").replace("ó", "o")
+        entries.append({
+            "domain": domain,
+            "url": f"https://www.{domain}",
+            "thumbnail": f"thumbnails/www_{domain.replace('.', '_')}.png",
+            "theme": rng.choice(THEMES),
+            "keywords": _words(rng, 10),
+            "technologies": rng.sample(TECHNOLOGIES, 4),
+            "last_updated": _timestamp(rng)[:10],
+            "description": " ".join(_words(rng, 20)).capitalize() + ".",
+        })
+    return entries
+
+
+def generator_projects(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Provider records in the format ``PortfolioGenerator`` fetches."""
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"{'-'.join(_words(rng, 2))}-{index}",
+            "owner": rng.choice(("user", "acme", "labs")),
+            "owner_type": rng.choice(("user", "organization")),
+            "description": " ".join(_words(rng, 8)).capitalize() + ".",
+            "url": f"https://github.com/user/project-{index}",
+            "language": rng.choice(LANGUAGES) or "Other",
+            "stars": rng.randrange(1000),
+            "forks": rng.randrange(100),
+            "updated_at": _timestamp(rng),
+            "provider": "GitHub",
+            "is_fork": False,
+        }
+        for index in range(count)
+    ]
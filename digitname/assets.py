@@ -0,0 +1,165 @@
+"""
+Content-hashed asset export for generated sites.
+
+Every file of a template's ``static`` tree is copied to the output as
+``name.<hash>.ext``, where the hash is taken from its bytes, and a
+``manifest.json`` maps the original paths to the fingerprinted ones. Since a
+name can only ever hold one content, files already present in the output are
+skipped, and deployed assets can be cached forever
+(see :data:`digitname.static.IMMUTABLE_CACHE`). References in rendered HTML
+are rewritten through the manifest with :func:`rewrite_references`.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+from .jsonstream import PathLike, write_json
+
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 10
+
+_REFERENCE_RE = re.compile(
+    r"""(?P<attr>\b(?:src|href)\s*=\s*)(?P<quote>["'])(?P<url>[^"'<>]+)(?P=quote)""",
+    re.IGNORECASE,
+)
+
+
+def content_hash(path: PathLike) -> str:
+    """Short hex SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def fingerprinted_name(name: str, digest: str) -> str:
+    """``style.css`` -> ``style.<digest>.css``."""
+    stem, dot, ext = name.rpartition(".")
+    if not dot or not stem:
+        return f"{name}.{digest}"
+    return f"{stem}.{digest}.{ext}"
+
+
+def load_manifest(output_dir: PathLike) -> Dict[str, str]:
+    """The manifest of a previous export, or an empty one."""
+    try:
+        with open(Path(output_dir) / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def export_assets(source_dir: PathLike, output_dir: PathLike, prefix: str = "static",
+                  prune: bool = True) -> Dict[str, str]:
+    """Copy ``source_dir`` into ``output_dir/prefix`` with fingerprinted names.
+
+    Args:
+        source_dir: Asset tree to export.
+        output_dir: Site output directory; the manifest is written here.
+        prefix: Path of the assets below ``output_dir`` and in references.
+        prune: Delete fingerprinted files of the previous export that are no
+            longer part of this one.
+
+    Returns:
+        The manifest: ``{"static/css/style.css": "static/css/style.<hash>.css"}``.
+    """
+    source_dir, output_dir = Path(source_dir), Path(output_dir)
+    previous = load_manifest(output_dir)
+    manifest: Dict[str, str] = {}
+
+    for directory, dirs, names in os.walk(source_dir):
+        dirs.sort()
+        for name in sorted(names):
+            source = Path(directory) / name
+            relative = source.relative_to(source_dir).as_posix()
+            logical = f"{prefix}/{relative}" if prefix else relative
+            parent = logical.rpartition("/")[0]
+            hashed = fingerprinted_name(name, content_hash(source))
+            manifest[logical] = f"{parent}/{hashed}" if parent else hashed
+
+            target = output_dir / manifest[logical]
+            if target.exists():
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f".{target.name}.tmp")
+            shutil.copy2(source, tmp)
+            os.replace(tmp, target)
+
+    if prune:
+        current = set(manifest.values())
+        for stale in set(previous.values()) - current:
+            path = output_dir / stale
+            if path.is_file():
+                path.unlink()
+
+    if manifest != previous:
+        write_json(output_dir / MANIFEST_NAME, manifest)
+    return manifest
+
+
+def rewrite_references(html: str, manifest: Dict[str, str], base: str = "") -> str:
+    """Point ``src``/``href`` attributes at fingerprinted assets.
+
+    Args:
+        html: Rendered page.
+        manifest: Mapping returned by :func:`export_assets`.
+        base: Directory of the page relative to the output root, for pages
+            below it (``"projects"`` for ``projects/foo.html``).
+    """
+    if not manifest:
+        return html
+
+    def replace(match: "re.Match") -> str:
+        url = match.group("url")
+        path, sep, rest = _split_suffix(url)
+        absolute = path.startswith("/")
+        key = _normalize(path.lstrip("/") if absolute else _join(base, path))
+        hashed = manifest.get(key)
+        if hashed is None:
+            return match.group(0)
+        if absolute:
+            new = "/" + hashed
+        else:
+            new = _relative(hashed, base)
+        quote = match.group("quote")
+        return f"{match.group('attr')}{quote}{new}{sep}{rest}{quote}"
+
+    return _REFERENCE_RE.sub(replace, html)
+
+
+def _split_suffix(url: str):
+    for sep in ("?", "#"):
+        if sep in url:
+            path, _, rest = url.partition(sep)
+            return path, sep, rest
+    return url, "", ""
+
+
+def _join(base: str, path: str) -> str:
+    return f"{base.strip('/')}/{path}" if base.strip("/") else path
+
+
+def _normalize(path: str) -> Optional[str]:
+    parts = []
+    for part in path.split("/"):
+        if part in ("", "."):
+            continue
+        if part == "..":
+            if not parts:
+                return None
+            parts.pop()
+        else:
+            parts.append(part)
+    return "/".join(parts)
+
+
+def _relative(path: str, base: str) -> str:
+    depth = len([p for p in base.strip("/").split("/") if p])
+    return "../" * depth + path
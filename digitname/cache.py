@@ -0,0 +1,178 @@
+"""
+On-disk HTTP response cache for DigitName.
+
+Stores response bodies together with their ``ETag`` and ``Last-Modified``
+validators so repeated refreshes can send conditional requests and serve
+``304 Not Modified`` answers from disk. The cache is bounded in size and
+evicts the least recently used entries first.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body and the headers needed to revalidate it."""
+
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+
+    def __post_init__(self) -> None:
+        self.headers = {k.lower(): v for k, v in self.headers.items()}
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of HTTP responses keyed by URL.
+
+    Each entry is a ``<key>.json`` metadata file plus a ``<key>.body`` file.
+    Recency is tracked in memory and persisted through the body file's
+    modification time, so the LRU order survives between runs.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory the entries are stored in; created if missing.
+            max_bytes: Total body and metadata size kept before evicting.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = self._scan()
+        self._total = sum(self._sizes.values())
+
+    @staticmethod
+    def key(url: str, vary: str = "") -> str:
+        """Cache key for a URL, optionally varied by a credential fingerprint."""
+        return hashlib.sha256(f"{url}\0{vary}".encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def _scan(self) -> "OrderedDict[str, int]":
+        entries = []
+        for meta_path in self.directory.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                body_stat = body_path.stat()
+                size = body_stat.st_size + meta_path.stat().st_size
+            except OSError:
+                continue
+            entries.append((body_stat.st_mtime, meta_path.stem, size))
+        entries.sort()
+        return OrderedDict((key, size) for _, key, size in entries)
+
+    def get(self, url: str, vary: str = "") -> Optional[CacheEntry]:
+        """Return the cached entry for ``url`` or ``None``."""
+        key = self.key(url, vary)
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            if key not in self._sizes:
+                return None
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                body = body_path.read_bytes()
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            self._sizes.move_to_end(key)
+        return CacheEntry(meta["url"], meta["status_code"], meta["headers"], body)
+
+    def touch(self, url: str, vary: str = "") -> None:
+        """Mark an entry as recently used (e.g. after a 304 revalidation)."""
+        key = self.key(url, vary)
+        with self._lock:
+            if key in self._sizes:
+                self._sizes.move_to_end(key)
+                try:
+                    os.utime(self._paths(key)[1])
+                except OSError:
+                    pass
+
+    def put(self, entry: CacheEntry, vary: str = "") -> None:
+        """Store an entry, evicting least recently used entries if needed."""
+        key = self.key(entry.url, vary)
+        meta_path, body_path = self._paths(key)
+        meta = json.dumps({
+            "url": entry.url,
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+        }).encode("utf-8")
+        size = len(meta) + len(entry.body)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            # Body first: an entry only becomes visible once its metadata exists
+            self._write_atomic(body_path, entry.body)
+            self._write_atomic(meta_path, meta)
+            self._total += size - self._sizes.pop(key, 0)
+            self._sizes[key] = size
+            while self._total > self.max_bytes and self._sizes:
+                oldest = next(iter(self._sizes))
+                self._remove(oldest)
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _remove(self, key: str) -> None:
+        self._total -= self._sizes.pop(key, 0)
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            for key in list(self._sizes):
+                self._remove(key)
+
+    @property
+    def size(self) -> int:
+        """Total bytes currently held by the cache."""
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._sizes)
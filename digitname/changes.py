@@ -0,0 +1,99 @@
+"""
+Change detection for portfolio refreshes.
+
+Compares a fresh fetch with the previous ``portfolio.json`` by
+``(source, full_name)`` so a refresh only rewrites the records and files that
+actually changed.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+ProjectKey = Tuple[str, str]
+
+
+def project_key(project: Dict[str, Any]) -> ProjectKey:
+    """Identity of a project across refreshes."""
+    return (project.get("source") or "",
+            project.get("full_name") or project.get("name") or "")
+
+
+@dataclass
+class ProjectChanges:
+    """Projects added, updated and removed between two fetches."""
+
+    added: List[ProjectKey] = field(default_factory=list)
+    updated: List[ProjectKey] = field(default_factory=list)
+    removed: List[ProjectKey] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.updated or self.removed)
+
+    @property
+    def sources(self) -> Set[str]:
+        """Sources with at least one changed project."""
+        return {source for source, _ in self.added + self.updated + self.removed}
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        return (f"+{len(self.added)} added, ~{len(self.updated)} updated, "
+                f"-{len(self.removed)} removed")
+
+    def to_log_entry(self, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Compact change log record, one ``"source:full_name"`` string per project."""
+        def keys(items: List[ProjectKey]) -> List[str]:
+            return [f"{source}:{name}" for source, name in items]
+
+        return {
+            "timestamp": timestamp or datetime.utcnow().isoformat(),
+            "added": keys(self.added),
+            "updated": keys(self.updated),
+            "removed": keys(self.removed),
+        }
+
+
+def diff_projects(old: Iterable[Dict[str, Any]],
+                  new: Iterable[Dict[str, Any]]) -> ProjectChanges:
+    """Diff two project lists by :func:`project_key`.
+
+    A project counts as updated when any of its fields differ.
+    """
+    previous = {project_key(p): p for p in old}
+    changes = ProjectChanges()
+    seen = set()
+
+    for project in new:
+        key = project_key(project)
+        seen.add(key)
+        before = previous.get(key)
+        if before is None:
+            changes.added.append(key)
+        elif before != project:
+            changes.updated.append(key)
+
+    changes.removed = [key for key in previous if key not in seen]
+    return changes
+
+
+def merge_projects(old: Iterable[Dict[str, Any]], new: Iterable[Dict[str, Any]],
+                   complete_sources: Set[str]) -> List[Dict[str, Any]]:
+    """Merge a fresh fetch into the previous project list.
+
+    Sources in ``complete_sources`` are replaced wholesale by the fresh data.
+    For any other source (failed, timed out or only partially fetched) the
+    previous records are kept and freshly fetched ones are laid over them.
+
+    This is only as safe as the fetchers: a source may be listed as complete
+    only if its fetch really succeeded. Fetchers must raise on HTTP and
+    transport errors rather than return what they have, or an unreachable
+    registry reads as every project being removed.
+    """
+    merged: Dict[ProjectKey, Dict[str, Any]] = {}
+    for project in old:
+        if project.get("source") not in complete_sources:
+            merged[project_key(project)] = project
+    for project in new:
+        merged[project_key(project)] = project
+    return list(merged.values())
@@ -0,0 +1,602 @@
+"""
+Local stand-in for the provider APIs the portfolio refresh talks to.
+
+:class:`FakeProviderServer` answers the GitHub, GitLab, npm, PyPI, Docker Hub,
+Hugging Face and Packagist endpoints used by ``scripts/update_portfolio_repos.py``
+and :class:`~digitname.portfolio.PortfolioGenerator`, each under its own path
+prefix (``/github``, ``/gitlab``, ...). Point the fetchers at it through the
+``<SOURCE>_BASE_URL`` environment variables (see :meth:`FakeProviderServer.base_urls`)
+to run a whole refresh offline.
+
+Listings are paginated the way each provider does it (``Link`` headers,
+GitLab's ``X-Total-Pages``, Docker Hub's ``next`` and Hugging Face cursors).
+Every ``200`` carries an ``ETag`` and conditional requests get ``304``.
+Responses can be delayed, and each source can have a request budget per
+window, reported in ``X-RateLimit-*`` headers and enforced with ``429`` and
+``Retry-After``.
+
+Fixtures are derived from their index on demand, so a fake account with a
+million repositories costs no memory until its pages are requested.
+"""
+
+import base64
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit
+
+from .httpd import KeepAliveMixin, PooledHTTPServer
+
+SOURCES = ("github", "gitlab", "npm", "pypi", "dockerhub", "huggingface", "packagist")
+
+DEFAULT_COUNT = 100
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+GITLAB_USER_ID = 1000
+
+_LANGUAGES = ("Python", "JavaScript", "TypeScript", "Go", "Rust", "PHP", "Shell", None)
+_PIPELINES = ("text-generation", "text-classification", "image-classification",
+              "translation")
+_WORDS = ("fast", "tiny", "async", "data", "cloud", "stream", "cache", "graph", "parse",
+          "sync")
+_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+Reply = Tuple[int, Dict[str, str], Any]
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class Fixtures:
+    """Deterministic fake accounts, generated item by item.
+
+    Item ``i`` of a source is the ``i``-th most recently updated one. It only
+    depends on ``seed``, the source and ``i`` (and on :meth:`touch`), so pages
+    can be produced in any order and repeated requests return the same bytes.
+    """
+
+    def __init__(self, username: str = "fake-user",
+                 counts: Optional[Mapping[str, int]] = None,
+                 default_count: int = DEFAULT_COUNT, orgs: int = 0, org_repos: int = 10,
+                 seed: int = 0):
+        """Initialize the fixtures.
+
+        Args:
+            username: Account name on every provider.
+            counts: Number of projects per source.
+            default_count: Number of projects of sources missing from ``counts``.
+            orgs: GitHub organizations the user belongs to.
+            org_repos: Repositories in each organization.
+            seed: Varies names, descriptions and numbers.
+        """
+        self.username = username
+        self.counts = {source: int((counts or {}).get(source, default_count))
+                       for source in SOURCES}
+        self.orgs = orgs
+        self.org_repos = org_repos
+        self.seed = seed
+        self._revisions: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, source: str, index: int) -> None:
+        """Simulate activity: the item gets a new star and a new update time."""
+        with self._lock:
+            self._revisions[source, index] = self._revisions.get((source, index), 0) + 1
+
+    def _item(self, source: str, index: int) -> Tuple[random.Random, int, datetime]:
+        revision = self._revisions.get((source, index), 0)
+        rng = random.Random(f"{self.seed}:{source}:{index}")
+        updated = _EPOCH - timedelta(hours=index) + timedelta(minutes=revision)
+        return rng, revision, updated
+
+    def name(self, source: str, index: int) -> str:
+        """Name of item ``index`` of ``source``."""
+        word = _WORDS[(index + self.seed) % len(_WORDS)]
+        if source == "packagist":
+            return f"{self.username}/{word}-{index:05d}"
+        return f"{word}-{source}-{index:05d}"
+
+    def package_index(self, source: str, name: str) -> Optional[int]:
+        """Index of the package called ``name``, or None if there is none."""
+        try:
+            index = int(name.rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            return None
+        if 0 <= index < self.counts[source] and self.name(source, index) == name:
+            return index
+        return None
+
+    def org(self, index: int) -> Dict[str, Any]:
+        """GitHub organization ``index``; each has ``org_repos`` repositories."""
+        login = f"{self.username}-org-{index}"
+        return {"login": login, "id": 5000 + index,
+                "url": f"https://api.github.com/orgs/{login}"}
+
+    def github_repo(self, index: int, owner: Optional[str] = None) -> Dict[str, Any]:
+        source = "github" if owner is None else f"github:{owner}"
+        rng, revision, updated = self._item(source, index)
+        owner = owner or self.username
+        name = self.name("github", index)
+        return {
+            "id": 10_000_000 + index,
+            "name": name,
+            "full_name": f"{owner}/{name}",
+            "owner": {"login": owner},
+            "html_url": f"https://github.com/{owner}/{name}",
+            "description": f"A {rng.choice(_WORDS)} {rng.choice(_WORDS)} library.",
+            "fork": rng.random() < 0.1,
+            "language": rng.choice(_LANGUAGES),
+            "stargazers_count": rng.randrange(2000) + revision,
+            "forks_count": rng.randrange(200),
+            "updated_at": _timestamp(updated),
+        }
+
+    def gitlab_project(self, index: int) -> Dict[str, Any]:
+        rng, revision, updated = self._item("gitlab", index)
+        name = self.name("gitlab", index)
+        project = {
+            "id": 20_000_000 + index,
+            "name": name,
+            "path_with_namespace": f"{self.username}/{name}",
+            "web_url": f"https://gitlab.com/{self.username}/{name}",
+            "description": f"A {rng.choice(_WORDS)} service.",
+            "star_count": rng.randrange(500) + revision,
+            "forks_count": rng.randrange(50),
+            "last_activity_at": _timestamp(updated),
+        }
+        if rng.random() < 0.1:
+            project["forked_from_project"] = {"id": 1}
+        return project
+
+    def npm_package(self, index: int) -> Dict[str, Any]:
+        """An npm search result, as ``npm search --json`` prints it."""
+        rng, revision, updated = self._item("npm", index)
+        return {
+            "name": self.name("npm", index),
+            "description": f"A {rng.choice(_WORDS)} module.",
+            "version": f"{rng.randrange(1, 5)}.{rng.randrange(20)}.{revision}",
+            "keywords": [rng.choice(_WORDS)],
+            "date": _timestamp(updated),
+            "maintainers": [{"username": self.username}],
+        }
+
+    def npm_document(self, index: int) -> Dict[str, Any]:
+        """An npm registry document with just the latest version."""
+        package = self.npm_package(index)
+        created = _timestamp(_EPOCH - timedelta(days=365 + index))
+        version = {"name": package["name"], "version": package["version"],
+                   "description": package["description"],
+                   "keywords": package["keywords"]}
+        return {
+            "name": package["name"],
+            "dist-tags": {"latest": package["version"]},
+            "versions": {package["version"]: version},
+            "time": {"created": created, "modified": package["date"]},
+        }
+
+    def pypi_package(self, index: int) -> Dict[str, Any]:
+        rng, revision, updated = self._item("pypi", index)
+        name = self.name("pypi", index)
+        version = f"{rng.randrange(5)}.{rng.randrange(20)}.{revision}"
+        return {
+            "info": {
+                "name": name,
+                "author": self.username,
+                "maintainer": "",
+                "summary": f"A {rng.choice(_WORDS)} package.",
+                "version": version,
+                "package_url": f"https://pypi.org/project/{name}/",
+                "release_url": f"https://pypi.org/project/{name}/{version}/",
+                "downloads": {"last_month": rng.randrange(100_000)},
+            },
+            "releases": {version: [{"upload_time": _timestamp(updated)}]},
+        }
+
+    def dockerhub_repo(self, index: int) -> Dict[str, Any]:
+        rng, revision, updated = self._item("dockerhub", index)
+        return {
+            "name": self.name("dockerhub", index),
+            "namespace": self.username,
+            "description": f"A {rng.choice(_WORDS)} image.",
+            "star_count": rng.randrange(100) + revision,
+            "pull_count": rng.randrange(1_000_000),
+            "last_updated": _timestamp(updated),
+        }
+
+    def huggingface_model(self, index: int) -> Dict[str, Any]:
+        rng, revision, updated = self._item("huggingface", index)
+        return {
+            "modelId": f"{self.username}/{self.name('huggingface', index)}",
+            "pipeline_tag": rng.choice(_PIPELINES),
+            "downloads": rng.randrange(50_000),
+            "likes": rng.randrange(300) + revision,
+            "lastModified": _timestamp(updated),
+        }
+
+    def packagist_package(self, index: int) -> Dict[str, Any]:
+        rng, revision, updated = self._item("packagist", index)
+        name = self.name("packagist", index)
+        version = f"v{rng.randrange(1, 4)}.{rng.randrange(20)}.{revision}"
+        return {
+            "name": name,
+            "description": f"A {rng.choice(_WORDS)} PHP library.",
+            "repository": f"https://github.com/{name}",
+            "downloads": {"total": rng.randrange(500_000)},
+            "favers": rng.randrange(200) + revision,
+            "keywords": [rng.choice(_WORDS)],
+            "versions": {version: {
+                "time": _timestamp(updated), "license": ["MIT"],
+                "source": {"url": f"https://github.com/{name}.git"},
+            }},
+        }
+
+
+class RateWindow:
+    """Fixed-window request budget of one source, like GitHub's hourly limit."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._used = 0
+        self._reset_at = 0.0
+        self._lock = threading.Lock()
+
+    def spend(self, cost: int = 1) -> Tuple[bool, Dict[str, str]]:
+        """Spend ``cost`` requests; whether that was allowed, and the headers to send.
+
+        A ``cost`` of 0 reports the budget without using it.
+        """
+        with self._lock:
+            now = time.time()
+            if now >= self._reset_at:
+                self._used = 0
+                self._reset_at = math.ceil(now + self.window)
+            allowed = self._used + cost <= self.limit
+            if allowed:
+                self._used += cost
+            return allowed, {
+                "X-RateLimit-Limit": str(self.limit),
+                "X-RateLimit-Remaining": str(self.limit - self._used),
+                "X-RateLimit-Used": str(self._used),
+                "X-RateLimit-Reset": str(int(self._reset_at)),
+            }
+
+
+def _page_bounds(query: Dict[str, str], total: int, per_page_param: str = "per_page",
+                 page_param: str = "page",
+                 default: int = DEFAULT_PER_PAGE) -> Tuple[int, int, int, int]:
+    """``(page, per_page, start, stop)`` of a page-numbered listing."""
+    try:
+        per_page = min(MAX_PER_PAGE, max(1, int(query.get(per_page_param, default))))
+        page = max(1, int(query.get(page_param, 1)))
+    except ValueError:
+        per_page, page = default, 1
+    start = min(total, (page - 1) * per_page)
+    return page, per_page, start, min(total, start + per_page)
+
+
+def _with_query(url: str, query: Dict[str, str], **changes: Any) -> str:
+    return f"{url}?{urlencode({**query, **{k: str(v) for k, v in changes.items()}})}"
+
+
+def _link_header(url: str, query: Dict[str, str], page: int,
+                 pages: int) -> Dict[str, str]:
+    """GitHub style ``Link`` header for page ``page`` of ``pages``."""
+    links = []
+    if page < pages:
+        links.append(f'<{_with_query(url, query, page=page + 1)}>; rel="next"')
+        links.append(f'<{_with_query(url, query, page=pages)}>; rel="last"')
+    if page > 1:
+        links.append(f'<{_with_query(url, query, page=1)}>; rel="first"')
+        links.append(f'<{_with_query(url, query, page=page - 1)}>; rel="prev"')
+    return {"Link": ", ".join(links)} if links else {}
+
+
+def _not_found() -> Reply:
+    return 404, {}, {"message": "Not Found"}
+
+
+class FakeProviders:
+    """The fake APIs, independent of the HTTP server.
+
+    :meth:`handle` turns a request into ``(status, headers, body)``; the
+    server only adds latency and writes the result out.
+    """
+
+    def __init__(self, fixtures: Fixtures, rate_limit: Optional[int] = None,
+                 rate_window: float = 3600.0, latency: float = 0.0,
+                 jitter: float = 0.0):
+        """Initialize the providers.
+
+        Args:
+            fixtures: The accounts served.
+            rate_limit: Requests each source allows per ``rate_window``
+                seconds; unlimited when not given. ``304`` answers are free,
+                as on GitHub.
+            rate_window: Length of a rate limit window in seconds.
+            latency: Seconds every response is delayed by.
+            jitter: Up to this many seconds of random extra delay.
+        """
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.windows = {source: RateWindow(rate_limit, rate_window)
+                        for source in SOURCES} if rate_limit else {}
+        self.requests: Dict[str, int] = {source: 0 for source in SOURCES}
+        self._count_lock = threading.Lock()
+        self._routes: Dict[str, Callable[[List[str], Dict[str, str], str], Reply]] = {
+            "github": self._github,
+            "gitlab": self._gitlab,
+            "npm": self._npm,
+            "pypi": self._pypi,
+            "dockerhub": self._dockerhub,
+            "huggingface": self._huggingface,
+            "packagist": self._packagist,
+        }
+
+    def delay(self) -> float:
+        """Seconds to hold the next response for."""
+        return self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def handle(self, target: str, headers: Mapping[str, str],
+               base: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Answer ``GET target``.
+
+        Args:
+            target: Request path and query string.
+            headers: Request headers; ``If-None-Match`` is honoured.
+            base: Scheme and host the client used, for absolute links.
+        """
+        parts = urlsplit(target)
+        source, _, rest = parts.path.lstrip("/").partition("/")
+        route = self._routes.get(source)
+        if route is None:
+            return self._reply(*_not_found())
+        with self._count_lock:
+            self.requests[source] += 1
+
+        window = self.windows.get(source)
+        if window is not None:
+            _, limits = window.spend(0)
+            if limits["X-RateLimit-Remaining"] == "0":
+                return self._rate_limited(window)
+
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        segments = [unquote(segment) for segment in rest.split("/") if segment]
+        status, extra, body = self._reply(
+            *route(segments, query, f"{base}/{source}"))
+
+        if status == 200:
+            etag = extra["ETag"] = f'"{hashlib.sha1(body).hexdigest()}"'
+            if headers.get("If-None-Match") == etag:
+                # Not counted against the budget, as on GitHub
+                budget = limits if window is not None else {}
+                return 304, {"ETag": etag, **budget}, b""
+        if window is not None:
+            allowed, limits = window.spend()
+            if not allowed:
+                return self._rate_limited(window)
+            extra.update(limits)
+        return status, extra, body
+
+    @staticmethod
+    def _reply(status: int, headers: Dict[str, str],
+               data: Any) -> Tuple[int, Dict[str, str], bytes]:
+        body = json.dumps(data, separators=(",", ":")).encode()
+        return status, {"Content-Type": "application/json", **headers}, body
+
+    def _rate_limited(self, window: RateWindow) -> Tuple[int, Dict[str, str], bytes]:
+        _, limits = window.spend(0)
+        wait = math.ceil(int(limits["X-RateLimit-Reset"]) - time.time())
+        limits["Retry-After"] = str(max(1, wait))
+        return self._reply(429, limits, {"message": "API rate limit exceeded"})
+
+    def _github(self, segments: List[str], query: Dict[str, str], base: str) -> Reply:
+        fixtures = self.fixtures
+        if (len(segments) == 3 and segments[0] == "users"
+                and segments[1] == fixtures.username):
+            if segments[2] == "repos":
+                return self._github_listing(fixtures.counts["github"],
+                                            fixtures.github_repo,
+                                            f"{base}/users/{segments[1]}/repos", query)
+            if segments[2] == "orgs":
+                return self._github_listing(fixtures.orgs, fixtures.org,
+                                            f"{base}/users/{segments[1]}/orgs", query)
+        if len(segments) == 3 and segments[0] == "orgs" and segments[2] == "repos":
+            logins = {fixtures.org(i)["login"] for i in range(fixtures.orgs)}
+            if segments[1] in logins:
+                owner = segments[1]
+                return self._github_listing(fixtures.org_repos,
+                                            lambda i: fixtures.github_repo(i, owner),
+                                            f"{base}/orgs/{owner}/repos", query)
+        return _not_found()
+
+    @staticmethod
+    def _github_listing(total: int, item: Callable[[int], Any], url: str,
+                        query: Dict[str, str]) -> Reply:
+        page, per_page, start, stop = _page_bounds(query, total)
+        pages = max(1, math.ceil(total / per_page))
+        items = [item(i) for i in range(start, stop)]
+        return 200, _link_header(url, query, page, pages), items
+
+    def _gitlab(self, segments: List[str], query: Dict[str, str], base: str) -> Reply:
+        fixtures = self.fixtures
+        if segments == ["users"]:
+            if query.get("username") == fixtures.username:
+                return 200, {}, [{"id": GITLAB_USER_ID, "username": fixtures.username}]
+            return 200, {}, []
+        if len(segments) == 3 and segments[0] == "users" and segments[2] == "projects":
+            if segments[1] != str(GITLAB_USER_ID):
+                return _not_found()
+            total = fixtures.counts["gitlab"]
+            page, per_page, start, stop = _page_bounds(query, total, default=20)
+            pages = max(1, math.ceil(total / per_page))
+            url = f"{base}/users/{segments[1]}/projects"
+            headers = {
+                "X-Total": str(total),
+                "X-Total-Pages": str(pages),
+                "X-Page": str(page),
+                "X-Per-Page": str(per_page),
+                "X-Next-Page": str(page + 1) if page < pages else "",
+                **_link_header(url, query, page, pages),
+            }
+            projects = [fixtures.gitlab_project(i) for i in range(start, stop)]
+            return 200, headers, projects
+        return _not_found()
+
+    def _npm(self, segments: List[str], query: Dict[str, str], base: str) -> Reply:
+        fixtures = self.fixtures
+        names = (fixtures.name("npm", i) for i in range(fixtures.counts["npm"]))
+        if segments == ["-", "user", fixtures.username, "packages"]:
+            return 200, {}, {name: "write" for name in names}
+        user = f"org.couchdb.user:{fixtures.username}"
+        if segments == ["-", "user", user, "package"]:
+            # Shaped as PortfolioGenerator reads it
+            return 200, {}, {"packages": list(names)}
+        if segments == ["-", "v1", "search"]:
+            # What ``npm search --registry`` calls; only maintainer searches match
+            text = query.get("text", "")
+            maintainer = f"maintainer:{fixtures.username}"
+            total = fixtures.counts["npm"] if text == maintainer else 0
+            try:
+                start = min(total, max(0, int(query.get("from", 0))))
+                size = min(250, max(1, int(query.get("size", 20))))
+            except ValueError:
+                return 400, {}, {"error": "invalid from or size"}
+            objects = [{"package": fixtures.npm_package(i), "score": {"final": 1.0}}
+                       for i in range(start, min(total, start + size))]
+            return 200, {}, {"objects": objects, "total": total,
+                             "time": _timestamp(datetime.now(timezone.utc))}
+        if len(segments) == 1:
+            index = fixtures.package_index("npm", segments[0])
+            if index is not None:
+                return 200, {}, fixtures.npm_document(index)
+        return _not_found()
+
+    def _pypi(self, segments: List[str], query: Dict[str, str], base: str) -> Reply:
+        fixtures = self.fixtures
+        if len(segments) != 2 or segments[1] != "json":
+            return _not_found()
+        if segments[0] == fixtures.username:
+            # The updater lists a user's packages through the releases of a
+            # project named after them
+            releases = {fixtures.name("pypi", i): []
+                        for i in range(fixtures.counts["pypi"])}
+            return 200, {}, {"info": {"name": fixtures.username}, "releases": releases}
+        index = fixtures.package_index("pypi", segments[0])
+        if index is None:
+            return _not_found()
+        return 200, {}, fixtures.pypi_package(index)
+
+    def _dockerhub(self, segments: List[str], query: Dict[str, str],
+                   base: str) -> Reply:
+        fixtures = self.fixtures
+        if segments != ["repositories", fixtures.username]:
+            return _not_found()
+        total = fixtures.counts["dockerhub"]
+        page, per_page, start, stop = _page_bounds(
+            query, total, per_page_param="page_size", default=10)
+        url = f"{base}/repositories/{quote(fixtures.username)}"
+        return 200, {}, {
+            "count": total,
+            "next": _with_query(url, query, page=page + 1) if stop < total else None,
+            "previous": _with_query(url, query, page=page - 1) if page > 1 else None,
+            "results": [fixtures.dockerhub_repo(i) for i in range(start, stop)],
+        }
+
+    def _huggingface(self, segments: List[str], query: Dict[str, str],
+                     base: str) -> Reply:
+        fixtures = self.fixtures
+        if segments != ["models"]:
+            return _not_found()
+        mine = query.get("author") == fixtures.username
+        total = fixtures.counts["huggingface"] if mine else 0
+        try:
+            limit = min(1000, max(1, int(query.get("limit", 1000))))
+            cursor = query.get("cursor")
+            start = (int(base64.urlsafe_b64decode(cursor.encode()).decode())
+                     if cursor else 0)
+        except ValueError:
+            return 400, {}, {"error": "invalid limit or cursor"}
+        stop = min(total, start + limit)
+        headers = {}
+        if stop < total:
+            # Opaque cursors, so only rel="next" can be followed
+            cursor = base64.urlsafe_b64encode(str(stop).encode()).decode()
+            next_url = _with_query(f"{base}/models", query, cursor=cursor)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        models = [fixtures.huggingface_model(i) for i in range(start, stop)]
+        return 200, headers, models
+
+    def _packagist(self, segments: List[str], query: Dict[str, str],
+                   base: str) -> Reply:
+        fixtures = self.fixtures
+        if segments == ["users", fixtures.username, "packages.json"]:
+            names = [fixtures.name("packagist", i)
+                     for i in range(fixtures.counts["packagist"])]
+            return 200, {}, {"packageNames": names}
+        if (len(segments) == 3 and segments[0] == "packages"
+                and segments[2].endswith(".json")):
+            name = f"{segments[1]}/{segments[2][:-len('.json')]}"
+            index = fixtures.package_index("packagist", name)
+            if index is not None:
+                return 200, {}, {"package": fixtures.packagist_package(index)}
+        return _not_found()
+
+
+class FakeProviderHandler(KeepAliveMixin, BaseHTTPRequestHandler):
+    """Serves :class:`FakeProviders` over keep-alive HTTP/1.1."""
+
+    def do_GET(self):
+        providers: FakeProviders = self.server.providers
+        delay = providers.delay()
+        if delay > 0:
+            time.sleep(delay)
+        host = self.headers.get("Host") or "%s:%d" % self.server.server_address[:2]
+        base = f"http://{host}"
+        status, headers, body = providers.handle(self.path, self.headers, base)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FakeProviderServer(PooledHTTPServer):
+    """Pooled HTTP server for :class:`FakeProviders`."""
+
+    def __init__(self, server_address, providers: FakeProviders,
+                 workers: Optional[int] = None, verbose: bool = False):
+        """Initialize the server.
+
+        Args:
+            server_address: ``(host, port)`` to listen on; port 0 picks a free one.
+            providers: The fake APIs to serve.
+            workers: Worker threads, i.e. requests delayed concurrently.
+            verbose: Log every request to stderr.
+        """
+        self.providers = providers
+        self.verbose = verbose
+        super().__init__(server_address, FakeProviderHandler, workers=workers)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_urls(self) -> Dict[str, str]:
+        """``<SOURCE>_BASE_URL`` environment variables pointing at this server."""
+        return {f"{source.upper()}_BASE_URL": f"{self.url}/{source}"
+                for source in SOURCES}
@@ -0,0 +1,291 @@
+"""
+Concurrent fetch engine for DigitName.
+
+Runs independent source fetchers side by side on a bounded thread pool, so a
+full portfolio refresh takes roughly as long as the slowest source instead of
+the sum of all of them.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import (Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set,
+                    Tuple)
+
+Submit = Callable[..., Future]
+
+
+class IncompleteFetch(Exception):
+    """Raised by a fetcher that produced what it could but missed some items.
+
+    The engine reports the source as ``"error"`` with the items produced so
+    far, so they are never mistaken for the source's complete listing.
+    """
+
+
+@dataclass
+class SourceResult:
+    """Outcome of a single source fetch.
+
+    ``status`` is one of ``"ok"`` (the fetcher finished), ``"partial"`` (the
+    deadline passed while it was still producing items), ``"timeout"`` (the
+    deadline passed before it produced anything) or ``"error"``.
+    """
+
+    name: str
+    items: List[Any] = field(default_factory=list)
+    status: str = "ok"
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """Whether the fetcher ran to completion without raising."""
+        return self.status == "ok"
+
+
+class FetchEngine:
+    """Runs source fetchers concurrently under a global deadline.
+
+    Each source is a callable returning an iterable of items. Generators are
+    drained item by item, so when the deadline passes the items a slow source
+    has produced so far are still returned (marked ``"partial"``).
+
+    Work a source fans out itself (per-package lookups, extra pages) goes
+    through :meth:`submit`, which runs on a shared request pool and is capped
+    per source so one chatty registry cannot starve the others.
+    """
+
+    def __init__(self, max_workers: int = 8, deadline: Optional[float] = None,
+                 limits: Optional[Dict[str, int]] = None, default_limit: int = 4):
+        """Initialize the engine.
+
+        Args:
+            max_workers: Size of the shared request pool.
+            deadline: Seconds a :meth:`run` may take before results are
+                collected as they are. ``None`` waits for every source.
+            limits: Maximum in-flight requests per source name.
+            default_limit: Limit for sources missing from ``limits``.
+        """
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Future] = set()
+        self._started_at: Optional[float] = None
+        self._expired = threading.Event()
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline of the current run has passed."""
+        if self._expired.is_set():
+            return True
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            self._expired.set()
+            return True
+        return False
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or ``None`` if there is none."""
+        if self.deadline is None or self._started_at is None:
+            return None
+        return self.deadline - (time.monotonic() - self._started_at)
+
+    def _semaphore(self, source: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(source)
+            if semaphore is None:
+                limit = max(1, self.limits.get(source, self.default_limit))
+                semaphore = threading.BoundedSemaphore(limit)
+                self._semaphores[source] = semaphore
+            return semaphore
+
+    def _request_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="fetch-request"
+                )
+            return self._pool
+
+    def submit(self, source: str, func: Callable[..., Any], *args: Any,
+               **kwargs: Any) -> Future:
+        """Run ``func`` on the shared request pool under the source's limit.
+
+        Blocks the caller while the source already has its limit of requests
+        in flight, so waiting work never ties up a pool thread.
+        """
+        semaphore = self._semaphore(source)
+        semaphore.acquire()
+        try:
+            future = self._request_pool().submit(func, *args, **kwargs)
+        except BaseException:
+            semaphore.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(lambda done: self._finished(done, semaphore))
+        return future
+
+    def _finished(self, future: Future, semaphore: threading.BoundedSemaphore) -> None:
+        semaphore.release()
+        with self._lock:
+            self._pending.discard(future)
+
+    def _drain(self, name: str, fetch: Callable[[], Iterable[Any]],
+               buffer: List[Any], results: Dict[str, SourceResult]) -> None:
+        started = time.monotonic()
+        try:
+            produced = fetch()
+            if isinstance(produced, list):
+                buffer.extend(produced)
+            elif produced is not None:
+                iterator = iter(produced)
+                try:
+                    for item in iterator:
+                        buffer.append(item)
+                        if self.expired:
+                            return
+                finally:
+                    close = getattr(iterator, "close", None)
+                    if close is not None:
+                        close()
+            result = SourceResult(name, list(buffer), "ok")
+        except Exception as e:
+            result = SourceResult(name, list(buffer), "error", error=e)
+        result.elapsed = time.monotonic() - started
+        with self._lock:
+            results.setdefault(name, result)
+
+    def run(self, sources: Dict[str, Callable[[], Iterable[Any]]]
+            ) -> Dict[str, SourceResult]:
+        """Fetch every source concurrently and collect the results.
+
+        Args:
+            sources: Mapping of source name to a zero-argument fetcher.
+
+        Returns:
+            A :class:`SourceResult` per source, in the order of ``sources``.
+        """
+        self._started_at = time.monotonic()
+        self._expired.clear()
+        buffers: Dict[str, List[Any]] = {name: [] for name in sources}
+        results: Dict[str, SourceResult] = {}
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(len(sources), self.max_workers)),
+            thread_name_prefix="fetch-source"
+        )
+        futures: List[Future] = []
+        try:
+            futures.extend(
+                executor.submit(self._drain, name, fetch, buffers[name], results)
+                for name, fetch in sources.items()
+            )
+            wait(futures, timeout=self.remaining())
+        finally:
+            self._expired.set()
+            # shutdown(cancel_futures=True) needs Python 3.9
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        collected = {}
+        elapsed = time.monotonic() - self._started_at
+        with self._lock:
+            for name in sources:
+                result = results.get(name)
+                if result is None:
+                    # Still running at the deadline: keep what it produced so far
+                    items = list(buffers[name])
+                    status = "partial" if items else "timeout"
+                    result = SourceResult(name, items, status, elapsed=elapsed)
+                    results[name] = result
+                collected[name] = result
+        return collected
+
+    def close(self) -> None:
+        """Shut down the shared request pool without waiting for stragglers."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            pending, self._pending = self._pending, set()
+        for future in pending:
+            future.cancel()
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+
+def ordered_map(func: Callable[[Any], Any], items: Iterable[Any], workers: int = 4,
+                submit: Optional[Submit] = None) -> Iterator[Any]:
+    """Apply ``func`` to ``items`` concurrently, yielding results in input order.
+
+    At most ``workers`` calls are in flight at once, so results stream out as
+    they become available instead of being collected up front. Exceptions are
+    raised when the failing item's turn to be yielded comes.
+
+    Args:
+        func: Function called with each item.
+        items: Items to process; consumed lazily.
+        workers: Number of calls kept in flight.
+        submit: ``submit(func, item) -> Future`` to run calls on an existing
+            pool, e.g. ``functools.partial(engine.submit, "github")``. A
+            private pool is used when not given.
+    """
+    own_pool = None
+    if submit is None:
+        own_pool = ThreadPoolExecutor(max_workers=max(1, workers),
+                                      thread_name_prefix="fetch-map")
+        submit = own_pool.submit
+
+    iterator = iter(items)
+    pending: Deque[Future] = deque(submit(func, item)
+                                   for item in islice(iterator, max(1, workers)))
+    try:
+        while pending:
+            future = pending.popleft()
+            for item in islice(iterator, 1):
+                pending.append(submit(func, item))
+            yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_pool is not None:
+            own_pool.shutdown(wait=False)
+
+
+def fetch_each(func: Callable[[Any], Any], items: Iterable[Any], workers: int = 4,
+               submit: Optional[Submit] = None,
+               on_error: Optional[Callable[[Any, Exception], None]] = None
+               ) -> Iterator[Tuple[Any, Any]]:
+    """Fetch details for many items concurrently, isolating failures per item.
+
+    Yields ``(item, result)`` pairs in input order. An item whose call raises
+    is reported to ``on_error`` and skipped; the others are unaffected.
+
+    Args:
+        func: Fetches the details of one item.
+        items: Items to fetch, e.g. package names.
+        workers: Number of calls kept in flight.
+        submit: Optional pool to run on, see :func:`ordered_map`.
+        on_error: Called with the item and the exception of a failed call.
+    """
+    def call(item: Any) -> Tuple[Any, Any, Optional[Exception]]:
+        try:
+            return item, func(item), None
+        except Exception as e:
+            return item, None, e
+
+    for item, result, error in ordered_map(call, items, workers=workers, submit=submit):
+        if error is not None:
+            if on_error is not None:
+                on_error(item, error)
+            continue
+        yield item, result
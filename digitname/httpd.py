@@ -0,0 +1,218 @@
+"""
+Concurrent HTTP serving for the static site servers.
+
+:class:`PooledHTTPServer` hands accepted connections to a fixed pool of
+worker threads, so a slow client occupies one worker instead of the whole
+server, and a burst of connections waits in a bounded queue instead of
+spawning a thread each. :class:`KeepAliveMixin` switches request handlers
+to HTTP/1.1 persistent connections. An idle connection keeps its worker for
+at most ``keepalive_timeout`` seconds, and gives it up at once when another
+connection is waiting for one.
+
+:func:`serve` runs a server until SIGTERM or SIGINT, then stops accepting,
+lets in-flight requests finish and closes idle keep-alive connections.
+"""
+
+import logging
+import os
+import queue
+import select
+import signal
+import socket
+import threading
+import time
+from http.server import HTTPServer
+from typing import List, Optional, Set
+
+DEFAULT_WORKERS = 32
+DEFAULT_BACKLOG = 128
+KEEPALIVE_TIMEOUT = 5.0
+REQUEST_TIMEOUT = 15.0
+IDLE_POLL_INTERVAL = 0.25
+DRAIN_TIMEOUT = 10.0
+
+logger = logging.getLogger(__name__)
+
+
+class KeepAliveMixin:
+    """HTTP/1.1 keep-alive for ``BaseHTTPRequestHandler`` subclasses.
+
+    Mix in before the handler class. Between requests the connection is
+    watched in short ``select`` slices rather than a blocking read, so it
+    is closed as soon as a queued connection needs the worker, after
+    ``keepalive_timeout`` idle seconds, or once the server is draining.
+    ``timeout`` bounds stalls in the middle of a request.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = REQUEST_TIMEOUT
+    keepalive_timeout = KEEPALIVE_TIMEOUT
+
+    def handle(self):
+        self.close_connection = True
+        while self._wait_for_request():
+            self.handle_one_request()
+            if self.close_connection:
+                break
+
+    def handle_one_request(self):
+        super().handle_one_request()
+        if self._draining():
+            self.close_connection = True
+
+    def end_headers(self):
+        if self._draining():
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        super().end_headers()
+
+    def _draining(self) -> bool:
+        draining = getattr(self.server, "draining", None)
+        return draining is not None and draining.is_set()
+
+    def _buffered(self) -> bool:
+        """Whether the next request has already arrived, without blocking."""
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def _wait_for_request(self) -> bool:
+        """Wait for the next request; False when the connection should close."""
+        deadline = time.monotonic() + self.keepalive_timeout
+        while not self._buffered():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._draining():
+                return False
+            readable, _, _ = select.select([self.connection], [], [],
+                                           min(remaining, IDLE_POLL_INTERVAL))
+            if readable:
+                return True
+            if getattr(self.server, "waiting", 0):
+                return False
+        return True
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP server that serves connections on a bounded worker pool."""
+
+    allow_reuse_address = True
+    request_queue_size = DEFAULT_BACKLOG
+
+    def __init__(self, server_address, handler_class, workers: Optional[int] = None,
+                 backlog: int = DEFAULT_BACKLOG, bind_and_activate: bool = True):
+        """Initialize the server.
+
+        Args:
+            server_address: ``(host, port)`` to listen on.
+            handler_class: Request handler class.
+            workers: Worker threads; ``HTTP_WORKERS`` or 32 when not given.
+            backlog: Accepted connections waiting for a worker. When full,
+                the accept loop blocks and further clients wait in the
+                kernel's listen queue.
+        """
+        super().__init__(server_address, handler_class, bind_and_activate)
+        if workers is None:
+            workers = int(os.getenv("HTTP_WORKERS", str(DEFAULT_WORKERS)))
+        self.workers = max(1, workers)
+        self.draining = threading.Event()
+        self._connections: "queue.Queue" = queue.Queue(maxsize=max(1, backlog))
+        self._threads: List[threading.Thread] = []
+        self._open: Set[socket.socket] = set()
+        self._open_lock = threading.Lock()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"http-worker-{index}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    @property
+    def waiting(self) -> int:
+        """Accepted connections queued for a worker."""
+        return self._connections.qsize()
+
+    def process_request(self, request, client_address):
+        self._connections.put((request, client_address))
+
+    def _work(self) -> None:
+        while True:
+            item = self._connections.get()
+            if item is None:
+                return
+            request, client_address = item
+            with self._open_lock:
+                self._open.add(request)
+            try:
+                if self.draining.is_set():
+                    self._end_reads(request)
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                with self._open_lock:
+                    self._open.discard(request)
+                self.shutdown_request(request)
+
+    @staticmethod
+    def _end_reads(request: socket.socket) -> None:
+        try:
+            request.shutdown(socket.SHUT_RD)
+        except OSError:
+            pass
+
+    def drain(self, timeout: float = DRAIN_TIMEOUT) -> bool:
+        """Finish queued and in-flight connections, then stop the workers.
+
+        Call after ``serve_forever`` has returned. Connections still open
+        after ``timeout`` seconds are abandoned.
+
+        Returns:
+            Whether every worker finished in time.
+        """
+        self.draining.set()
+        # Idle keep-alive connections see EOF at once; responses being
+        # written are unaffected
+        with self._open_lock:
+            for request in list(self._open):
+                self._end_reads(request)
+        for _ in self._threads:
+            self._connections.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._threads)
+
+
+def serve(server: PooledHTTPServer, drain_timeout: float = DRAIN_TIMEOUT) -> None:
+    """Serve until SIGTERM/SIGINT, then drain gracefully.
+
+    Must be called from the main thread.
+    """
+    def stop(signum, frame):
+        if not server.draining.is_set():
+            server.draining.set()
+            # shutdown() waits for serve_forever, which runs on this thread
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+    previous = {sig: signal.signal(sig, stop)
+                for sig in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        server.serve_forever()
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+        logger.info("Draining open connections")
+        # Stop accepting first so new clients are refused rather than queued
+        try:
+            server.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        server.socket.close()
+        if server.drain(drain_timeout):
+            logger.info("All connections finished")
+        else:
+            logger.warning("Gave up on connections still open after %.0fs",
+                           drain_timeout)
@@ -0,0 +1,516 @@
+"""
+Responsive thumbnail variants.
+
+Every source image is resized to a few widths and encoded as WebP and, where
+the Pillow build supports it, AVIF. Variant names carry a hash of the source
+bytes (``www_airsca_com-640w.<hash>.webp``), so they can be cached forever
+(see :data:`digitname.static.IMMUTABLE_CACHE`) and a changed screenshot gets
+new URLs.
+
+A ``manifest.json`` next to the variants records each source's hash, the
+options it was built with and the variants produced, so later runs only
+process new or changed images. Work is spread over a process pool, since
+resizing and encoding are CPU-bound. :func:`add_srcsets` writes the result
+into ``data.json`` records as ``srcset`` strings keyed by MIME type.
+
+The same pass, while each image is open anyway, records its dimensions, its
+dominant colour and a tiny base64 placeholder image (LQIP), which
+:func:`add_placeholders` copies into the records so cards can reserve space
+and show something before any image is downloaded.
+
+:class:`DerivativeCache` produces the same kind of variant on request, for
+images that have not been through a build yet, and keeps the results in a
+size-bounded directory.
+
+Requires Pillow (``pip install digitname[images]``); ``pillow-avif-plugin``
+adds AVIF to Pillow versions without built-in support.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .jsonstream import PathLike, write_json
+
+try:
+    from PIL import Image
+except ImportError:  # optional: only needed to build variants
+    Image = None
+
+try:
+    import pillow_avif  # noqa: F401  registers AVIF on older Pillow
+except ImportError:
+    pass
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+HASH_LENGTH = 10
+
+DEFAULT_WIDTHS = (320, 640, 960)
+DEFAULT_FORMATS = ("avif", "webp")
+DEFAULT_QUALITY = 75
+
+#: Width of the inline placeholder image; browsers upscale it smoothly,
+#: which gives the blur
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 40
+
+#: On-request widths are rounded up to a multiple of this, which bounds the
+#: number of derivatives one image can have
+WIDTH_STEP = 16
+MAX_WIDTH = 2048
+DEFAULT_DERIVATIVE_BYTES = 256 * 1024 * 1024
+SOURCE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".webp"})
+
+_NAME_RE = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9._-]*$")
+
+#: Pillow format name, MIME type and encoder options per variant format
+FORMATS: Dict[str, Tuple[str, str, Dict[str, Any]]] = {
+    "avif": ("AVIF", "image/avif", {"speed": 6}),
+    "webp": ("WEBP", "image/webp", {"method": 6}),
+    "jpeg": ("JPEG", "image/jpeg", {"optimize": True, "progressive": True}),
+    "png": ("PNG", "image/png", {"optimize": True}),
+}
+
+
+def _require_pillow() -> None:
+    if Image is None:
+        raise RuntimeError(
+            "Pillow is required for image variants: pip install 'digitname[images]'")
+
+
+def file_hash(path: PathLike) -> str:
+    """Hex SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def available_formats(formats: Iterable[str]) -> List[str]:
+    """The subset of ``formats`` this Pillow build can encode."""
+    _require_pillow()
+    Image.init()
+    return [name for name in formats
+            if name in FORMATS and FORMATS[name][0] in Image.SAVE]
+
+
+def load_manifest(output_dir: PathLike) -> Dict[str, Any]:
+    """Image entries of a previous run, keyed by source file name."""
+    try:
+        with open(Path(output_dir) / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    images = manifest.get("images")
+    return images if isinstance(images, dict) else {}
+
+
+def _target_widths(source_width: int, widths: Sequence[int]) -> List[int]:
+    # Never upscale: requested widths beyond the source collapse to its width
+    return sorted({min(width, source_width) for width in widths}, reverse=True)
+
+
+def _normalize_mode(image: "Image.Image") -> "Image.Image":
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def _save(image: "Image.Image", path: Path, fmt: str, quality: int) -> int:
+    """Encode ``image`` to ``path`` atomically; returns the file size."""
+    pillow_format, _, options = FORMATS[fmt]
+    if pillow_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        image.save(tmp, pillow_format, quality=quality, **options)
+        size = tmp.stat().st_size
+        os.replace(tmp, path)
+    except BaseException:
+        if tmp.exists():
+            tmp.unlink()
+        raise
+    return size
+
+
+def _dominant_color(image: "Image.Image") -> str:
+    """Most common colour of a reduced palette, as ``#rrggbb``."""
+    small = image.convert("RGB")
+    small.thumbnail((64, 64))
+    quantized = small.quantize(colors=8)
+    _, index = max(quantized.getcolors())
+    r, g, b = quantized.getpalette()[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _placeholder(image: "Image.Image") -> str:
+    """A ``PLACEHOLDER_WIDTH`` pixel wide version of ``image`` as a data URI."""
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    small = image.convert("RGB").resize((PLACEHOLDER_WIDTH, height), Image.BOX)
+    buffer = io.BytesIO()
+    Image.init()
+    if "WEBP" in Image.SAVE:
+        small.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+        mime = "image/webp"
+    else:
+        small.save(buffer, "PNG", optimize=True)
+        mime = "image/png"
+    return f"data:{mime};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+def _build_variants(task: Tuple[str, str, str, Sequence[int], Sequence[str], int]
+                    ) -> Dict[str, Any]:
+    source, output_dir, digest, widths, formats, quality = task
+    stem = Path(source).stem
+    output_dir = Path(output_dir)
+    variants = []
+    with Image.open(source) as image:
+        image.load()
+        image = _normalize_mode(image)
+        source_size = image.size
+        # Largest first, each step resized from the previous one
+        current = image
+        for width in _target_widths(image.width, widths):
+            height = max(1, round(source_size[1] * width / source_size[0]))
+            if current.width != width:
+                current = current.resize((width, height), Image.LANCZOS)
+            for name in formats:
+                filename = f"{stem}-{width}w.{digest[:HASH_LENGTH]}.{name}"
+                path = output_dir / filename
+                if not path.exists():
+                    _save(current, path, name, quality)
+                variants.append({"file": filename, "type": FORMATS[name][1],
+                                 "width": width, "height": height})
+        # The smallest variant is plenty for the colour and the placeholder
+        return {
+            "width": source_size[0],
+            "height": source_size[1],
+            "color": _dominant_color(current),
+            "placeholder": _placeholder(current),
+            "variants": variants,
+        }
+
+
+def build_variants(sources: Iterable[PathLike], output_dir: PathLike,
+                   widths: Sequence[int] = DEFAULT_WIDTHS,
+                   formats: Sequence[str] = DEFAULT_FORMATS,
+                   quality: int = DEFAULT_QUALITY,
+                   workers: Optional[int] = None) -> Dict[str, Any]:
+    """Create missing variants and return the manifest's image entries.
+
+    Args:
+        sources: Source images; their file names key the manifest.
+        output_dir: Directory for the variants and ``manifest.json``.
+        widths: Target widths in pixels; never wider than the source.
+        formats: Variant formats in order of preference, see :data:`FORMATS`.
+            Formats the installed Pillow cannot encode are skipped.
+        quality: Encoder quality.
+        workers: Processes to encode on; the CPU count when not given.
+
+    Returns:
+        ``{"www_airsca_com.png": {"hash", "options", "width", "height",
+        "variants": [{"file", "type", "width", "height"}, ...]}}``.
+    """
+    _require_pillow()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    formats = available_formats(formats)
+    widths = sorted(set(widths))
+    options = hashlib.sha256(json.dumps(
+        [widths, formats, quality, PLACEHOLDER_WIDTH, PLACEHOLDER_QUALITY]
+    ).encode()).hexdigest()[:16]
+
+    previous = load_manifest(output_dir)
+    images: Dict[str, Any] = {}
+    pending: List[Tuple[str, Tuple]] = []
+    for source in sources:
+        name = Path(source).name
+        digest = file_hash(source)
+        entry = previous.get(name)
+        if (isinstance(entry, dict) and entry.get("hash") == digest
+                and entry.get("options") == options
+                and all((output_dir / v["file"]).exists()
+                        for v in entry.get("variants", []))):
+            images[name] = entry
+        else:
+            task = (str(source), str(output_dir), digest, widths, formats, quality)
+            pending.append((name, task))
+
+    if pending:
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        tasks = [task for _, task in pending]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_build_variants, tasks))
+        else:
+            results = [_build_variants(task) for task in tasks]
+        for (name, task), result in zip(pending, results):
+            images[name] = {"hash": task[2], "options": options, **result}
+
+    # Drop variants of replaced or removed sources
+    current = {v["file"] for entry in images.values() for v in entry["variants"]}
+    for entry in previous.values():
+        for variant in entry.get("variants", []) if isinstance(entry, dict) else []:
+            if variant.get("file") not in current:
+                try:
+                    os.unlink(output_dir / variant["file"])
+                except (FileNotFoundError, KeyError):
+                    pass
+
+    if images != previous:
+        write_json(output_dir / MANIFEST_NAME,
+                   {"version": MANIFEST_VERSION, "images": images})
+    return images
+
+
+def srcsets(entry: Dict[str, Any], prefix: str) -> Dict[str, str]:
+    """``srcset`` attribute values of one manifest entry, keyed by MIME type."""
+    sets: Dict[str, List[str]] = {}
+    for variant in sorted(entry.get("variants", []), key=lambda v: v["width"]):
+        candidate = f"{prefix}{variant['file']} {variant['width']}w"
+        sets.setdefault(variant["type"], []).append(candidate)
+    return {mime: ", ".join(candidates) for mime, candidates in sets.items()}
+
+
+def _annotate(records: List[Dict[str, Any]], images: Dict[str, Any],
+              fields: Callable[[Dict[str, Any]], Dict[str, Any]],
+              names: Sequence[str]) -> int:
+    """Set ``fields(entry)`` on records with a manifest entry.
+
+    Any of ``names`` left empty or missing is removed from the record.
+    """
+    changed = 0
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        thumbnail = record.get("thumbnail")
+        entry = (images.get(thumbnail.rsplit("/", 1)[-1])
+                 if isinstance(thumbnail, str) else None)
+        values = fields(entry) if entry else {}
+        before = {name: record.get(name) for name in names}
+        for name in names:
+            if values.get(name):
+                record[name] = values[name]
+            else:
+                record.pop(name, None)
+        if {name: record.get(name) for name in names} != before:
+            changed += 1
+    return changed
+
+
+def add_srcsets(records: List[Dict[str, Any]], images: Dict[str, Any],
+                prefix: str) -> int:
+    """Set ``thumbnail_srcset`` on records whose ``thumbnail`` has variants.
+
+    Args:
+        records: ``data.json`` entries, updated in place.
+        images: Entries returned by :func:`build_variants`.
+        prefix: URL of the variants directory, with trailing slash.
+
+    Returns:
+        Number of records changed.
+    """
+    return _annotate(records, images,
+                     lambda entry: {"thumbnail_srcset": srcsets(entry, prefix)},
+                     ["thumbnail_srcset"])
+
+
+def add_placeholders(records: List[Dict[str, Any]], images: Dict[str, Any]) -> int:
+    """Set thumbnail dimensions, dominant colour and LQIP data URI on records.
+
+    Adds ``thumbnail_width``, ``thumbnail_height``, ``thumbnail_color`` and
+    ``thumbnail_placeholder`` to records whose ``thumbnail`` was processed by
+    :func:`build_variants`.
+
+    Returns:
+        Number of records changed.
+    """
+    return _annotate(records, images, lambda entry: {
+        "thumbnail_width": entry.get("width"),
+        "thumbnail_height": entry.get("height"),
+        "thumbnail_color": entry.get("color"),
+        "thumbnail_placeholder": entry.get("placeholder"),
+    }, ["thumbnail_width", "thumbnail_height", "thumbnail_color",
+        "thumbnail_placeholder"])
+
+
+class DerivativeCache:
+    """Size-bounded on-disk cache of images resized on request.
+
+    Entries are named after the source, the width, a signature of the
+    source's mtime and size, and the format, so an updated source is never
+    served from a stale entry. Least recently used entries are evicted
+    first. Recency is tracked in memory, so a hit touches no file; it is
+    written back as file modification times by :meth:`flush`, which runs
+    whenever an entry is rendered, so a restart starts from roughly the
+    same order. Concurrent requests for the same missing entry wait on a
+    per-entry lock, so it is rendered once.
+
+    A path returned by :meth:`get` may be evicted by a later call before it
+    is read; callers that read it should :meth:`discard` the entry and call
+    :meth:`get` again on :exc:`FileNotFoundError`.
+    """
+
+    def __init__(self, source_dir: PathLike, cache_dir: PathLike,
+                 max_bytes: int = DEFAULT_DERIVATIVE_BYTES,
+                 quality: int = DEFAULT_QUALITY):
+        """Initialize the cache.
+
+        Args:
+            source_dir: Directory of the original images.
+            cache_dir: Directory for the derivatives.
+            max_bytes: Total size the derivatives are kept under.
+            quality: Encoder quality.
+        """
+        self.source_dir = Path(source_dir).resolve()
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._touched: Set[str] = set()
+        self._lock = threading.Lock()
+        self._key_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = (
+            weakref.WeakValueDictionary())
+        self._load()
+
+    def _load(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        found = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith("."):
+                continue
+            stat = entry.stat()
+            found.append((stat.st_mtime_ns, entry.name, stat.st_size))
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+            self._size += size
+
+    @property
+    def size(self) -> int:
+        """Total bytes of cached derivatives."""
+        return self._size
+
+    def source(self, name: str) -> Path:
+        """Original image called ``name``.
+
+        Raises:
+            FileNotFoundError: No such image, or not a plain file name.
+        """
+        if not _NAME_RE.match(name) or Path(name).suffix.lower() not in SOURCE_SUFFIXES:
+            raise FileNotFoundError(name)
+        path = self.source_dir / name
+        if not path.is_file():
+            raise FileNotFoundError(name)
+        return path
+
+    def get(self, name: str, width: Optional[int] = None, fmt: str = "webp") -> Path:
+        """Path of ``name`` at ``width`` (rounded up to ``WIDTH_STEP``) in ``fmt``.
+
+        Renders the derivative on first use. Without ``width`` the image
+        keeps its size and is only re-encoded.
+
+        Raises:
+            FileNotFoundError: Unknown image.
+            ValueError: Width out of range or format not supported.
+            RuntimeError: Pillow is not installed.
+        """
+        if fmt not in available_formats([fmt]):
+            raise ValueError(f"Unsupported format: {fmt}")
+        if width is not None:
+            if not 0 < width <= MAX_WIDTH:
+                raise ValueError(f"Width must be between 1 and {MAX_WIDTH}")
+            width = min(MAX_WIDTH, -(-width // WIDTH_STEP) * WIDTH_STEP)
+        source = self.source(name)
+        stat = source.stat()
+        fingerprint = f"{name}:{stat.st_mtime_ns}:{stat.st_size}"
+        signature = hashlib.sha256(fingerprint.encode()).hexdigest()
+        size_label = f"-{width}w" if width else ""
+        key = f"{source.stem}{size_label}.{signature[:HASH_LENGTH]}.{fmt}"
+        path = self.cache_dir / key
+
+        if self._touch(key):
+            return path
+        with self._lock_for(key):
+            if not self._touch(key):
+                self._add(key, self._render(source, path, width, fmt))
+                self.flush()
+        return path
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _touch(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._entries.move_to_end(key)
+            self._touched.add(key)
+            return True
+
+    def discard(self, key: str) -> None:
+        """Forget the entry named ``key``, e.g. after its file went missing."""
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)
+            self._touched.discard(key)
+
+    def flush(self) -> None:
+        """Write the recency of entries hit since the last flush to disk.
+
+        Touched entries get increasing modification times in their LRU
+        order, after every untouched one, which is the order :meth:`_load`
+        restores.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key in self._touched]
+            self._touched.clear()
+        now = time.time_ns()
+        for offset, key in enumerate(keys):
+            try:
+                os.utime(self.cache_dir / key, ns=(now + offset, now + offset))
+            except FileNotFoundError:
+                self.discard(key)
+
+    def _render(self, source: Path, path: Path, width: Optional[int], fmt: str) -> int:
+        with Image.open(source) as image:
+            image.load()
+            image = _normalize_mode(image)
+            if width and width < image.width:
+                height = max(1, round(image.height * width / image.width))
+                image = image.resize((width, height), Image.LANCZOS)
+            return _save(image, path, fmt, self.quality)
+
+    def _add(self, key: str, size: int) -> None:
+        with self._lock:
+            self._entries[key] = size
+            self._size += size
+            self._touched.add(key)
+            # Evict oldest first, never the entry just added
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                old, old_size = self._entries.popitem(last=False)
+                self._size -= old_size
+                self._touched.discard(old)
+                try:
+                    os.unlink(self.cache_dir / old)
+                except FileNotFoundError:
+                    pass
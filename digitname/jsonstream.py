@@ -0,0 +1,230 @@
+"""
+Streaming, atomic JSON output for portfolio files.
+
+Projects are encoded one at a time and written straight to ``portfolio.json``
+and to their per-source split file in the same pass, so the dataset is never
+serialised as a whole. Every file is written to a temporary sibling and
+renamed into place, so readers never see a half-written document.
+
+With ``indent=2`` the output is byte-for-byte what ``json.dump(data, f,
+indent=2)`` produces; ``indent=None`` writes compact JSON.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Optional, Set, Union
+
+PathLike = Union[str, Path]
+
+
+class AtomicFile:
+    """File written to a temporary sibling and renamed on success.
+
+    Text mode (UTF-8) by default; pass ``binary=True`` for a bytes file.
+    """
+
+    def __init__(self, path: PathLike, binary: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        # mkstemp creates 0600 files; keep the usual world-readable mode
+        try:
+            mode = self.path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(self._tmp_path, mode)
+        if binary:
+            self.file: IO = os.fdopen(fd, "wb")
+        else:
+            self.file = os.fdopen(fd, "w", encoding="utf-8")
+
+    def commit(self) -> None:
+        """Flush the file and move it into place."""
+        self.file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self) -> None:
+        """Drop the temporary file, leaving any existing file untouched."""
+        self.file.close()
+        if os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+    def __enter__(self) -> IO:
+        return self.file
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+class JSONObjectWriter:
+    """Writes a top-level JSON object key by key, with one streamed array.
+
+    Array items must be encoded with :meth:`encode_item` (or be the output of
+    the same method on a writer with the same ``indent``), which lets one
+    encoding be shared by several writers.
+    """
+
+    def __init__(self, file: IO[str], indent: Optional[int] = 2):
+        self.file = file
+        self.indent = indent
+        self._first_key = True
+        self._first_item = True
+        if indent is None:
+            self._key_sep, self._item_sep = ":", ","
+        else:
+            self._key_sep, self._item_sep = ": ", ","
+        self.file.write("{")
+
+    def _dumps(self, value: Any) -> str:
+        if self.indent is None:
+            return json.dumps(value, separators=(",", ":"))
+        return json.dumps(value, indent=self.indent)
+
+    def _newline(self, depth: int) -> str:
+        return "" if self.indent is None else "\n" + " " * (self.indent * depth)
+
+    def _begin_key(self, name: str) -> None:
+        if not self._first_key:
+            self.file.write(self._item_sep)
+        self._first_key = False
+        self.file.write(f"{self._newline(1)}{json.dumps(name)}{self._key_sep}")
+
+    def encode_item(self, value: Any) -> str:
+        """Encode an array item, indented for its position in the document."""
+        encoded = self._dumps(value)
+        if self.indent is not None:
+            encoded = encoded.replace("\n", self._newline(2))
+        return encoded
+
+    def key(self, name: str, value: Any) -> None:
+        """Write ``"name": value``."""
+        encoded = self._dumps(value)
+        if self.indent is not None:
+            encoded = encoded.replace("\n", self._newline(1))
+        self._begin_key(name)
+        self.file.write(encoded)
+
+    def begin_array(self, name: str) -> None:
+        """Start ``"name": [`` whose items follow through :meth:`item`."""
+        self._begin_key(name)
+        self.file.write("[")
+        self._first_item = True
+
+    def item(self, encoded: str) -> None:
+        """Append an item produced by :meth:`encode_item`."""
+        if not self._first_item:
+            self.file.write(self._item_sep)
+        self._first_item = False
+        self.file.write(f"{self._newline(2)}{encoded}")
+
+    def end_array(self) -> None:
+        if not self._first_item:
+            self.file.write(self._newline(1))
+        self.file.write("]")
+
+    def close(self) -> None:
+        """Write the closing brace."""
+        if not self._first_key:
+            self.file.write("\n" if self.indent is not None else "")
+        self.file.write("}")
+
+
+def split_filename(source: str) -> str:
+    """Name of the per-source split file for ``source``."""
+    return f"portfolio_{source.lower().replace(' ', '_')}.json"
+
+
+def write_portfolio(path: PathLike, data: Dict[str, Any], indent: Optional[int] = 2,
+                    split_dir: Optional[PathLike] = None,
+                    sources: Optional[Set[str]] = None,
+                    on_write: Optional[Callable[[str, Path], None]] = None) -> None:
+    """Write ``data`` to ``path`` and its projects to per-source split files.
+
+    Each project is encoded once and written to both the main file and its
+    source's split file in a single pass. All files are committed atomically
+    once every project has been written.
+
+    Args:
+        path: Main ``portfolio.json`` path.
+        data: Portfolio document; its ``projects`` list is streamed.
+        indent: Indentation, or ``None`` for compact output.
+        split_dir: Directory of the ``portfolio_<source>.json`` files;
+            defaults to the main file's directory.
+        sources: Only write split files for these sources (all when ``None``).
+            Listed sources without projects get an empty split file.
+        on_write: Called with ``(source, path)`` after each file is committed;
+            ``source`` is ``""`` for the main file.
+    """
+    split_dir = Path(split_dir) if split_dir is not None else Path(path).parent
+    files = []
+    splits: Dict[str, JSONObjectWriter] = {}
+    counts: Dict[str, int] = {}
+
+    def open_split(source: str) -> JSONObjectWriter:
+        atomic = AtomicFile(split_dir / split_filename(source))
+        files.append((source, atomic))
+        writer = JSONObjectWriter(atomic.file, indent)
+        writer.key("source", source)
+        writer.key("last_updated", data.get("last_updated"))
+        writer.begin_array("projects")
+        counts[source] = 0
+        return writer
+
+    main_file = AtomicFile(path)
+    files.append(("", main_file))
+    try:
+        main = JSONObjectWriter(main_file.file, indent)
+        for name, value in data.items():
+            if name != "projects" or not isinstance(value, list):
+                main.key(name, value)
+                continue
+
+            for source in sorted(sources or ()):
+                splits[source] = open_split(source)
+
+            main.begin_array(name)
+            for project in value:
+                encoded = main.encode_item(project)
+                main.item(encoded)
+
+                source = project.get("source") if isinstance(project, dict) else None
+                if not source or (sources is not None and source not in sources):
+                    continue
+                if source not in splits:
+                    splits[source] = open_split(source)
+                splits[source].item(encoded)
+                counts[source] += 1
+            main.end_array()
+        main.close()
+
+        for source, writer in splits.items():
+            writer.end_array()
+            writer.key("stats", {"total_projects": counts[source]})
+            writer.close()
+    except BaseException:
+        for _, atomic in files:
+            atomic.discard()
+        raise
+
+    for source, atomic in files:
+        atomic.commit()
+        if on_write is not None:
+            on_write(source, atomic.path)
+
+
+def write_json(path: PathLike, data: Any, indent: Optional[int] = 2) -> None:
+    """Write a small JSON document atomically."""
+    # json.dumps runs on the C encoder; json.dump to a file does not
+    if indent is None:
+        text = json.dumps(data, separators=(",", ":"))
+    else:
+        text = json.dumps(data, indent=indent)
+    with AtomicFile(path) as f:
+        f.write(text)
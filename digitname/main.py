@@ -1,10 +1,15 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
-import json
+from typing import Optional
 import os
 
+from .images import FORMATS, MAX_WIDTH, DerivativeCache
+from .search import SearchService
+from .store import PortfolioStore
+
 app = FastAPI(title="Digitname API",
              description="API for serving portfolio data",
              version="1.0.0")
@@ -26,17 +31,131 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 # Load portfolio data
 PORTFOLIO_FILE = Path(__file__).parent.parent / "portfolio" / "portfolio.json"
 
+DATA_FILE = Path(__file__).parent.parent / "data.json"
+
+# Parsed once, reloaded when the updater replaces the file
+RELOAD_INTERVAL = float(os.getenv("PORTFOLIO_RELOAD_INTERVAL", "1.0"))
+portfolio_store = PortfolioStore(PORTFOLIO_FILE, check_interval=RELOAD_INTERVAL)
+data_store = PortfolioStore(DATA_FILE, check_interval=RELOAD_INTERVAL)
+search_service = SearchService(portfolio_store, data_store)
+
+# Thumbnails resized on request, kept in a bounded on-disk cache
+THUMBNAILS_DIR = Path(__file__).parent.parent / "thumbnails"
+THUMB_CACHE_DIR = Path(os.getenv("THUMB_CACHE_DIR",
+                                 Path(__file__).parent.parent / ".cache" / "thumbs"))
+THUMB_CACHE_MB = int(os.getenv("THUMB_CACHE_MB", "256"))
+thumb_cache = DerivativeCache(THUMBNAILS_DIR, THUMB_CACHE_DIR,
+                              max_bytes=THUMB_CACHE_MB * 1024 * 1024)
+
 def load_portfolio():
-    try:
-        with open(PORTOLIO_FILE) as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {"error": "Portfolio data not found"}
+    return portfolio_store.get().data
+
+# The data routes are plain functions so FastAPI runs them on its thread
+# pool: a request that finds the file replaced reloads it and rebuilds the
+# indexes, which must not stall every other request on the event loop
 
 @app.get("/api/portfolio")
-async def get_portfolio():
+def get_portfolio(request: Request):
     """Get all portfolio data"""
-    return load_portfolio()
+    state = portfolio_store.get()
+    headers = {"ETag": state.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == state.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=state.body, media_type="application/json", headers=headers)
+
+@app.get("/api/projects")
+def list_projects(
+    source: Optional[str] = None,
+    language: Optional[str] = None,
+    min_stars: Optional[int] = Query(None, ge=0),
+    updated_since: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: str = "-stars",
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    """List projects matching the given filters, one page at a time.
+
+    ``source`` and ``language`` accept comma-separated values. ``sort`` is
+    ``stars``, ``updated`` or ``name``, prefixed with ``-`` for descending
+    order. Pass the returned ``next_cursor`` as ``cursor`` for the next page.
+    """
+    index = portfolio_store.get().index
+    try:
+        page = index.query(
+            source=source,
+            language=language,
+            min_stars=min_stars,
+            updated_since=updated_since,
+            q=q,
+            sort=sort,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"projects": page.items, "total": page.total,
+            "next_cursor": page.next_cursor}
+
+@app.get("/api/search")
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = Query(None, pattern="^(domain|project)$"),
+    prefix: bool = True,
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Search domains and projects, best matches first.
+
+    The last word of ``q`` also matches as a prefix unless ``prefix=false``.
+    """
+    hits = search_service.index().search(q, limit=limit, prefix=prefix, kind=type)
+    return {"query": q, "results": [{**hit.record, "score": hit.score} for hit in hits]}
+
+@app.get("/thumb/{name}")
+def thumbnail(
+    request: Request,
+    name: str,
+    w: Optional[int] = Query(None, ge=1, le=MAX_WIDTH),
+    fmt: str = Query("webp", pattern="^(" + "|".join(FORMATS) + ")$"),
+):
+    """A thumbnail resized to width ``w`` and encoded as ``fmt``.
+
+    Rendered on the first request and served from the derivative cache after
+    that. Runs on the thread pool, since rendering blocks.
+    """
+    try:
+        path = thumb_cache.get(name, w, fmt)
+        # The cache key changes with the source, so it doubles as the validator
+        headers = {"ETag": f'"{path.name}"', "Cache-Control": "public, max-age=86400"}
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        # Serve from a descriptor opened here: once open, a concurrent request
+        # evicting the entry cannot pull the file from under the response
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            thumb_cache.discard(path.name)
+            path = thumb_cache.get(name, w, fmt)
+            headers["ETag"] = f'"{path.name}"'
+            file = open(path, "rb")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    headers["Content-Length"] = str(os.fstat(file.fileno()).st_size)
+    return StreamingResponse(_read_chunks(file), media_type=FORMATS[fmt][1],
+                             headers=headers)
+
+def _read_chunks(file, chunk_size: int = 64 * 1024):
+    """Yield ``file`` in chunks and close it, however the response ends."""
+    with file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
 
 @app.get("/api/health")
 async def health_check():
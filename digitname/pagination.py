@@ -0,0 +1,101 @@
+"""
+Automatic pagination for list endpoints.
+
+Follows ``Link: <...>; rel="next"`` headers (GitHub, GitLab, Hugging Face) and
+GitLab's ``X-Total-Pages``. When the number of pages is known from the first
+response, the remaining pages are fetched concurrently; otherwise ``next``
+links are followed one by one. Items are yielded as pages arrive, so large
+organisations never need their full listing in memory.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .fetch import Submit, ordered_map
+from .transport import Response
+
+_LINK_RE = re.compile(r'<([^>]*)>\s*;\s*rel="?([^";]+)"?')
+
+
+def parse_link_header(value: Optional[str]) -> Dict[str, str]:
+    """Parse an RFC 8288 ``Link`` header into ``{rel: url}``."""
+    links = {}
+    for url, rels in _LINK_RE.findall(value or ""):
+        for rel in rels.split():
+            links[rel] = url
+    return links
+
+
+def with_page(url: str, page: int, param: str = "page") -> str:
+    """Return ``url`` with its page query parameter set to ``page``."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k != param]
+    query.append((param, str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def total_pages(response: Response) -> Optional[Tuple[int, str]]:
+    """Number of pages and a URL template, when the first response tells.
+
+    Uses GitLab's ``X-Total-Pages`` header or the ``page`` parameter of a
+    ``rel="last"`` link (GitHub). Returns ``None`` for cursor-based APIs.
+    """
+    header = response.headers.get("X-Total-Pages")
+    if header and header.isdigit():
+        return int(header), response.url
+
+    last = parse_link_header(response.headers.get("Link")).get("last")
+    if last:
+        page = dict(parse_qsl(urlsplit(last).query)).get("page", "")
+        if page.isdigit():
+            return int(page), last
+    return None
+
+
+def _items(data: Any) -> List[Any]:
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in ("items", "results", "data"):
+            if isinstance(data.get(key), list):
+                return data[key]
+    return []
+
+
+def paginate(fetch: Callable[[str], Response], url: str,
+             extract: Callable[[Any], List[Any]] = _items, workers: int = 4,
+             submit: Optional[Submit] = None,
+             max_pages: Optional[int] = None) -> Iterator[Any]:
+    """Yield every item of a paginated listing, page by page.
+
+    Args:
+        fetch: Called with a page URL; returns the response or raises.
+        url: URL of the first page.
+        extract: Turns a decoded page body into its list of items.
+        workers: Pages fetched concurrently when the page count is known.
+        submit: Optional ``submit(func, url)`` to fetch pages on an existing
+            pool (see :func:`digitname.fetch.ordered_map`).
+        max_pages: Stop after this many pages.
+    """
+    response = fetch(url)
+    yield from extract(response.json())
+
+    known = total_pages(response)
+    if known is not None:
+        count, template = known
+        if max_pages is not None:
+            count = min(count, max_pages)
+        page_urls = (with_page(template, page) for page in range(2, count + 1))
+        for page in ordered_map(fetch, page_urls, workers=workers, submit=submit):
+            yield from extract(page.json())
+        return
+
+    pages = 1
+    next_url = parse_link_header(response.headers.get("Link")).get("next")
+    while next_url and (max_pages is None or pages < max_pages):
+        response = fetch(next_url)
+        pages += 1
+        yield from extract(response.json())
+        next_url = parse_link_header(response.headers.get("Link")).get("next")
@@ -5,12 +5,77 @@ Handles the creation of portfolio based on user's development accounts.
 """
 
 import os
+import re
+from collections import Counter
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 import json
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (Environment, FileSystemBytecodeCache, FileSystemLoader,
+                    select_autoescape)
+
+from .assets import export_assets, rewrite_references
+from .fetch import fetch_each
+from .pagination import paginate
+from .render import IncrementalRenderer, RenderJob
+from .transport import Response, get_transport
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+#: Context variables that change on every build without changing content
+VOLATILE_CONTEXT = {"generated_at"}
+
+DEFAULT_PAGE_SIZE = 50
+
+GITHUB_API_URL = "https://api.github.com"
+NPM_REGISTRY_URL = "https://registry.npmjs.org"
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def datetimeformat(value, format='%Y-%m-%d'):
+    """Format an ISO 8601 timestamp, passing unparseable values through."""
+    if not value:
+        return ''
+    try:
+        dt = datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+        return dt.strftime(format)
+    except (ValueError, TypeError):
+        return value
+
+
+def create_environment(template_name: str = "default",
+                       cache_dir: Optional[Path] = None) -> Environment:
+    """Jinja2 environment for a portfolio template.
+    
+    Args:
+        template_name: Template directory under ``digitname/templates``.
+        cache_dir: Directory for compiled template bytecode, shared between
+            builds; no bytecode cache when not given.
+    """
+    bytecode_cache = None
+    if cache_dir is not None:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR / template_name),
+        autoescape=select_autoescape(['html', 'xml']),
+        bytecode_cache=bytecode_cache
+    )
+    env.filters['datetimeformat'] = datetimeformat
+    return env
+
+
+def default_cache_dir(output_dir: Path) -> Path:
+    """Build cache of one output directory, kept beside it rather than in it.
+
+    Each output directory gets its own, so the recorded build state of one
+    tree is never used to skip or prune pages of another.
+    """
+    output_dir = Path(output_dir).resolve()
+    return output_dir.parent / ".cache" / "portfolio" / output_dir.name
 
 
 class PortfolioGenerator:
@@ -23,57 +88,61 @@ class PortfolioGenerator:
             config: Dictionary containing portfolio configuration.
         """
         self.config = config
-        self.template_dir = Path(__file__).parent / "templates"
+        self.template_dir = TEMPLATE_DIR
         self.output_dir = Path(config.get("output_dir", "portfolio")).resolve()
+        cache_dir = config.get("cache_dir") or default_cache_dir(self.output_dir)
+        self.cache_dir = Path(cache_dir).resolve()
         self.template_name = config.get("template", "default")
         self.theme = config.get("theme", {})
+        self.transport = get_transport()
+        self.workers = config.get("workers", 8)
+        self.incremental = config.get("incremental", True)
+        self.page_size = max(1, int(config.get("page_size", DEFAULT_PAGE_SIZE)))
+        self.render_workers = config.get("render_workers") or os.cpu_count() or 1
+        self.fingerprint_assets = config.get("fingerprint_assets", True)
+        # Overridable to point the fetchers at a local stand-in
+        # (see digitname/fakeapi.py)
+        self.github_api_url = (config.get("github_api_url")
+                               or os.getenv("GITHUB_BASE_URL", GITHUB_API_URL)
+                               ).rstrip("/")
+        self.npm_registry_url = (config.get("npm_registry_url")
+                                 or os.getenv("NPM_BASE_URL", NPM_REGISTRY_URL)
+                                 ).rstrip("/")
+        self.asset_manifest: Dict[str, str] = {}
+        self.renderer: Optional[IncrementalRenderer] = None
+        self._reset_jobs()
         
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         # Set up Jinja2 environment
-        self.env = Environment(
-            loader=FileSystemLoader(self.template_dir / self.template_name),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
-        
-        # Add datetime format filter
-        def datetimeformat(value, format='%Y-%m-%d'):
-            if not value:
-                return ''
-            from datetime import datetime
-            try:
-                # Parse ISO 8601 format
-                dt = datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
-                return dt.strftime(format)
-            except (ValueError, TypeError):
-                return value
-                
-        self.env.filters['datetimeformat'] = datetimeformat
+        self.env = create_environment(self.template_name, self.cache_dir / "jinja")
+
+    def _github_pages(self, url: str) -> Iterator[Dict[str, Any]]:
+        """Stream every item of a paginated GitHub listing."""
+        def fetch(page_url: str) -> Response:
+            response = self.transport.get(
+                page_url, headers={"Accept": "application/vnd.github.v3+json"})
+            response.raise_for_status()
+            return response
+
+        return paginate(fetch, url)
 
     def _fetch_github_orgs(self, username: str) -> List[Dict[str, Any]]:
         """Fetch organizations for a GitHub user."""
         try:
-            import requests
-            url = f"https://api.github.com/users/{username}/orgs"
-            response = requests.get(url, headers={"Accept": "application/vnd.github.v3+json"})
-            response.raise_for_status()
-            return response.json()
+            url = f"{self.github_api_url}/users/{username}/orgs?per_page=100"
+            return list(self._github_pages(url))
         except Exception as e:
             print(f"Error fetching GitHub organizations: {e}")
             return []
 
-    def _fetch_github_repos(self, url: str, owner: str) -> List[Dict[str, Any]]:
-        """Fetch repositories from a GitHub user or organization."""
+    def _fetch_github_repos(self, url: str, owner: str) -> Iterator[Dict[str, Any]]:
+        """Fetch repositories from a GitHub user or organization, page by page."""
         try:
-            import requests
-            response = requests.get(f"{url}?sort=updated&per_page=100", 
-                                 headers={"Accept": "application/vnd.github.v3+json"})
-            response.raise_for_status()
-            return response.json()
+            yield from self._github_pages(f"{url}?sort=updated&per_page=100")
         except Exception as e:
             print(f"Error fetching GitHub repositories from {url}: {e}")
-            return []
 
     def _process_github_repo(self, repo: Dict[str, Any], owner_type: str = 'user') -> Dict[str, Any]:
         """Process a single GitHub repository into our format."""
@@ -94,12 +163,11 @@ class PortfolioGenerator:
     def _fetch_github_projects(self, username: str) -> List[Dict[str, Any]]:
         """Fetch all projects from GitHub including user and organization repos."""
         try:
-            import requests
             projects = []
             
             # Fetch user's personal repositories
             user_repos = self._fetch_github_repos(
-                f"https://api.github.com/users/{username}/repos",
+                f"{self.github_api_url}/users/{username}/repos",
                 'user'
             )
             projects.extend([self._process_github_repo(repo, 'user') for repo in user_repos])
@@ -108,7 +176,7 @@ class PortfolioGenerator:
             orgs = self._fetch_github_orgs(username)
             for org in orgs:
                 org_repos = self._fetch_github_repos(
-                    f"https://api.github.com/orgs/{org['login']}/repos",
+                    f"{self.github_api_url}/orgs/{org['login']}/repos",
                     'organization'
                 )
                 projects.extend([self._process_github_repo(repo, 'organization') for repo in org_repos])
@@ -119,45 +187,48 @@ class PortfolioGenerator:
             print(f"Error in GitHub projects fetch: {e}")
             return []
 
+    def _fetch_npm_package(self, pkg_name: str, username: str) -> Dict[str, Any]:
+        """Fetch the registry document of one NPM package."""
+        pkg_url = f"{self.npm_registry_url}/{pkg_name}"
+        pkg_response = self.transport.get(pkg_url)
+        pkg_response.raise_for_status()
+        pkg_data = pkg_response.json()
+        
+        latest_version = pkg_data.get('dist-tags', {}).get('latest')
+        version_data = pkg_data.get('versions', {}).get(latest_version, {})
+        
+        return {
+            'name': pkg_name,
+            'description': (version_data.get('description') or 'No description').split('.')[0] + '.',
+            'url': f"https://www.npmjs.com/package/{pkg_name}",
+            'version': latest_version,
+            'provider': 'NPM',
+            'downloads': pkg_data.get('downloads', {}).get('lastDay', 0),
+            'owner': username,
+            'owner_type': 'user',
+            'keywords': version_data.get('keywords', []),
+            'created_at': pkg_data.get('time', {}).get('created', ''),
+            'updated_at': pkg_data.get('time', {}).get('modified', '')
+        }
+
     def _fetch_npm_projects(self, username: str) -> List[Dict[str, Any]]:
         """Fetch packages from NPM."""
         try:
-            import requests
             # First, get the list of packages
-            url = f"https://registry.npmjs.org/-/user/org.couchdb.user:{username}/package"
-            response = requests.get(url)
+            url = f"{self.npm_registry_url}/-/user/org.couchdb.user:{username}/package"
+            response = self.transport.get(url)
             response.raise_for_status()
             
-            packages = []
-            # For each package, get its details
-            for pkg_name in response.json().get('packages', []):
-                try:
-                    pkg_url = f"https://registry.npmjs.org/{pkg_name}"
-                    pkg_response = requests.get(pkg_url)
-                    pkg_response.raise_for_status()
-                    pkg_data = pkg_response.json()
-                    
-                    latest_version = pkg_data.get('dist-tags', {}).get('latest')
-                    version_data = pkg_data.get('versions', {}).get(latest_version, {})
-                    
-                    packages.append({
-                        'name': pkg_name,
-                        'description': (version_data.get('description') or 'No description').split('.')[0] + '.',
-                        'url': f"https://www.npmjs.com/package/{pkg_name}",
-                        'version': latest_version,
-                        'provider': 'NPM',
-                        'downloads': pkg_data.get('downloads', {}).get('lastDay', 0),
-                        'owner': username,
-                        'owner_type': 'user',
-                        'keywords': version_data.get('keywords', []),
-                        'created_at': pkg_data.get('time', {}).get('created', ''),
-                        'updated_at': pkg_data.get('time', {}).get('modified', '')
-                    })
-                except Exception as e:
-                    print(f"Error fetching NPM package {pkg_name}: {e}")
-                    continue
-                    
-            return packages
+            def report(pkg_name, error):
+                print(f"Error fetching NPM package {pkg_name}: {error}")
+            
+            # Then fetch each package's details concurrently, keeping their order
+            return [package for _, package in fetch_each(
+                lambda pkg_name: self._fetch_npm_package(pkg_name, username),
+                response.json().get('packages', []),
+                workers=self.workers,
+                on_error=report
+            )]
             
         except Exception as e:
             print(f"Error in NPM projects fetch: {e}")
@@ -166,9 +237,8 @@ class PortfolioGenerator:
     def _fetch_pypi_projects(self, username: str) -> List[Dict[str, Any]]:
         """Fetch packages from PyPI."""
         try:
-            import requests
             url = f"https://pypi.org/user/{username}/"
-            response = requests.get(url)
+            response = self.transport.get(url)
             response.raise_for_status()
             # PyPI doesn't have a direct API for user packages, so we'll return an empty list for now
             # In a real implementation, you might need to parse the HTML or use a different approach
@@ -204,33 +274,141 @@ class PortfolioGenerator:
             "generated_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
             "theme": self.theme,
             "accounts": account_data,
-            "projects": projects,
         }
         
-        # Render and save the main page
-        self._render_template("index.html", "index.html", context)
+        # Export static files (CSS, JS, images) first so pages can link their
+        # fingerprinted names
+        self.asset_manifest = self._copy_static_files()
+        self._reset_jobs()
         
-        # Copy static files (CSS, JS, images)
-        self._copy_static_files()
+        # Render the paginated index and one page per project, skipping pages
+        # whose inputs did not change and removing pages of dropped projects
+        project_jobs = self._project_jobs(projects, context)
+        jobs = self._index_jobs(projects, context) + project_jobs
+        self.renderer = self._create_renderer()
+        rendered = self.renderer.render_all(
+            jobs, workers=self.render_workers,
+            env_factory=create_environment,
+            env_args=(self.template_name, self.cache_dir / "jinja")
+        )
+        self.renderer.prune(job.output_name for job in jobs)
+        self.renderer.save()
         
+        print(f"Rendered {len(rendered)} of {len(jobs)} pages")
         print(f"Portfolio generated successfully at: {self.output_dir}")
 
-    def _render_template(self, template_name: str, output_name: str, context: Dict[str, Any]) -> None:
-        """Render a template with the given context and save it to the output directory."""
-        template = self.env.get_template(template_name)
-        output_path = self.output_dir / output_name
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+    def _create_renderer(self) -> IncrementalRenderer:
+        """Renderer tracking the outputs of this generator's previous builds."""
+        return IncrementalRenderer(
+            self.env, self.output_dir, self.cache_dir / "render.json",
+            volatile=VOLATILE_CONTEXT, enabled=self.incremental
+        )
+
+    def _reset_jobs(self) -> None:
+        """Share one asset input and one postprocessor per directory between jobs."""
+        self._assets_input = {"assets": self.asset_manifest}
+        self._postprocess: Dict[str, partial] = {}
+
+    def _job(self, template_name: str, output_name: str,
+             context: Dict[str, Any]) -> RenderJob:
+        """Render job writing a page with its asset references fingerprinted."""
+        base = output_name.rpartition("/")[0]
+        postprocess = self._postprocess.get(base)
+        if postprocess is None:
+            postprocess = self._postprocess[base] = partial(
+                rewrite_references, manifest=self.asset_manifest, base=base
+            )
+        return RenderJob(template_name, output_name, context, extra=self._assets_input,
+                         postprocess=postprocess)
+
+    def _render_template(self, template_name: str, output_name: str,
+                         context: Dict[str, Any]) -> bool:
+        """Render a template with the given context and save it to the output directory.
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(template.render(**context))
+        Returns:
+            Whether the page was rendered; false when its templates, the
+            context values it uses and the asset manifest are unchanged
+            since the last build.
+        """
+        if self.renderer is None:
+            self.renderer = self._create_renderer()
+        job = self._job(template_name, output_name, context)
+        return bool(self.renderer.render_all([job]))
+
+    @staticmethod
+    def _page_path(number: int) -> str:
+        """Output path of an index page, relative to the site root."""
+        return "index.html" if number == 1 else f"page/{number}.html"
+
+    def _index_jobs(self, projects: List[Dict[str, Any]],
+                    context: Dict[str, Any]) -> List[RenderJob]:
+        """Index pages holding ``page_size`` projects each."""
+        provider_counts = dict(Counter(p.get('provider') for p in projects))
+        count = max(1, -(-len(projects) // self.page_size))
+        jobs = []
+        for number in range(1, count + 1):
+            output_name = self._page_path(number)
+            jobs.append(self._job("index.html", output_name, dict(
+                context,
+                root="" if number == 1 else "../",
+                projects=projects[(number - 1) * self.page_size:
+                                  number * self.page_size],
+                total_projects=len(projects),
+                provider_counts=provider_counts,
+                page={
+                    "number": number,
+                    "count": count,
+                    "previous": self._page_path(number - 1) if number > 1 else None,
+                    "next": self._page_path(number + 1) if number < count else None,
+                },
+            )))
+        return jobs
+
+    def _project_jobs(self, projects: List[Dict[str, Any]],
+                      context: Dict[str, Any]) -> List[RenderJob]:
+        """One detail page per project, at ``projects/<slug>.html``.
+        
+        Sets each project's ``slug``, which index pages link to.
+        """
+        seen = set()
+        jobs = []
+        for project in projects:
+            base_slug = _SLUG_RE.sub("-", "-".join(
+                str(project.get(key) or "") for key in ("provider", "owner", "name")
+            ).lower()).strip("-") or "project"
+            slug, number = base_slug, 1
+            while slug in seen:
+                number += 1
+                slug = f"{base_slug}-{number}"
+            seen.add(slug)
+            project['slug'] = slug
+            jobs.append(self._job("project.html", f"projects/{slug}.html", dict(
+                context,
+                title=project.get('name') or context["title"],
+                root="../",
+                project=project,
+            )))
+        return jobs
 
-    def _copy_static_files(self) -> None:
-        """Copy static files (CSS, JS, images) to the output directory."""
+    def _copy_static_files(self) -> Dict[str, str]:
+        """Copy static files (CSS, JS, images) to the output directory.
+        
+        With ``fingerprint_assets`` (the default) every file gets a
+        content-hashed name and only files not already exported are copied.
+        
+        Returns:
+            Mapping of asset paths to the names pages should reference.
+        """
         static_src = self.template_dir / self.template_name / "static"
         static_dest = self.output_dir / "static"
         
-        if static_src.exists():
-            import shutil
-            if static_dest.exists():
-                shutil.rmtree(static_dest)
-            shutil.copytree(static_src, static_dest)
+        if not static_src.exists():
+            return {}
+        if self.fingerprint_assets:
+            return export_assets(static_src, self.output_dir, "static")
+        
+        import shutil
+        if static_dest.exists():
+            shutil.rmtree(static_dest)
+        shutil.copytree(static_src, static_dest)
+        return {}
@@ -0,0 +1,228 @@
+"""
+Filtering, sorting and cursor pagination over portfolio projects.
+
+:class:`ProjectIndex` is built once per loaded portfolio. It keeps the row ids
+of each source and language and the rows pre-sorted by stars, update time
+and name, so a query only visits the rows that can match: equality filters
+intersect id sets, ``min_stars``/``updated_since`` cut the matching sort
+order with a binary search, and pages resume from the position encoded in
+their cursor instead of re-scanning from the start.
+"""
+
+import base64
+import json
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+SORT_KEYS = ("stars", "updated", "name")
+DEFAULT_SORT = "-stars"
+_ALIASES = {"updated_at": "updated", "star": "stars"}
+
+
+@dataclass
+class QueryResult:
+    """One page of matching projects."""
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    total: int = 0
+
+
+def _stars(project: Dict[str, Any]) -> int:
+    stars = project.get("stars")
+    return stars if isinstance(stars, int) else 0
+
+
+def _text(value: Any) -> str:
+    return value if isinstance(value, str) else ""
+
+
+def _values(value: Optional[str]) -> List[str]:
+    return [v.strip().lower() for v in (value or "").split(",") if v.strip()]
+
+
+def parse_sort(sort: Optional[str]) -> tuple:
+    """Split ``"-stars"`` into ``("stars", True)`` (descending).
+
+    Raises:
+        ValueError: For an unknown sort key.
+    """
+    sort = (sort or DEFAULT_SORT).strip()
+    descending = sort.startswith("-")
+    key = sort.lstrip("+-")
+    key = _ALIASES.get(key, key)
+    if key not in SORT_KEYS:
+        raise ValueError(f"unknown sort key {key!r}, "
+                         f"expected one of {', '.join(SORT_KEYS)}")
+    return key, descending
+
+
+class ProjectIndex:
+    """Secondary indexes over a list of projects."""
+
+    def __init__(self, projects: Sequence[Dict[str, Any]], version: str = ""):
+        """Build the indexes.
+
+        Args:
+            projects: Project records, e.g. ``portfolio["projects"]``.
+            version: Identifies this data set in cursors, so a cursor from
+                before a reload is rejected instead of skipping rows.
+        """
+        self.projects = [p for p in projects if isinstance(p, dict)]
+        self.version = version
+        self.by_source: Dict[str, Set[int]] = {}
+        self.by_language: Dict[str, Set[int]] = {}
+        self._search: List[str] = []
+
+        stars, updated, names = [], [], []
+        for row, project in enumerate(self.projects):
+            source = _text(project.get("source")).lower()
+            language = _text(project.get("language")).lower()
+            self.by_source.setdefault(source, set()).add(row)
+            self.by_language.setdefault(language, set()).add(row)
+            stars.append(_stars(project))
+            updated.append(_text(project.get("updated_at")))
+            names.append(_text(project.get("name")).lower())
+            topics = project.get("topics")
+            if not isinstance(topics, list):
+                topics = []
+            self._search.append(" ".join(
+                [_text(project.get("name")), _text(project.get("full_name")),
+                 _text(project.get("description"))] + [_text(t) for t in topics]
+            ).lower())
+        self._keys = {"stars": stars, "updated": updated, "name": names}
+
+        # Ascending orders (ties broken by row id); descending ones mirror them.
+        # Ranks map a row back to its position in each order.
+        self._orders: Dict[tuple, array] = {}
+        self._ranks: Dict[tuple, array] = {}
+        for key, values in self._keys.items():
+            ascending = sorted(range(len(self.projects)),
+                               key=lambda row: (values[row], row))
+            self._orders[(key, False)] = array("I", ascending)
+            self._orders[(key, True)] = array("I", reversed(ascending))
+            for descending in (False, True):
+                rank = array("I", bytes(4 * len(self.projects)))
+                for position, row in enumerate(self._orders[(key, descending)]):
+                    rank[row] = position
+                self._ranks[(key, descending)] = rank
+
+    def __len__(self) -> int:
+        return len(self.projects)
+
+    def _cursor(self, sort: str, position: int) -> str:
+        raw = json.dumps([self.version, sort, position], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def _position(self, cursor: str, sort: str) -> int:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            decoded = json.loads(base64.urlsafe_b64decode(padded))
+            version, cursor_sort, position = decoded
+        except (ValueError, TypeError) as e:
+            raise ValueError("invalid cursor") from e
+        if version != self.version:
+            raise ValueError("cursor expired, the portfolio was updated")
+        if cursor_sort != sort or not isinstance(position, int):
+            raise ValueError("cursor does not match the requested sort")
+        return position + 1
+
+    def _range(self, key: str, descending: bool, min_stars: Optional[int],
+               updated_since: Optional[str]) -> tuple:
+        """Positions of the sort order that can satisfy the range filters."""
+        size = len(self.projects)
+        bound = {"stars": min_stars, "updated": updated_since}.get(key)
+        if bound is None:
+            return 0, size
+        values = self._keys[key]
+        ascending = self._orders[(key, False)]
+        # First ascending position whose value reaches the bound
+        low, high = 0, size
+        while low < high:
+            middle = (low + high) // 2
+            if values[ascending[middle]] < bound:
+                low = middle + 1
+            else:
+                high = middle
+        return (0, size - low) if descending else (low, size)
+
+    def _candidates(self, source: Optional[str],
+                    language: Optional[str]) -> Optional[Set[int]]:
+        sets = []
+        for index, value in ((self.by_source, source), (self.by_language, language)):
+            wanted = _values(value)
+            if wanted:
+                sets.append(set().union(*(index.get(v, ()) for v in wanted)))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def query(self, source: Optional[str] = None, language: Optional[str] = None,
+              min_stars: Optional[int] = None, updated_since: Optional[str] = None,
+              q: Optional[str] = None, sort: Optional[str] = DEFAULT_SORT,
+              cursor: Optional[str] = None, limit: int = 50) -> QueryResult:
+        """Return one page of projects matching every given filter.
+
+        Args:
+            source: Source name, or several separated by commas.
+            language: Language, or several separated by commas.
+            min_stars: Minimum number of stars.
+            updated_since: ISO date or timestamp; projects updated earlier
+                are excluded.
+            q: Case-insensitive text matched against name, full name,
+                description and topics.
+            sort: ``stars``, ``updated`` or ``name``; prefix ``-`` for
+                descending order.
+            cursor: ``next_cursor`` of the previous page.
+            limit: Page size.
+
+        Raises:
+            ValueError: For an unknown sort key or an invalid or stale cursor.
+        """
+        key, descending = parse_sort(sort)
+        sort = f"{'-' if descending else ''}{key}"
+        order = self._orders[(key, descending)]
+        start, end = self._range(key, descending, min_stars, updated_since)
+        candidates = self._candidates(source, language)
+        needle = (q or "").strip().lower()
+
+        def matches(row: int) -> bool:
+            project = self.projects[row]
+            if min_stars is not None and _stars(project) < min_stars:
+                return False
+            if updated_since and _text(project.get("updated_at")) < updated_since:
+                return False
+            return not needle or needle in self._search[row]
+
+        def positions(first: int) -> Iterator[int]:
+            if candidates is not None and len(candidates) * 8 < end - first:
+                # Few candidates: sort them by their rank instead of walking the order
+                rank = self._ranks[(key, descending)]
+                yield from sorted(p for p in (rank[row] for row in candidates)
+                                  if first <= p < end)
+            else:
+                for position in range(first, end):
+                    if candidates is None or order[position] in candidates:
+                        yield position
+
+        result = QueryResult()
+        if (candidates is None and not needle and (min_stars is None or key == "stars")
+                and (not updated_since or key == "updated")):
+            # The range cut is exact: every position in it matches
+            result.total = end - start
+        else:
+            result.total = sum(1 for p in positions(start) if matches(order[p]))
+        first = self._position(cursor, sort) if cursor else start
+
+        last = None
+        for position in positions(max(first, start)):
+            if not matches(order[position]):
+                continue
+            if len(result.items) == limit:
+                result.next_cursor = self._cursor(sort, last)
+                break
+            result.items.append(self.projects[order[position]])
+            last = position
+        return result
@@ -0,0 +1,238 @@
+"""
+Rate limiting and retries for outgoing API requests.
+
+Each host gets a token bucket that paces requests and learns the real budget
+from ``X-RateLimit-*``/``RateLimit-*`` and ``Retry-After`` response headers,
+so concurrent fetches use the allowed budget without tripping it. Transient
+failures are retried with capped exponential backoff and full jitter.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a host's budget is exhausted for longer than the caller will wait."""
+
+    def __init__(self, message: str, wait: float):
+        super().__init__(message)
+        self.wait = wait
+
+
+def _header_int(headers: Mapping[str, str], *names: str) -> Optional[int]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(float(value))
+            except ValueError:
+                continue
+    return None
+
+
+def parse_retry_after(value: Optional[str],
+                      now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait according to a ``Retry-After`` header (delta or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when - (time.time() if now is None else now))
+
+
+class TokenBucket:
+    """Thread-safe token bucket with an optional server-reported budget.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Once a response reports how many requests are left in the current window
+    (``remaining``) and when it resets, that budget is enforced as well:
+    callers wait for the reset instead of spending requests that would fail.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._budget: Optional[int] = None
+        self._reset_at: Optional[float] = None
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        refilled = self._tokens + (now - self._updated) * self.rate
+        self._tokens = min(self.capacity, refilled)
+        self._updated = now
+        if self._reset_at is not None and time.time() >= self._reset_at:
+            # New window: the server will tell us the fresh budget
+            self._budget = None
+            self._reset_at = None
+
+    def _wait_time(self, now: float) -> float:
+        waits = [self._paused_until - now]
+        if self._tokens < 1:
+            waits.append((1 - self._tokens) / self.rate)
+        if (self._budget is not None and self._budget <= 0
+                and self._reset_at is not None):
+            waits.append(self._reset_at - time.time())
+        return max(waits)
+
+    def acquire(self, max_wait: Optional[float] = None) -> None:
+        """Block until a request may be sent, then spend one token.
+
+        Raises:
+            RateLimitExceeded: If that would take longer than ``max_wait``.
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_time(now)
+                if max_wait is not None and wait > max_wait:
+                    raise RateLimitExceeded(f"rate limit resets in {wait:.0f}s", wait)
+                if wait <= 0:
+                    self._tokens -= 1
+                    if self._budget is not None:
+                        self._budget -= 1
+                    return
+                self._cond.wait(wait)
+
+    def update(self, remaining: Optional[int], reset_at: Optional[float]) -> None:
+        """Learn the server's budget.
+
+        ``remaining`` requests are left until ``reset_at`` (epoch seconds).
+        """
+        if remaining is None:
+            return
+        with self._cond:
+            if reset_at is not None and reset_at != self._reset_at:
+                self._budget = remaining
+                self._reset_at = reset_at
+            else:
+                # Responses can arrive out of order; never raise the estimate
+                self._budget = (remaining if self._budget is None
+                                else min(self._budget, remaining))
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for ``seconds`` (e.g. after ``Retry-After``)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+
+class RateLimiter:
+    """Per-host token buckets fed by rate limit response headers."""
+
+    def __init__(self, default_rate: float = 20.0, default_burst: float = 20.0,
+                 hosts: Optional[Dict[str, float]] = None, max_wait: float = 300.0):
+        """Initialize the limiter.
+
+        Args:
+            default_rate: Requests per second allowed to hosts without a
+                specific rate.
+            default_burst: Bucket capacity, i.e. requests sent back to back.
+            hosts: Requests per second for specific hosts.
+            max_wait: Longest a request waits for the budget before
+                :class:`RateLimitExceeded` is raised instead.
+        """
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.hosts = dict(hosts or {})
+        self.max_wait = max_wait
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        """The bucket of the host ``url`` points at."""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate = self.hosts.get(host, self.default_rate)
+                bucket = TokenBucket(rate, max(1.0, min(self.default_burst, rate * 2)))
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> None:
+        """Block until a request to ``url``'s host may be sent.
+
+        Raises:
+            RateLimitExceeded: If the host's budget is exhausted for longer
+                than ``max_wait``.
+        """
+        self.bucket(url).acquire(self.max_wait)
+
+    def observe(self, url: str, status_code: int,
+                headers: Mapping[str, str]) -> Optional[float]:
+        """Learn from a response's headers.
+
+        Returns:
+            The ``Retry-After`` delay in seconds, if the response carried one.
+        """
+        bucket = self.bucket(url)
+        remaining = _header_int(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset = _header_int(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+        if reset is not None and reset < 10 ** 9:
+            # Some APIs send seconds until reset rather than an epoch timestamp
+            reset += int(time.time())
+        bucket.update(remaining, reset)
+
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None and status_code in (429, 503):
+            bucket.pause(retry_after)
+        elif remaining == 0 and reset is not None and status_code in (403, 429):
+            # GitHub answers an exhausted budget with 403/429 and a reset time;
+            # the bucket already holds further requests until then
+            retry_after = max(0.0, reset - time.time())
+        return retry_after
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter for transient failures."""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5,
+                 max_delay: float = 30.0, max_retry_after: float = 300.0,
+                 statuses=RETRY_STATUSES):
+        """Initialize the policy.
+
+        Args:
+            max_attempts: Total attempts per request, including the first.
+            base_delay: Backoff before the first retry, doubled on each one.
+            max_delay: Upper bound for a single backoff.
+            max_retry_after: Longest ``Retry-After`` worth waiting for; longer
+                waits give up and return the response.
+            statuses: Response codes considered transient.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.statuses = frozenset(statuses)
+
+    def should_retry(self, attempt: int, status_code: Optional[int],
+                     retry_after: Optional[float] = None) -> bool:
+        """Whether attempt number ``attempt`` (0-based) should be retried."""
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return False
+        if status_code == 403:
+            # Only a rate limit 403 (which comes with a wait time) is transient
+            return retry_after is not None
+        return status_code is None or status_code in self.statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered delay before retrying attempt number ``attempt``."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
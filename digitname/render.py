@@ -0,0 +1,285 @@
+"""
+Incremental template rendering with dependency tracking.
+
+For every output file :class:`IncrementalRenderer` records what it was built
+from: a hash of each template involved (the page, the templates it extends,
+includes or imports) and a hash of each context variable those templates
+reference, found with :func:`jinja2.meta.find_undeclared_variables`. On the
+next build an output whose recorded hashes all still match is skipped
+without rendering, and a re-rendered output whose bytes come out identical
+is not rewritten, so its modification time and any HTTP validators derived
+from it stay put.
+
+Context variables listed as ``volatile`` (such as a build timestamp) are
+passed to templates but not tracked, otherwise every build would invalidate
+every page.
+
+:meth:`IncrementalRenderer.render_all` renders larger batches on a process
+pool. Each worker builds its own environment once, from a picklable factory,
+and with a ``FileSystemBytecodeCache`` loads the templates the parent
+compiled instead of compiling them again.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from jinja2 import Environment, meta
+
+from .jsonstream import AtomicFile, PathLike, write_json
+
+STATE_VERSION = 1
+
+#: Fewer outputs than this are rendered in-process; starting a pool costs more
+PARALLEL_THRESHOLD = 32
+
+
+def hash_value(value: Any) -> str:
+    """Stable hash of a JSON-like context value."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False,
+                         separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class RenderJob:
+    """One output file to render.
+
+    Jobs rendered on a process pool are pickled, so ``context`` and
+    ``postprocess`` must be picklable (a :func:`functools.partial` of a
+    module-level function is).
+    """
+
+    template_name: str
+    output_name: str
+    context: Dict[str, Any]
+    #: Further inputs that are not template variables, e.g. the asset
+    #: manifest used by ``postprocess``
+    extra: Optional[Dict[str, Any]] = None
+    #: Applied to the rendered text before writing
+    postprocess: Optional[Callable[[str], str]] = None
+
+
+def _write_output(env: Environment, output_dir: PathLike, job: RenderJob) -> None:
+    text = env.get_template(job.template_name).render(**job.context)
+    if job.postprocess is not None:
+        text = job.postprocess(text)
+    IncrementalRenderer.write(Path(output_dir) / job.output_name, text.encode("utf-8"))
+
+
+_worker_env: Optional[Environment] = None
+
+
+def _init_worker(env_factory: Callable[..., Environment],
+                 env_args: Sequence[Any]) -> None:
+    global _worker_env
+    _worker_env = env_factory(*env_args)
+
+
+def _render_in_worker(args: Tuple[str, RenderJob]) -> str:
+    output_dir, job = args
+    _write_output(_worker_env, output_dir, job)
+    return job.output_name
+
+
+class IncrementalRenderer:
+    """Renders templates to files, skipping outputs whose inputs are unchanged."""
+
+    def __init__(self, env: Environment, output_dir: PathLike, state_path: PathLike,
+                 volatile: Iterable[str] = (), enabled: bool = True):
+        """Initialize the renderer.
+
+        Args:
+            env: Jinja2 environment to load templates from.
+            output_dir: Directory outputs are written to.
+            state_path: JSON file holding the recorded dependencies.
+            volatile: Context variables that never trigger a re-render.
+            enabled: Whether to skip unchanged outputs at all; when false
+                every output is rendered (identical bytes are still not
+                rewritten).
+        """
+        self.env = env
+        self.output_dir = Path(output_dir)
+        self.state_path = Path(state_path)
+        self.volatile = set(volatile)
+        self.enabled = enabled
+        self.rendered: List[str] = []
+        self.skipped: List[str] = []
+        self._outputs = self._load() if enabled else {}
+        self._templates: Dict[str, Tuple[Dict[str, str], Set[str]]] = {}
+        self._slices: Dict[int, Tuple[Any, str]] = {}
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+            return {}
+        if state.get("output_dir") != str(self.output_dir.resolve()):
+            # Recorded for another tree: skipping or pruning by it would be wrong
+            return {}
+        outputs = state.get("outputs")
+        return outputs if isinstance(outputs, dict) else {}
+
+    def dependencies(self, template_name: str) -> Tuple[Dict[str, str], Set[str]]:
+        """Templates (with source hashes) and context variables a template uses."""
+        cached = self._templates.get(template_name)
+        if cached is not None:
+            return cached
+
+        templates: Dict[str, str] = {}
+        variables: Set[str] = set()
+        pending = [template_name]
+        while pending:
+            name = pending.pop()
+            if name in templates:
+                continue
+            source, _, _ = self.env.loader.get_source(self.env, name)
+            templates[name] = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+            ast = self.env.parse(source)
+            variables |= meta.find_undeclared_variables(ast)
+            # Dynamic names (``{% include var %}``) show up as None and are
+            # covered by tracking the variable itself
+            pending.extend(ref for ref in meta.find_referenced_templates(ast) if ref)
+
+        self._templates[template_name] = (templates, variables)
+        return templates, variables
+
+    def _hash(self, value: Any) -> str:
+        # Pages of one build often share large values (the project list,
+        # the asset manifest); hash each object once. The value is kept
+        # alongside so its id cannot be reused by another object during the
+        # build
+        cached = self._slices.get(id(value))
+        if cached is None:
+            cached = self._slices[id(value)] = (value, hash_value(value))
+        return cached[1]
+
+    def _record(self, job: RenderJob) -> Dict[str, Any]:
+        templates, variables = self.dependencies(job.template_name)
+        return {
+            "templates": templates,
+            "context": {
+                name: self._hash(job.context[name]) if name in job.context else None
+                for name in sorted(variables - self.volatile)
+            },
+            "extra": self._hash(job.extra) if job.extra is not None else None,
+        }
+
+    def render(self, template_name: str, output_name: str, context: Dict[str, Any],
+               extra: Optional[Dict[str, Any]] = None,
+               postprocess: Optional[Callable[[str], str]] = None) -> bool:
+        """Render ``template_name`` to ``output_name`` unless it is up to date.
+
+        Args:
+            template_name: Template to render.
+            output_name: Output path relative to the output directory.
+            context: Template context.
+            extra: Further inputs of the output that are not template
+                variables, such as the asset manifest used by ``postprocess``.
+            postprocess: Applied to the rendered text before writing.
+
+        Returns:
+            Whether the template was rendered.
+        """
+        job = RenderJob(template_name, output_name, context, extra, postprocess)
+        return bool(self.render_all([job]))
+
+    def render_all(self, jobs: Iterable[RenderJob], workers: int = 1,
+                   env_factory: Optional[Callable[..., Environment]] = None,
+                   env_args: Sequence[Any] = ()) -> List[str]:
+        """Render every job that is not up to date.
+
+        Args:
+            jobs: Outputs to produce.
+            workers: Processes to render on. A pool is only started with an
+                ``env_factory`` and at least ``PARALLEL_THRESHOLD`` outputs
+                to render.
+            env_factory: Module-level function returning an environment
+                equivalent to ``self.env``; called once in each worker.
+            env_args: Arguments for ``env_factory``.
+
+        Returns:
+            Names of the rendered outputs.
+        """
+        planned = []
+        for job in jobs:
+            record = self._record(job)
+            if (self.enabled and self._outputs.get(job.output_name) == record
+                    and os.path.exists(os.path.join(self.output_dir, job.output_name))):
+                self.skipped.append(job.output_name)
+            else:
+                planned.append((job, record))
+
+        if (workers > 1 and env_factory is not None
+                and len(planned) >= PARALLEL_THRESHOLD):
+            # Compile in the parent first so a bytecode cache is warm for the workers
+            for name in {job.template_name for job, _ in planned}:
+                self.env.get_template(name)
+            workers = min(workers, len(planned))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(env_factory, tuple(env_args))) as pool:
+                tasks = [(str(self.output_dir), job) for job, _ in planned]
+                chunksize = max(1, len(tasks) // (workers * 4))
+                for _ in pool.map(_render_in_worker, tasks, chunksize=chunksize):
+                    pass
+        else:
+            for job, _ in planned:
+                _write_output(self.env, self.output_dir, job)
+
+        rendered = []
+        for job, record in planned:
+            self._outputs[job.output_name] = record
+            rendered.append(job.output_name)
+        if planned:
+            self._dirty = True
+        self.rendered.extend(rendered)
+        return rendered
+
+    @staticmethod
+    def write(path: Path, data: bytes) -> bool:
+        """Write ``data`` to ``path`` atomically unless it already holds it."""
+        try:
+            if path.stat().st_size == len(data) and path.read_bytes() == data:
+                return False
+        except FileNotFoundError:
+            pass
+        with AtomicFile(path, binary=True) as f:
+            f.write(data)
+        return True
+
+    def prune(self, keep: Iterable[str]) -> List[str]:
+        """Delete recorded outputs that are not in ``keep``.
+
+        Returns:
+            The removed output names.
+        """
+        keep = set(keep)
+        removed = [name for name in self._outputs if name not in keep]
+        for name in removed:
+            del self._outputs[name]
+            try:
+                os.unlink(self.output_dir / name)
+            except FileNotFoundError:
+                pass
+        if removed:
+            self._dirty = True
+        return removed
+
+    def save(self) -> None:
+        """Persist the recorded dependencies if anything changed."""
+        if self.enabled and self._dirty:
+            state = {
+                "version": STATE_VERSION,
+                "output_dir": str(self.output_dir.resolve()),
+                "outputs": self._outputs,
+            }
+            write_json(self.state_path, state, indent=None)
+            self._dirty = False
@@ -0,0 +1,234 @@
+"""
+Full-text search over domains and portfolio projects.
+
+Records from ``data.json`` (domain, theme, keywords, technologies,
+description) and ``portfolio.json`` projects (name, description, topics,
+language) go into one inverted index ranked with BM25. Field matches are
+weighted, so a hit in a name or keyword outranks one in a description.
+
+Text is folded to ASCII before tokenizing: Polish diacritics decompose
+under NFKD except ``ł``, which is mapped explicitly, so ``prywatności``,
+``prywatnosci`` and ``PRYWATNOŚCI`` are the same term. The last query word
+is also matched as a prefix, which makes the index usable for typeahead.
+
+Postings are stored with their precomputed BM25 contribution, highest first,
+and a query reads at most ``MAX_POSTINGS`` of them per term, counting only
+records of the requested type. This keeps lookups on very common terms
+bounded; only matches far down the ranking of such a term are skipped.
+"""
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_FOLD = str.maketrans({"ł": "l", "Ł": "L", "đ": "d", "Đ": "D", "ø": "o", "Ø": "O",
+                       "ß": "ss"})
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+#: Weight of a term occurrence by field
+DOMAIN_FIELDS = {"domain": 3.0, "keywords": 2.0, "technologies": 2.0, "theme": 1.5,
+                 "description": 1.0}
+PROJECT_FIELDS = {"name": 3.0, "topics": 2.0, "language": 1.5, "description": 1.0}
+
+MAX_PREFIX_TERMS = 10
+MIN_PREFIX_LENGTH = 2
+MAX_POSTINGS = 1000
+
+
+def fold(text: str) -> str:
+    """Lowercase ``text`` and strip diacritics."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.translate(_FOLD))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split ``text`` into folded alphanumeric terms."""
+    return _TOKEN_RE.findall(fold(text))
+
+
+@dataclass
+class SearchHit:
+    """A matching record and its relevance score."""
+
+    score: float
+    record: Dict[str, Any]
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking and prefix expansion."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.records: List[Dict[str, Any]] = []
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._lengths: List[float] = []
+        self._terms: List[str] = []
+        self._impacts: Dict[str, List[Tuple[int, float]]] = {}
+
+    def add(self, record: Dict[str, Any], fields: Dict[str, Any],
+            weights: Dict[str, float]) -> None:
+        """Index ``record`` by the text of ``fields`` (strings or lists of strings)."""
+        doc = len(self.records)
+        self.records.append(record)
+        length = 0.0
+        for name, value in fields.items():
+            weight = weights.get(name, 1.0)
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for text in values:
+                if not isinstance(text, str):
+                    continue
+                for term in tokenize(text):
+                    postings = self._postings.setdefault(term, {})
+                    postings[doc] = postings.get(doc, 0.0) + weight
+                    length += weight
+        self._lengths.append(length)
+
+    def build(self) -> "SearchIndex":
+        """Compute the ranking statistics; call after the last :meth:`add`."""
+        count = len(self.records)
+        average = (sum(self._lengths) / count) if count else 0.0
+        norms = [
+            self.k1 * (1 - self.b + self.b * (length / average if average else 0.0))
+            for length in self._lengths
+        ]
+        for term, docs in self._postings.items():
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            impacts = [(doc, idf * tf * (self.k1 + 1) / (tf + norms[doc]))
+                       for doc, tf in docs.items()]
+            impacts.sort(key=lambda item: (-item[1], item[0]))
+            self._impacts[term] = impacts
+        self._terms = sorted(self._impacts)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def expand(self, prefix: str, limit: int = MAX_PREFIX_TERMS) -> List[str]:
+        """Indexed terms starting with ``prefix``, most common first when capped."""
+        start = bisect_left(self._terms, prefix)
+        end = bisect_left(self._terms, prefix + "\x7f", start)
+        terms = self._terms[start:end]
+        if len(terms) > limit:
+            terms = heapq.nlargest(limit, terms, key=lambda t: len(self._impacts[t]))
+        return terms
+
+    def _score(self, terms: Iterable[str],
+               kind: Optional[str] = None) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for term in terms:
+            postings: Iterable[Tuple[int, float]] = self._impacts.get(term, ())
+            if kind is not None:
+                # Filter before the cut, so the cap counts only eligible records
+                postings = ((doc, score) for doc, score in postings
+                            if self.records[doc].get("type") == kind)
+            for doc, score in islice(postings, MAX_POSTINGS):
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True,
+               kind: Optional[str] = None) -> List[SearchHit]:
+        """Rank records against ``query``.
+
+        Every query word contributes its BM25 score; a document matching more
+        words ranks higher. With ``prefix`` the last word also matches terms
+        it is the beginning of, each document counting its best expansion.
+
+        Args:
+            query: Free text.
+            limit: Maximum number of hits.
+            prefix: Treat the last word as a prefix (typeahead).
+            kind: Only return records whose ``type`` equals this.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        totals: Dict[int, float] = {}
+        for position, word in enumerate(words):
+            expand = (prefix and position == len(words) - 1
+                      and len(word) >= MIN_PREFIX_LENGTH)
+            terms = self.expand(word) if expand else [word]
+            for doc, score in self._score(terms, kind).items():
+                totals[doc] = totals.get(doc, 0.0) + score
+
+        best = heapq.nlargest(limit, totals.items(),
+                              key=lambda item: (item[1], -item[0]))
+        return [SearchHit(round(score, 4), self.records[doc]) for doc, score in best]
+
+
+def build_index(domains: Sequence[Any], projects: Sequence[Any]) -> SearchIndex:
+    """Index ``data.json`` entries and portfolio projects."""
+    index = SearchIndex()
+    for entry in domains:
+        if not isinstance(entry, dict):
+            continue
+        record = {
+            "type": "domain",
+            "domain": entry.get("domain"),
+            "url": entry.get("url"),
+            "theme": entry.get("theme"),
+            "description": entry.get("description"),
+            "thumbnail": entry.get("thumbnail"),
+        }
+        fields = {name: entry.get(name) for name in DOMAIN_FIELDS}
+        index.add(record, fields, DOMAIN_FIELDS)
+    for project in projects:
+        if not isinstance(project, dict):
+            continue
+        record = {
+            "type": "project",
+            "name": project.get("name"),
+            "source": project.get("source"),
+            "url": project.get("url"),
+            "description": project.get("description"),
+            "language": project.get("language"),
+            "stars": project.get("stars"),
+        }
+        fields = {name: project.get(name) for name in PROJECT_FIELDS}
+        index.add(record, fields, PROJECT_FIELDS)
+    return index.build()
+
+
+class SearchService:
+    """Keeps a :class:`SearchIndex` in step with two hot-reloading stores."""
+
+    def __init__(self, portfolio_store, data_store):
+        """Initialize the service.
+
+        Args:
+            portfolio_store: :class:`~digitname.store.PortfolioStore` of
+                ``portfolio.json``.
+            data_store: Store of ``data.json``.
+        """
+        self.portfolio_store = portfolio_store
+        self.data_store = data_store
+        self._key: Optional[Tuple[str, str]] = None
+        self._index = SearchIndex().build()
+        self._lock = threading.Lock()
+
+    def index(self) -> SearchIndex:
+        """Current index, rebuilt when either file was reloaded."""
+        portfolio = self.portfolio_store.get()
+        data = self.data_store.get()
+        key = (portfolio.etag, data.etag)
+        if key != self._key:
+            with self._lock:
+                if key != self._key:
+                    projects = (portfolio.data.get("projects")
+                                if isinstance(portfolio.data, dict) else None)
+                    self._index = build_index(
+                        data.data if isinstance(data.data, list) else [],
+                        projects if isinstance(projects, list) else []
+                    )
+                    self._key = key
+        return self._index
@@ -0,0 +1,310 @@
+"""
+Binary columnar snapshot of the portfolio.
+
+``portfolio.json`` has to be parsed as a whole before a single field can be
+read. The snapshot stores each project field as its own fixed-width column
+next to a shared, de-duplicated string table, so readers memory-map the file
+and decode only the columns they ask for (say ``name``, ``stars`` and
+``updated_at``); numeric columns are available without any copy at all.
+
+Layout (little-endian, sections aligned to 8 bytes)::
+
+    header     magic "DNSN", version, row count, column count,
+               string id of the JSON metadata, string table offset
+    directory  per column: name string id, kind, data offset, data size
+    columns    int64 / float64 / int8 / uint32 string id arrays
+    strings    count, ``count + 1`` uint32 offsets, UTF-8 blob
+
+Integers use ``INT64_MIN``, floats NaN, booleans ``-1`` and string ids
+``0xFFFFFFFF`` for missing values. Fields that are not plain scalars (lists,
+dicts, mixed types) are stored as JSON strings and decoded on read. A missing
+field and an explicit ``null`` both read back as ``None``.
+"""
+
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .jsonstream import AtomicFile, PathLike
+
+MAGIC = b"DNSN"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIIQ4x")
+_COLUMN = struct.Struct("<IB3xQQ")
+_UINT32 = struct.Struct("<I")
+
+KIND_INT = 1
+KIND_FLOAT = 2
+KIND_BOOL = 3
+KIND_STR = 4
+KIND_JSON = 5
+
+_TYPECODES = {KIND_INT: "q", KIND_FLOAT: "d", KIND_BOOL: "b", KIND_STR: "I",
+              KIND_JSON: "I"}
+_INT_NULL = -(2 ** 63)
+_BOOL_NULL = -1
+_STR_NULL = 0xFFFFFFFF
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class SnapshotError(Exception):
+    """Raised for files that are not valid portfolio snapshots."""
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _kind(values: Sequence[Any]) -> int:
+    present = [v for v in values if v is not None]
+    if not present:
+        return KIND_STR
+    if all(isinstance(v, bool) for v in present):
+        return KIND_BOOL
+    if all(isinstance(v, int) and not isinstance(v, bool) and _INT_NULL < v < 2 ** 63
+           for v in present):
+        return KIND_INT
+    if all(isinstance(v, float) for v in present):
+        return KIND_FLOAT
+    if all(isinstance(v, str) for v in present):
+        return KIND_STR
+    return KIND_JSON
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.blobs: List[bytes] = []
+
+    def intern(self, value: str) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.blobs)
+            self.blobs.append(value.encode("utf-8"))
+        return index
+
+    def encode(self) -> bytes:
+        offsets = array("I", [0])
+        for blob in self.blobs:
+            offsets.append(offsets[-1] + len(blob))
+        if not _LITTLE_ENDIAN:
+            offsets.byteswap()
+        return _UINT32.pack(len(self.blobs)) + offsets.tobytes() + b"".join(self.blobs)
+
+
+def _encode_column(values: Sequence[Any], kind: int, strings: _StringTable) -> bytes:
+    if kind == KIND_INT:
+        column = array("q", (_INT_NULL if v is None else v for v in values))
+    elif kind == KIND_FLOAT:
+        column = array("d", (math.nan if v is None else v for v in values))
+    elif kind == KIND_BOOL:
+        column = array("b", (_BOOL_NULL if v is None else int(v) for v in values))
+    elif kind == KIND_STR:
+        column = array("I", (_STR_NULL if v is None else strings.intern(v)
+                             for v in values))
+    else:
+        column = array("I", (
+            _STR_NULL if v is None
+            else strings.intern(json.dumps(v, separators=(",", ":")))
+            for v in values
+        ))
+    if not _LITTLE_ENDIAN:
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_snapshot(path: PathLike, data: Dict[str, Any]) -> None:
+    """Write the projects of a portfolio document as a columnar snapshot.
+
+    Every key found on any project becomes a column; the remaining top-level
+    keys (``last_updated``, ``stats``, ...) are kept as JSON metadata. The
+    file is replaced atomically.
+
+    Args:
+        path: Snapshot path.
+        data: Portfolio document with a ``projects`` list.
+    """
+    projects = [p for p in data.get("projects") or () if isinstance(p, dict)]
+    names: Dict[str, None] = {}
+    for project in projects:
+        names.update(dict.fromkeys(project))
+
+    strings = _StringTable()
+    meta = {key: value for key, value in data.items() if key != "projects"}
+    meta_id = strings.intern(json.dumps(meta, separators=(",", ":")))
+
+    columns: List[Tuple[int, int, bytes]] = []
+    for name in names:
+        values = [project.get(name) for project in projects]
+        kind = _kind(values)
+        columns.append((strings.intern(name), kind,
+                        _encode_column(values, kind, strings)))
+
+    offset = _align(_HEADER.size + _COLUMN.size * len(columns))
+    directory = []
+    for name_id, kind, payload in columns:
+        directory.append(_COLUMN.pack(name_id, kind, offset, len(payload)))
+        offset = _align(offset + len(payload))
+    strings_offset = offset
+
+    with AtomicFile(path, binary=True) as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(projects), len(columns), meta_id,
+                             strings_offset))
+        f.write(b"".join(directory))
+        position = _HEADER.size + _COLUMN.size * len(columns)
+        for (_, _, payload), entry in zip(columns, directory):
+            start = _COLUMN.unpack(entry)[2]
+            f.write(b"\0" * (start - position))
+            f.write(payload)
+            position = start + len(payload)
+        f.write(b"\0" * (strings_offset - position))
+        f.write(strings.encode())
+
+
+class Snapshot:
+    """Memory-mapped reader for a snapshot written by :func:`write_snapshot`.
+
+    Nothing is decoded up front: columns are read on request and strings are
+    decoded on first use.
+
+    Example::
+
+        with Snapshot("portfolio/portfolio.snap") as snap:
+            for row in snap.rows(["name", "stars", "updated_at"]):
+                ...
+    """
+
+    def __init__(self, path: PathLike):
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise SnapshotError(f"{path}: empty file") from e
+        self._string_offsets: Sequence = ()
+        try:
+            self._open(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self, path: PathLike) -> None:
+        buffer = self._mmap
+        if len(buffer) < _HEADER.size:
+            raise SnapshotError(f"{path}: truncated header")
+        header = _HEADER.unpack_from(buffer, 0)
+        magic, version, _, rows, count, meta_id, strings_offset = header
+        if magic != MAGIC:
+            raise SnapshotError(f"{path}: not a portfolio snapshot")
+        if version != VERSION:
+            raise SnapshotError(f"{path}: unsupported snapshot version {version}")
+
+        self._rows = rows
+        (string_count,) = _UINT32.unpack_from(buffer, strings_offset)
+        offsets_start = strings_offset + _UINT32.size
+        self._blob_start = offsets_start + 4 * (string_count + 1)
+        self._string_offsets = self._view(offsets_start, 4 * (string_count + 1), "I")
+        self._strings: Dict[int, str] = {}
+
+        self._columns: Dict[str, Tuple[int, int, int]] = {}
+        for index in range(count):
+            name_id, kind, offset, size = _COLUMN.unpack_from(
+                buffer, _HEADER.size + index * _COLUMN.size)
+            self._columns[self.string(name_id)] = (kind, offset, size)
+        self.meta: Dict[str, Any] = json.loads(self.string(meta_id))
+
+    def _view(self, offset: int, size: int, typecode: str) -> Sequence:
+        raw = memoryview(self._mmap)[offset:offset + size]
+        if _LITTLE_ENDIAN:
+            return raw.cast(typecode)
+        values = array(typecode, raw)
+        raw.release()
+        values.byteswap()
+        return values
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names, in first-seen project key order."""
+        return list(self._columns)
+
+    def string(self, index: int) -> str:
+        """Entry ``index`` of the string table."""
+        value = self._strings.get(index)
+        if value is None:
+            start = self._blob_start + self._string_offsets[index]
+            end = self._blob_start + self._string_offsets[index + 1]
+            value = self._strings[index] = self._mmap[start:end].decode("utf-8")
+        return value
+
+    def raw(self, name: str) -> Sequence:
+        """Undecoded values of column ``name``: numbers, or string table ids.
+
+        On little-endian hosts this is a zero-copy view into the mapping; it
+        must be released before :meth:`close`.
+        """
+        kind, offset, size = self._columns[name]
+        return self._view(offset, size, _TYPECODES[kind])
+
+    def column(self, name: str) -> List[Any]:
+        """Decoded values of column ``name``, ``None`` where missing.
+
+        Raises:
+            KeyError: If no project has the field.
+        """
+        kind = self._columns[name][0]
+        values = self.raw(name)
+        try:
+            if kind == KIND_INT:
+                return [None if v == _INT_NULL else v for v in values]
+            if kind == KIND_FLOAT:
+                return [None if math.isnan(v) else v for v in values]
+            if kind == KIND_BOOL:
+                return [None if v == _BOOL_NULL else bool(v) for v in values]
+            if kind == KIND_STR:
+                return [None if v == _STR_NULL else self.string(v) for v in values]
+            return [None if v == _STR_NULL else json.loads(self.string(v))
+                    for v in values]
+        finally:
+            if isinstance(values, memoryview):
+                values.release()
+
+    def rows(self, columns: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield one dict per project holding the requested columns.
+
+        Columns no project has are returned as ``None``.
+
+        Args:
+            columns: Column names to load; all columns when not given.
+        """
+        names = list(self._columns if columns is None else columns)
+        if not names:
+            for _ in range(self._rows):
+                yield {}
+            return
+        data = [self.column(name) if name in self._columns else [None] * self._rows
+                for name in names]
+        for values in zip(*data):
+            yield dict(zip(names, values))
+
+    def to_portfolio(self, columns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Rebuild a portfolio document, optionally with only some project fields."""
+        return {**self.meta, "projects": list(self.rows(columns))}
+
+    def close(self) -> None:
+        """Unmap the file."""
+        if isinstance(self._string_offsets, memoryview):
+            self._string_offsets.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
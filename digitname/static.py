@@ -0,0 +1,486 @@
+"""
+Static file serving.
+
+:class:`StaticFileMixin` sends regular files with ``sendfile`` and answers
+``Range`` requests. :class:`ProductionStaticMixin` makes a
+``SimpleHTTPRequestHandler`` cache friendly: every file gets a strong
+``ETag`` (a hash of its bytes), matching ``If-None-Match`` requests are
+answered with ``304 Not Modified``, and precompressed ``.br``/``.gz``
+siblings are sent to clients that accept them.
+Fingerprinted assets (``style.3f2a9c1b0d.css``) never change under the same
+name and are marked ``immutable``; everything else must be revalidated,
+which costs a 304 with an empty body on repeat visits.
+
+:func:`precompress` creates the siblings ahead of time (at startup or during
+a build), so requests never compress on the fly.
+
+Handlers given a :class:`FileCache` answer hot requests from memory: stat
+results are trusted for ``check_interval`` seconds and small files are kept
+in a bounded LRU, keyed by mtime and size so edits are picked up on the next
+check.
+"""
+
+import gzip
+import hashlib
+import io
+import os
+import posixpath
+import re
+import shutil
+import stat as stat_module
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip siblings are produced without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = frozenset({
+    ".html", ".htm", ".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml",
+    ".webmanifest", ".ico",
+})
+MIN_COMPRESS_SIZE = 512
+SKIP_DIRS = frozenset({".git", "node_modules", "__pycache__", ".venv", "venv", "cache"})
+
+#: ``name.<8+ hex digits>.ext``, as produced by content-hash fingerprinting
+FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# (Content-Encoding, sibling suffix) in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+#: ETags remembered by :func:`file_etag`, least recently used dropped first
+MAX_ETAGS = 4096
+
+_etags: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_etags_lock = threading.Lock()
+
+
+def is_fingerprinted(path: str) -> bool:
+    """Whether ``path`` carries a content hash in its file name."""
+    return bool(FINGERPRINT_RE.search(path))
+
+
+def file_etag(path: str, stat: Optional[os.stat_result] = None) -> str:
+    """Strong ETag of a file, cached until its mtime or size changes."""
+    stat = stat or os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _etags_lock:
+        etag = _etags.get(key)
+        if etag is not None:
+            _etags.move_to_end(key)
+    if etag is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()[:32]}"'
+        with _etags_lock:
+            _etags[key] = etag
+            while len(_etags) > MAX_ETAGS:
+                _etags.popitem(last=False)
+    return etag
+
+
+def _fresh(sibling: str, source_stat: os.stat_result) -> bool:
+    try:
+        return os.stat(sibling).st_mtime_ns >= source_stat.st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def _write_compressed(source: str, target: str, compress) -> None:
+    tmp = f"{target}.tmp{os.getpid()}"
+    try:
+        with open(source, "rb") as f:
+            data = compress(f.read())
+        with open(tmp, "wb") as f:
+            f.write(data)
+        shutil.copystat(source, tmp)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def _files(roots: Iterable[os.PathLike], recursive: bool) -> Iterable[str]:
+    for root in roots:
+        root = str(root)
+        if os.path.isfile(root):
+            yield root
+            continue
+        if not recursive:
+            for entry in os.scandir(root):
+                if entry.is_file():
+                    yield entry.path
+            continue
+        for directory, dirs, names in os.walk(root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith(".")]
+            for name in names:
+                yield os.path.join(directory, name)
+
+
+def precompress(roots: Iterable[os.PathLike], recursive: bool = True,
+                min_size: int = MIN_COMPRESS_SIZE) -> List[str]:
+    """Create missing or stale ``.gz`` (and ``.br`` with brotli) siblings.
+
+    Args:
+        roots: Files or directories to process.
+        recursive: Descend into subdirectories.
+        min_size: Smaller files are not worth compressing.
+
+    Returns:
+        Paths of the siblings that were (re)written.
+    """
+    codecs = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        codecs.append((".br", lambda data: brotli.compress(data, quality=11)))
+
+    written = []
+    for path in _files(roots, recursive):
+        if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            continue
+        stat = os.stat(path)
+        if stat.st_size < min_size:
+            continue
+        for suffix, compress in codecs:
+            target = path + suffix
+            if not _fresh(target, stat):
+                _write_compressed(path, target, compress)
+                written.append(target)
+    return written
+
+
+def accepted_encodings(header: Optional[str]) -> List[str]:
+    """Content codings from an ``Accept-Encoding`` header, minus ``q=0`` ones."""
+    accepted = []
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = params.strip()
+        if not coding or q.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.append(coding)
+    return accepted
+
+
+def url_to_path(url: str, base: str) -> str:
+    """Map a URL path onto ``base`` like ``SimpleHTTPRequestHandler.translate_path``.
+
+    The query and fragment are dropped, ``..`` segments cannot leave ``base``
+    and a trailing slash is kept so directories can be recognised.
+    """
+    path = unquote(urlsplit(url).path, errors="surrogatepass")
+    trailing = path.endswith("/")
+    words = [w for w in posixpath.normpath(path).split("/")
+             if w and w not in (os.curdir, os.pardir)]
+    resolved = os.path.join(base, *words)
+    return resolved + "/" if trailing else resolved
+
+
+class FileCache:
+    """Bounded cache of stat results and small file contents.
+
+    Stat results are reused for ``check_interval`` seconds, so repeated
+    requests for the same path do not touch the filesystem; contents are
+    revalidated against the (cached) mtime, size and inode.
+    """
+
+    def __init__(self, max_bytes: int = 32 << 20, max_file_size: int = 256 << 10,
+                 check_interval: float = 1.0, max_entries: int = 4096):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Total size of cached file contents.
+            max_file_size: Larger files are always read from disk.
+            check_interval: Seconds a stat result is trusted.
+            max_entries: Number of stat results kept.
+        """
+        self.max_bytes = max_bytes
+        self.max_file_size = max_file_size
+        self.check_interval = check_interval
+        self.max_entries = max_entries
+        self._stats: "OrderedDict[str, Tuple[float, Optional[os.stat_result]]]" = (
+            OrderedDict())
+        self._contents: "OrderedDict[str, Tuple[Tuple[int, int, int], bytes]]" = (
+            OrderedDict())
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        """``os.stat(path)``, or ``None`` if it does not exist."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._stats.get(path)
+            if cached is not None and now - cached[0] < self.check_interval:
+                self._stats.move_to_end(path)
+                return cached[1]
+        try:
+            result: Optional[os.stat_result] = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            result = None
+        with self._lock:
+            self._stats[path] = (now, result)
+            self._stats.move_to_end(path)
+            while len(self._stats) > self.max_entries:
+                self._stats.popitem(last=False)
+        return result
+
+    def read(self, path: str, stat: os.stat_result) -> Optional[bytes]:
+        """Contents of a small regular file, or ``None`` if it is too large."""
+        if stat.st_size > self.max_file_size or not stat_module.S_ISREG(stat.st_mode):
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with self._lock:
+            cached = self._contents.get(path)
+            if cached is not None and cached[0] == signature:
+                self._contents.move_to_end(path)
+                return cached[1]
+        try:
+            with open(path, "rb") as f:
+                data = f.read(self.max_file_size + 1)
+        except OSError:
+            return None
+        if len(data) != stat.st_size:
+            # Changed since it was stat'ed; serve it from disk this time
+            return None
+        with self._lock:
+            previous = self._contents.pop(path, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._contents[path] = (signature, data)
+            self._size += len(data)
+            while self._size > self.max_bytes and self._contents:
+                _, (_, evicted) = self._contents.popitem(last=False)
+                self._size -= len(evicted)
+        return data
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range ``Range`` header into an inclusive ``(first, last)``.
+
+    Returns ``None`` when the header is absent, malformed or asks for
+    several ranges; such requests get the whole file.
+
+    Raises:
+        ValueError: If the range cannot be satisfied for a file of ``size``.
+    """
+    if not header or not header.strip().lower().startswith("bytes="):
+        return None
+    spec = header.strip()[6:].strip()
+    if "," in spec or "-" not in spec:
+        return None
+    first, _, last = spec.partition("-")
+    first, last = first.strip(), last.strip()
+    if (not (first or last) or (first and not first.isdigit())
+            or (last and not last.isdigit())):
+        return None
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("unsatisfiable range")
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise ValueError("unsatisfiable range")
+    if end < start:
+        return None
+    return start, end
+
+
+@dataclass
+class Representation:
+    """The file whose bytes answer a request, with its response headers."""
+
+    path: str
+    stat: os.stat_result
+    headers: Dict[str, str] = field(default_factory=dict)
+    etag: Optional[str] = None
+    encoded: bool = False
+
+
+class StaticFileMixin:
+    """Serve regular files with ``sendfile`` and single-range requests.
+
+    Mix in before ``SimpleHTTPRequestHandler``. File bodies are handed to
+    the kernel with :meth:`socket.socket.sendfile` instead of being copied
+    through Python buffers, and ``Range: bytes=...`` requests are answered
+    with ``206 Partial Content`` (or ``416``). Directories and anything that
+    is not a regular file fall back to the handler's own ``send_head``.
+    Subclasses choose what is sent through :meth:`select_representation`.
+
+    Set ``file_cache`` to a :class:`FileCache` to serve hot files from memory.
+    """
+
+    file_cache: Optional[FileCache] = None
+    _file_range: Optional[Tuple[int, int]] = None
+
+    def stat_file(self, path: str) -> Optional[os.stat_result]:
+        """Stat ``path`` through the file cache when there is one."""
+        if self.file_cache is not None:
+            return self.file_cache.stat(path)
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def select_representation(self, path: str, stat: os.stat_result) -> Representation:
+        """The file and headers to answer a request for ``path`` with."""
+        return Representation(path, stat)
+
+    def _etag_matches(self, etag: str) -> bool:
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        if header.strip() == "*":
+            return True
+        tags = (tag.strip() for tag in header.split(","))
+        return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+    def _not_modified(self, rep: Representation, mtime: float) -> bool:
+        if rep.etag is not None and self.headers.get("If-None-Match"):
+            return self._etag_matches(rep.etag)
+        since = self.headers.get("If-Modified-Since")
+        if since and not self.headers.get("If-None-Match"):
+            try:
+                return int(mtime) <= parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+        return False
+
+    def _range_applies(self, rep: Representation, mtime: float) -> bool:
+        if rep.encoded:
+            return False
+        condition = self.headers.get("If-Range")
+        if not condition:
+            return True
+        condition = condition.strip()
+        if condition.startswith(('"', "W/")):
+            return rep.etag is not None and condition == rep.etag
+        try:
+            return int(mtime) == int(parsedate_to_datetime(condition).timestamp())
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+
+    def send_head(self):
+        self._file_range = None
+        path = self.translate_path(self.path)
+        stat = None if path.endswith("/") else self.stat_file(path)
+        if stat is None or not stat_module.S_ISREG(stat.st_mode):
+            return super().send_head()
+
+        rep = self.select_representation(path, stat)
+        if self._not_modified(rep, stat.st_mtime):
+            self.send_response(304)
+            for name, value in rep.headers.items():
+                if name != "Content-Encoding":
+                    self.send_header(name, value)
+            if rep.etag is not None:
+                self.send_header("ETag", rep.etag)
+            self.end_headers()
+            return None
+
+        size = rep.stat.st_size
+        first, last = 0, size - 1
+        status = 200
+        if self._range_applies(rep, stat.st_mtime):
+            try:
+                requested = parse_range(self.headers.get("Range"), size)
+            except ValueError:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+            if requested is not None:
+                (first, last), status = requested, 206
+
+        content = self.file_cache.read(rep.path, rep.stat) if self.file_cache else None
+        try:
+            f = io.BytesIO(content) if content is not None else open(rep.path, "rb")
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", self.guess_type(path))
+            self.send_header("Content-Length", str(last - first + 1))
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {first}-{last}/{size}")
+            if not rep.encoded:
+                self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Last-Modified", formatdate(stat.st_mtime, usegmt=True))
+            if rep.etag is not None:
+                self.send_header("ETag", rep.etag)
+            for name, value in rep.headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self._file_range = (first, last - first + 1)
+            return f
+        except BaseException:
+            f.close()
+            raise
+
+    def copyfile(self, source, outputfile):
+        file_range, self._file_range = self._file_range, None
+        if file_range is None:
+            return super().copyfile(source, outputfile)
+        offset, count = file_range
+        if count <= 0:
+            return
+        if isinstance(source, io.BytesIO):
+            view = source.getbuffer()
+            try:
+                outputfile.write(view[offset:offset + count])
+            finally:
+                view.release()
+            return
+        outputfile.flush()
+        # Falls back to send() where os.sendfile is unavailable
+        self.connection.sendfile(source, offset, count)
+
+
+class ProductionStaticMixin(StaticFileMixin):
+    """Cache validation and precompressed variants for ``SimpleHTTPRequestHandler``.
+
+    Mix in before the handler class. Builds on :class:`StaticFileMixin`, so
+    files are sent with ``sendfile`` and ranges are supported for
+    uncompressed responses.
+    """
+
+    def _select_variant(self, path: str,
+                        stat: os.stat_result) -> Tuple[str, Optional[str]]:
+        accepted = accepted_encodings(self.headers.get("Accept-Encoding"))
+        for coding, suffix in ENCODINGS:
+            if coding in accepted or "*" in accepted:
+                sibling = self.stat_file(path + suffix)
+                if sibling is not None and sibling.st_mtime_ns >= stat.st_mtime_ns:
+                    return path + suffix, coding
+        return path, None
+
+    def select_representation(self, path: str, stat: os.stat_result) -> Representation:
+        variant, coding = self._select_variant(path, stat)
+        variant_stat = stat if coding is None else self.stat_file(variant)
+        if variant_stat is None:
+            variant, coding, variant_stat = path, None, stat
+        headers = {
+            "Cache-Control": (IMMUTABLE_CACHE if is_fingerprinted(path)
+                              else REVALIDATE_CACHE),
+            "Vary": "Accept-Encoding",
+        }
+        if coding is not None:
+            headers["Content-Encoding"] = coding
+        # Hash of the bytes sent, so each coding has its own validator
+        etag = file_etag(variant, variant_stat)
+        return Representation(variant, variant_stat, headers, etag,
+                              encoded=coding is not None)
@@ -0,0 +1,108 @@
+"""
+In-memory portfolio store for the API.
+
+The portfolio is parsed once and kept, together with its compact JSON
+encoding, in an immutable :class:`PortfolioState`. Requests read the current
+state without touching the disk; at most once per ``check_interval`` a
+``stat`` of the file reveals whether the updater replaced it (new inode,
+mtime or size), in which case the file is reloaded and the state swapped in
+a single assignment.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from .jsonstream import PathLike
+from .query import ProjectIndex
+
+NOT_FOUND = {"error": "Portfolio data not found"}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PortfolioState:
+    """A loaded portfolio, its pre-serialised response body and its indexes."""
+
+    data: Any
+    body: bytes
+    etag: str
+    index: ProjectIndex
+    signature: Optional[Tuple[int, int, int]] = None
+
+    @classmethod
+    def from_data(cls, data: Any,
+                  signature: Optional[Tuple[int, int, int]] = None) -> "PortfolioState":
+        body = json.dumps(data, ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        projects = data.get("projects") if isinstance(data, dict) else None
+        if not isinstance(projects, list):
+            projects = []
+        index = ProjectIndex(projects, version=etag.strip('"'))
+        return cls(data, body, etag, index, signature)
+
+    @property
+    def found(self) -> bool:
+        return self.signature is not None
+
+
+class PortfolioStore:
+    """Process-wide cache of ``portfolio.json`` with hot reload."""
+
+    def __init__(self, path: PathLike, check_interval: float = 1.0):
+        """Initialize the store.
+
+        Args:
+            path: Portfolio JSON file.
+            check_interval: Minimum seconds between checks for a new file.
+        """
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._state = PortfolioState.from_data(NOT_FOUND)
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def get(self) -> PortfolioState:
+        """Current state, reloaded first if the file has changed."""
+        now = time.monotonic()
+        checked_at = self._checked_at
+        if checked_at is None or now - checked_at >= self.check_interval:
+            self.refresh()
+        return self._state
+
+    def refresh(self) -> PortfolioState:
+        """Check the file now and reload it if it changed."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            signature = self._signature()
+            if signature == self._state.signature:
+                return self._state
+            if signature is None:
+                self._state = PortfolioState.from_data(NOT_FOUND)
+                return self._state
+            try:
+                with open(self.path, "rb") as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                self._state = PortfolioState.from_data(NOT_FOUND)
+            except ValueError as e:
+                # Keep serving the last good copy; retried on the next check
+                logger.warning("Could not reload %s: %s", self.path, e)
+            else:
+                self._state = PortfolioState.from_data(data, signature)
+            return self._state
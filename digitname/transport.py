@@ -0,0 +1,296 @@
+"""
+Shared HTTP transport for DigitName.
+
+Every fetcher goes through one pooled, keep-alive client instead of calling
+``requests.get`` directly, so the hundreds of per-package calls a refresh makes
+to the same registry reuse a handful of TCP+TLS connections.
+
+``requests`` is the default backend. When HTTP/2 is requested and ``httpx``
+(with the ``h2`` extra) is installed, an ``httpx.Client`` is used instead.
+
+With a :class:`~digitname.cache.ResponseCache` attached, GET requests are sent
+with ``If-None-Match``/``If-Modified-Since`` and ``304`` answers are served
+from disk.
+
+Requests are paced per host by a :class:`~digitname.ratelimit.RateLimiter`
+and transient failures (connection errors, 429, 5xx) are retried with
+jittered exponential backoff.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .cache import DEFAULT_MAX_BYTES, CacheEntry, ResponseCache
+from .ratelimit import RateLimiter, RateLimitExceeded, RetryPolicy
+
+DEFAULT_USER_AGENT = ("PortfolioUpdater/1.0 "
+                      "(https://github.com/tom-sapletta-com/portfolio)")
+DEFAULT_TIMEOUT = 15.0
+DEFAULT_POOL_SIZE = 20
+
+# Describe the wire encoding, not the decoded body the cache stores
+_UNCACHED_HEADERS = {"content-encoding", "content-length", "transfer-encoding",
+                     "connection"}
+
+
+class TransportError(Exception):
+    """Raised when a request could not be completed (DNS, connect, timeout)."""
+
+
+class HTTPStatusError(TransportError):
+    """Raised by :meth:`Response.raise_for_status` for 4xx and 5xx responses."""
+
+    def __init__(self, message: str, response: "Response"):
+        super().__init__(message)
+        self.response = response
+
+
+class Response:
+    """Backend-independent view of an HTTP response."""
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes,
+                 url: str, from_cache: bool = False):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.url = url
+        self.from_cache = from_cache
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def encoding(self) -> str:
+        content_type = self.headers.get("Content-Type", "")
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "charset" and value:
+                return value.strip('"')
+        return "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise HTTPStatusError(f"HTTP {self.status_code} for {self.url}", self)
+
+    def __repr__(self) -> str:
+        return f"<Response [{self.status_code}] {self.url}>"
+
+
+def http2_available() -> bool:
+    """Whether ``httpx`` and its HTTP/2 dependency are importable."""
+    return (importlib.util.find_spec("httpx") is not None
+            and importlib.util.find_spec("h2") is not None)
+
+
+class Transport:
+    """Pooled keep-alive HTTP client shared by all fetchers.
+
+    Connections are pooled per host; ``pool_size`` is the number of idle
+    keep-alive connections kept for each host and should be at least the
+    number of concurrent requests made to one registry.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT, http2: bool = False,
+                 user_agent: str = DEFAULT_USER_AGENT,
+                 cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry: Optional[RetryPolicy] = None):
+        """Initialize the transport.
+
+        Args:
+            pool_size: Keep-alive connections kept per host.
+            timeout: Default timeout in seconds for each request.
+            http2: Use HTTP/2 through ``httpx`` when it is installed.
+            user_agent: ``User-Agent`` sent when a request does not set one.
+            cache: Optional on-disk cache used for conditional GET requests.
+            rate_limiter: Per-host pacing; a default limiter is used if omitted.
+            retry: Retry policy for transient failures.
+        """
+        self.pool_size = pool_size
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry = retry or RetryPolicy()
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.http2 = http2 and http2_available()
+
+        if self.http2:
+            import httpx
+            self._client = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=None,
+                    max_keepalive_connections=pool_size * 8
+                )
+            )
+        else:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_size,
+                                  max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._client = session
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                params: Optional[Dict[str, Any]] = None, json: Any = None,
+                timeout: Optional[float] = None) -> Response:
+        """Send a request over a pooled connection.
+
+        Waits for the host's rate limit and retries transient failures. The
+        last response is returned even if it is an error status.
+
+        Raises:
+            TransportError: If no response was received after all retries.
+        """
+        headers = dict(headers or {})
+        headers.setdefault("User-Agent", self.user_agent)
+        timeout = self.timeout if timeout is None else timeout
+
+        cached = None
+        if self.cache is not None and method.upper() == "GET":
+            if params:
+                separator = "&" if "?" in url else "?"
+                url = f"{url}{separator}{urlencode(params, doseq=True)}"
+                params = None
+            vary = self._vary(headers)
+            cached = self.cache.get(url, vary)
+            if cached is not None:
+                for name, value in cached.validators().items():
+                    headers.setdefault(name, value)
+
+        response = self._send_with_retries(method, url, headers, params, json, timeout)
+
+        if cached is not None and response.status_code == 304:
+            self.cache.touch(url, vary)
+            return Response(cached.status_code, cached.headers, cached.body, url,
+                            from_cache=True)
+
+        if (self.cache is not None and method.upper() == "GET"
+                and response.status_code == 200
+                and ("ETag" in response.headers
+                     or "Last-Modified" in response.headers)):
+            headers = {k: v for k, v in response.headers.items()
+                       if k.lower() not in _UNCACHED_HEADERS}
+            entry = CacheEntry(url, response.status_code, headers, response.content)
+            self.cache.put(entry, vary)
+        return response
+
+    @staticmethod
+    def _vary(headers: Dict[str, str]) -> str:
+        # Responses fetched with different credentials must not be shared
+        for name, value in headers.items():
+            if name.lower() in ("authorization", "private-token"):
+                return hashlib.sha256(value.encode("utf-8")).hexdigest()
+        return ""
+
+    def _send_with_retries(self, method: str, url: str, headers: Dict[str, str],
+                           params: Optional[Dict[str, Any]], json: Any,
+                           timeout: float) -> Response:
+        attempt = 0
+        while True:
+            try:
+                self.rate_limiter.acquire(url)
+            except RateLimitExceeded as e:
+                raise TransportError(f"{method} {url} not sent: {e}") from e
+            try:
+                response = self._send(method, url, headers, params, json, timeout)
+            except TransportError:
+                if not self.retry.should_retry(attempt, None):
+                    raise
+                time.sleep(self.retry.backoff(attempt))
+                attempt += 1
+                continue
+
+            retry_after = self.rate_limiter.observe(url, response.status_code,
+                                                    response.headers)
+            if not self.retry.should_retry(attempt, response.status_code, retry_after):
+                return response
+            if retry_after is None:
+                time.sleep(self.retry.backoff(attempt))
+            # With Retry-After the host's bucket holds the next attempt for us
+            attempt += 1
+
+    def _send(self, method: str, url: str, headers: Dict[str, str],
+              params: Optional[Dict[str, Any]], json: Any, timeout: float) -> Response:
+        if self.http2:
+            import httpx
+            try:
+                response = self._client.request(method, url, headers=headers,
+                                                params=params, json=json,
+                                                timeout=timeout)
+            except httpx.HTTPError as e:
+                raise TransportError(f"{method} {url} failed: {e}") from e
+        else:
+            try:
+                response = self._client.request(method, url, headers=headers,
+                                                params=params, json=json,
+                                                timeout=timeout)
+            except requests.RequestException as e:
+                raise TransportError(f"{method} {url} failed: {e}") from e
+
+        return Response(response.status_code, response.headers, response.content,
+                        str(response.url))
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        """Send a GET request. See :meth:`request`."""
+        return self.request("GET", url, **kwargs)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self._client.close()
+
+
+_shared_transport: Optional[Transport] = None
+_shared_lock = threading.Lock()
+
+
+def get_transport(cache_dir: Optional[Union[str, Path]] = None) -> Transport:
+    """Return the process-wide transport, creating it on first use.
+
+    Configured through ``PORTFOLIO_HTTP_POOL_SIZE``, ``PORTFOLIO_HTTP_TIMEOUT``
+    and ``PORTFOLIO_HTTP2`` (``true`` to enable HTTP/2 when available).
+
+    Args:
+        cache_dir: Attach an on-disk response cache in this directory, bounded
+            by ``PORTFOLIO_HTTP_CACHE_MB`` megabytes. Ignored if the shared
+            transport already has a cache.
+    """
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = Transport(
+                pool_size=int(os.getenv("PORTFOLIO_HTTP_POOL_SIZE",
+                                        str(DEFAULT_POOL_SIZE))),
+                timeout=float(os.getenv("PORTFOLIO_HTTP_TIMEOUT",
+                                        str(DEFAULT_TIMEOUT))),
+                http2=os.getenv("PORTFOLIO_HTTP2", "false").lower() == "true"
+            )
+        if cache_dir is not None and _shared_transport.cache is None:
+            max_mb = os.getenv("PORTFOLIO_HTTP_CACHE_MB")
+            _shared_transport.cache = ResponseCache(
+                cache_dir,
+                max_bytes=(int(float(max_mb) * 1024 * 1024) if max_mb
+                           else DEFAULT_MAX_BYTES)
+            )
+        return _shared_transport
@@ -70,6 +70,16 @@ document.addEventListener('DOMContentLoaded', function () {
                 const description = site.description || '';
                 const lastUpdated = site.last_updated || '';
 
+                // Precomputed by scripts/build_thumbnails.py: reserve the image's space
+                // and show its colour and blurred placeholder until it has loaded
+                const dimensions = site.thumbnail_width
+                    ? `width="${site.thumbnail_width}" height="${site.thumbnail_height}"`
+                    : '';
+                const placeholder = site.thumbnail_placeholder
+                    ? `background: ${site.thumbnail_color || '#f0f0f0'} url('${site.thumbnail_placeholder}') center / cover no-repeat;`
+                    : '';
+                const sources = thumbnailSources(site.thumbnail_srcset);
+
                 // Generate color and initials for fallback image
                 const color = getColorForDomain(domain);
                 const initials = getInitials(domain);
@@ -84,9 +94,13 @@ document.addEventListener('DOMContentLoaded', function () {
 
                 // Create HTML content
                 item.innerHTML = `
-                                <div class="thumbnail-container">
-                                    <img src="${thumbnail}" alt="${domain}" onerror="
-                                        if (!this.getAttribute('data-error-handled')) {
+                                <div class="thumbnail-container" style="${placeholder}">
+                                    <picture>${sources}<img src="${thumbnail}" ${dimensions} decoding="async" alt="${domain}" onerror="
+                                        if (this.parentNode.querySelector('source')) {
+                                            // A variant is missing: drop the sources and load the original
+                                            this.parentNode.querySelectorAll('source').forEach(source => source.remove());
+                                            this.src = '${thumbnail}';
+                                        } else if (!this.getAttribute('data-error-handled')) {
                                             this.setAttribute('data-error-handled', 'true');
 
                                             // Try loading the website in an iframe
@@ -98,11 +112,11 @@ document.addEventListener('DOMContentLoaded', function () {
                                             };
 
                                             // Add iframe-active class to the image container for potential styling
-                                            this.parentNode.classList.add('iframe-active');
+                                            this.closest('.thumbnail-container').classList.add('iframe-active');
 
                                             // Hide the image and insert iframe before it
                                             this.style.display = 'none';
-                                            this.parentNode.insertBefore(iframe, this);
+                                            this.parentNode.parentNode.insertBefore(iframe, this.parentNode);
 
                                             // Handle iframe loading failure after timeout
                                             setTimeout(() => {
@@ -112,12 +126,12 @@ document.addEventListener('DOMContentLoaded', function () {
                                                     iframe.remove();
                                                     this.style.display = 'block';
                                                                                                     this.src = 'data:image/svg+xml;utf8,<svg xmlns=\\'http://www.w3.org/2000/svg\\' width=\\'300\\' height=\\'200\\' viewBox=\\'0 0 300 200\\'><rect fill=\\'%23${color}\\' width=\\'300\\' height=\\'200\\'></rect><text fill=\\'%23fff\\' font-family=\\'Arial\\' font-size=\\'30\\' font-weight=\\'bold\\' text-anchor=\\'middle\\' x=\\'150\\' y=\\'110\\'>${initials}</text></svg>';
-                                                    this.parentNode.classList.remove('iframe-active');
+                                                    this.closest('.thumbnail-container').classList.remove('iframe-active');
                                                 }
                                             }, 5000);
                                         } else {
                                             this.src = 'data:image/svg+xml;utf8,<svg xmlns=\\'http://www.w3.org/2000/svg\\' width=\\'300\\' height=\\'200\\' viewBox=\\'0 0 300 200\\'><rect fill=\\'%23${color}\\' width=\\'300\\' height=\\'200\\'></rect><text fill=\\'%23fff\\' font-family=\\'Arial\\' font-size=\\'30\\' font-weight=\\'bold\\' text-anchor=\\'middle\\' x=\\'150\\' y=\\'110\\'>${initials}</text></svg>';
-                                        }">
+                                        }"></picture>
                                 </div>
                                 <div class="content">
                                     <div class="domain"><a href="${url}" target="_blank">${domain}</a></div>
@@ -195,6 +209,20 @@ document.addEventListener('DOMContentLoaded', function () {
 });
 
 // Helper functions
+// <source> elements for the srcsets scripts/build_thumbnails.py writes, best
+// format first. Cards are 300-450px wide in the auto-fill grid, one column on
+// phones, so the browser picks the smallest variant that covers that width.
+const THUMBNAIL_TYPES = ['image/avif', 'image/webp'];
+const THUMBNAIL_SIZES = '(max-width: 700px) 100vw, (max-width: 1100px) 50vw, 450px';
+
+function thumbnailSources(srcsets) {
+    const rank = type => (THUMBNAIL_TYPES.indexOf(type) + 1) || THUMBNAIL_TYPES.length + 1;
+    return Object.entries(srcsets || {})
+        .sort(([a], [b]) => rank(a) - rank(b))
+        .map(([type, srcset]) => `<source type="${type}" srcset="${srcset}" sizes="${THUMBNAIL_SIZES}">`)
+        .join('');
+}
+
 function getColorForDomain(domain) {
     let hashValue = 0;
     for (let i = 0; i < domain.length; i++) {
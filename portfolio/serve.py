@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 """
 Simple HTTP server to serve the portfolio files with CORS support.
+
+Connections are served concurrently with HTTP/1.1 keep-alive; Ctrl+C or
+SIGTERM lets in-flight requests finish.
 """
 
 import os
+import sys
 import http.server
-import socketserver
-from http import HTTPStatus
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from digitname.httpd import KeepAliveMixin, PooledHTTPServer, serve
+from digitname.static import StaticFileMixin
 
-class CORSRequestHandler(http.server.SimpleHTTPRequestHandler):
+class CORSRequestHandler(KeepAliveMixin, StaticFileMixin,
+                         http.server.SimpleHTTPRequestHandler):
     def end_headers(self):
         # Enable CORS
         self.send_header('Access-Control-Allow-Origin', '*')
@@ -17,9 +25,8 @@ class CORSRequestHandler(http.server.SimpleHTTPRequestHandler):
         super().end_headers()
 
     def do_GET(self):
-        # Serve .json files with the correct MIME type
-        if self.path.endswith('.json'):
-            self.send_header('Content-Type', 'application/json')
+        # .json files get application/json from guess_type(); sending the
+        # header here would precede the status line
         return http.server.SimpleHTTPRequestHandler.do_GET(self)
 
 def run(port=8000):
@@ -30,10 +37,11 @@ def run(port=8000):
     # Try to find an available port if the default is in use
     for p in range(port, port + 10):
         try:
-            with socketserver.TCPServer(("", p), handler) as httpd:
+            with PooledHTTPServer(("", p), handler) as httpd:
                 print(f"🚀 Serving portfolio at http://localhost:{p}")
                 print("🛑 Press Ctrl+C to stop")
-                httpd.serve_forever()
+                serve(httpd)
+                return
         except OSError as e:
             if "Address already in use" in str(e):
                 print(f"Port {p} is in use, trying next port...")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Build responsive WebP/AVIF variants of the domain thumbnails and record
+their srcsets, dimensions, dominant colours and blur placeholders in
+data.json.
+
+Only new or changed screenshots are processed; see digitname/images.py.
+Pass --formats "" to compute only dimensions and placeholders.
+
+The site is served straight from the repository, so commit
+thumbnails/variants/ together with data.json after a run.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from digitname.images import (DEFAULT_FORMATS, DEFAULT_QUALITY, DEFAULT_WIDTHS,
+                              add_placeholders, add_srcsets, build_variants)
+from digitname.jsonstream import write_json
+
+# Configuration
+ROOT = Path(__file__).parent.parent
+THUMBNAILS_DIR = ROOT / "thumbnails"
+VARIANTS_DIR = THUMBNAILS_DIR / "variants"
+VARIANTS_URL = "thumbnails/variants/"
+DATA_JSON = ROOT / "data.json"
+SOURCE_PATTERNS = ("*.png", "*.jpg", "*.jpeg")
+
+
+def _int_list(value: str):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build responsive thumbnail variants")
+    parser.add_argument("--widths", type=_int_list, default=list(DEFAULT_WIDTHS),
+                        help="Comma-separated target widths (default: %(default)s)")
+    parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS),
+                        help="Comma-separated formats in order of preference "
+                             "(default: %(default)s)")
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY,
+                        help="Encoder quality (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    sources = sorted({path for pattern in SOURCE_PATTERNS
+                      for path in THUMBNAILS_DIR.glob(pattern)})
+    print(f"🖼️  Processing {len(sources)} thumbnails...")
+    started = time.perf_counter()
+    try:
+        formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+        images = build_variants(sources, VARIANTS_DIR, widths=args.widths,
+                                formats=formats, quality=args.quality,
+                                workers=args.workers)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    source_bytes = sum(path.stat().st_size for path in sources)
+    variant_bytes = sum((VARIANTS_DIR / v["file"]).stat().st_size
+                        for entry in images.values() for v in entry["variants"])
+    print(f"✅ {len(images)} thumbnails ready in {time.perf_counter() - started:.1f}s "
+          f"({source_bytes / 1e6:.1f} MB of sources, "
+          f"{variant_bytes / 1e6:.1f} MB of variants)")
+
+    with open(DATA_JSON, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    changed = (add_srcsets(records, images, VARIANTS_URL)
+               + add_placeholders(records, images))
+    if changed:
+        write_json(DATA_JSON, records)
+        print(f"✅ Updated image metadata in {DATA_JSON.name}")
+    else:
+        print(f"✅ {DATA_JSON.name} already up to date")
+
+
+if __name__ == "__main__":
+    main()
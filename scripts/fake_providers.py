@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Run a local stand-in for every provider API the portfolio refresh uses.
+
+Prints the environment to point update_portfolio_repos.py (and the portfolio
+generator) at it, e.g.:
+
+    python scripts/fake_providers.py --count 5000 --latency 0.08 --rate-limit 5000 &
+    eval "$(python scripts/fake_providers.py --print-env)"
+    python scripts/update_portfolio_repos.py
+
+See digitname/fakeapi.py for the endpoints and their behaviour.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from digitname.fakeapi import (DEFAULT_COUNT, SOURCES, FakeProviders,
+                               FakeProviderServer, Fixtures)
+from digitname.httpd import serve
+
+DEFAULT_PORT = 8900
+
+
+def _counts(value: str):
+    counts = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        source, _, count = part.partition("=")
+        if source.strip() not in SOURCES or not count.strip().isdigit():
+            raise argparse.ArgumentTypeError(
+                f"expected source=count with a source out of {', '.join(SOURCES)}")
+        counts[source.strip()] = int(count)
+    return counts
+
+
+def environment(base_url: str, username: str):
+    """Shell lines pointing every fetcher at the fake server."""
+    lines = []
+    for source in SOURCES:
+        lines.append(f"export {source.upper()}_BASE_URL={base_url}/{source}")
+        lines.append(f"export {source.upper()}_USERNAME={username}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve fake provider APIs for offline refresh testing")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help="Port to listen on (default: %(default)s)")
+    parser.add_argument("--username", default="fake-user",
+                        help="Account name on every provider (default: %(default)s)")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT,
+                        help="Projects per source (default: %(default)s)")
+    parser.add_argument("--counts", type=_counts, default={},
+                        help="Per-source overrides, e.g. github=100000,npm=50")
+    parser.add_argument("--orgs", type=int, default=0,
+                        help="GitHub organizations of the user (default: %(default)s)")
+    parser.add_argument("--org-repos", type=int, default=10,
+                        help="Repositories per organization (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Fixture seed (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds every response is delayed by "
+                             "(default: %(default)s)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Up to this many extra seconds of random delay "
+                             "(default: %(default)s)")
+    parser.add_argument("--rate-limit", type=int, default=None,
+                        help="Requests per source per window (default: unlimited)")
+    parser.add_argument("--rate-window", type=float, default=3600.0,
+                        help="Rate limit window in seconds (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=64,
+                        help="Requests served concurrently (default: %(default)s)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    parser.add_argument("--print-env", action="store_true",
+                        help="Only print the environment for a server on --host/--port")
+    args = parser.parse_args()
+
+    if args.print_env:
+        print("\n".join(environment(f"http://{args.host}:{args.port}", args.username)))
+        return
+
+    fixtures = Fixtures(args.username, counts=args.counts, default_count=args.count,
+                        orgs=args.orgs, org_repos=args.org_repos, seed=args.seed)
+    providers = FakeProviders(fixtures, rate_limit=args.rate_limit,
+                              rate_window=args.rate_window, latency=args.latency,
+                              jitter=args.jitter)
+    try:
+        server = FakeProviderServer((args.host, args.port), providers,
+                                    workers=args.workers, verbose=args.verbose)
+    except OSError as e:
+        print(f"❌ Cannot listen on {args.host}:{args.port}: {e}")
+        sys.exit(1)
+
+    total = sum(fixtures.counts.values()) + args.orgs * args.org_repos
+    print(f"🧪 Fake providers serving {total} projects for '{args.username}' "
+          f"at {server.url}")
+    print("   Point the refresh at them with:")
+    for line in environment(server.url, args.username):
+        print(f"   {line}")
+    serve(server)
+    counts = ", ".join(f"{source} {count}"
+                       for source, count in providers.requests.items() if count)
+    print(f"📊 Requests served: {counts or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
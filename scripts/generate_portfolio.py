@@ -8,11 +8,16 @@ import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterable, Iterator, List, Any, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from digitname.jsonstream import AtomicFile
+from digitname.snapshot import Snapshot, SnapshotError, write_snapshot
 
 # Configuration
 PORTFOLIO_DIR = Path("portfolio")
 PORTFOLIO_JSON = PORTFOLIO_DIR / "portfolio.json"
+PORTFOLIO_SNAPSHOT = PORTFOLIO_DIR / "portfolio.snap"
 TEMPLATE_HTML = "portfolio_template.html"
 OUTPUT_HTML = "index.html"
 
@@ -30,57 +35,96 @@ def load_portfolio() -> Dict[str, Any]:
         "metadata": {}
     }
 
+def load_snapshot(fields: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """Load only ``fields`` of each project from the columnar snapshot.
+    
+    Returns ``None`` when there is no snapshot or it is older than the JSON
+    file, so callers fall back to :func:`load_portfolio`.
+    """
+    try:
+        if PORTFOLIO_SNAPSHOT.stat().st_mtime_ns < PORTFOLIO_JSON.stat().st_mtime_ns:
+            return None
+        with Snapshot(PORTFOLIO_SNAPSHOT) as snapshot:
+            return snapshot.to_portfolio(fields)
+    except FileNotFoundError:
+        return None
+    except SnapshotError as e:
+        print(f"⚠️  Ignoring {PORTFOLIO_SNAPSHOT}: {e}")
+        return None
+
 def save_portfolio(data: Dict[str, Any]) -> None:
-    """Save portfolio data to JSON file."""
+    """Save portfolio data to JSON file and refresh its snapshot."""
     data["last_updated"] = datetime.utcnow().isoformat()
     with open(PORTFOLIO_JSON, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+    write_snapshot(PORTFOLIO_SNAPSHOT, data)
     print(f"✅ Portfolio data saved to {PORTFOLIO_JSON}")
 
-def generate_html(portfolio_data: Dict[str, Any]) -> None:
-    """Generate HTML from portfolio data."""
-    with open(TEMPLATE_HTML, 'r', encoding='utf-8') as f:
-        html = f.read()
-    
-    # Convert projects to HTML
-    projects_html = []
-    for project in portfolio_data.get("projects", []):
-        project_html = f"""
+PROJECT_CARD = """
         <div class="project-card">
             <h3><a href="{url}" target="_blank">{name}</a></h3>
-            <p class="source">Source: {source} • {language if language else 'N/A'}</p>
-            <p class="description">{description or 'No description available'}</p>
+            <p class="source">Source: {source} • {language}</p>
+            <p class="description">{description}</p>
             <div class="meta">
                 <span class="stars">⭐ {stars}</span>
                 <span class="updated">Updated: {updated_at}</span>
             </div>
         </div>
-        """.format(
-            name=project.get('name', 'Unnamed Project'),
-            url=project.get('url', '#'),
-            source=project.get('source', 'unknown').upper(),
-            language=project.get('language', ''),
-            description=project.get('description', ''),
-            stars=project.get('stars', 0),
-            updated_at=project.get('updated_at', 'N/A')
+        """
+
+# Project fields the cards use
+CARD_FIELDS = ["name", "url", "source", "language", "description", "stars",
+               "updated_at"]
+
+def render_project_cards(projects: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield the HTML card of each project, one at a time."""
+    for project in projects:
+        yield PROJECT_CARD.format(
+            name=project.get('name') or 'Unnamed Project',
+            url=project.get('url') or '#',
+            source=(project.get('source') or 'unknown').upper(),
+            language=project.get('language') or 'N/A',
+            description=project.get('description') or 'No description available',
+            stars=project.get('stars') or 0,
+            updated_at=project.get('updated_at') or 'N/A'
         )
-        projects_html.append(project_html)
+
+def generate_html(portfolio_data: Dict[str, Any]) -> None:
+    """Generate HTML from portfolio data.
     
-    # Insert projects into template
-    html = html.replace('{{PROJECTS}}', '\n'.join(projects_html))
-    html = html.replace('{{LAST_UPDATED}}', portfolio_data.get('last_updated', 'Unknown'))
+    The template is split at ``{{PROJECTS}}``; its head is written, then each
+    project card straight to the file, then its tail, so the page is never
+    held in memory as a whole.
+    """
+    with open(TEMPLATE_HTML, 'r', encoding='utf-8') as f:
+        html = f.read()
+    
+    last_updated = portfolio_data.get('last_updated', 'Unknown')
+    head, placeholder, tail = html.partition('{{PROJECTS}}')
     
-    with open(OUTPUT_HTML, 'w', encoding='utf-8') as f:
-        f.write(html)
-    print(f"✅ HTML portfolio generated at {OUTPUT_HTML}")
+    count = 0
+    with AtomicFile(OUTPUT_HTML) as out:
+        out.write(head.replace('{{LAST_UPDATED}}', last_updated))
+        if placeholder:
+            for card in render_project_cards(portfolio_data.get("projects", [])):
+                if count:
+                    out.write('\n')
+                out.write(card)
+                count += 1
+            out.write(tail.replace('{{LAST_UPDATED}}', last_updated))
+    print(f"✅ HTML portfolio generated at {OUTPUT_HTML} ({count} projects)")
 
 def main():
     """Main function to generate portfolio."""
-    # Load existing data
-    portfolio_data = load_portfolio()
-    
-    # Save updated data
-    save_portfolio(portfolio_data)
+    # The cards need a handful of fields: read just those columns from the
+    # snapshot the updater wrote, unless the JSON file is newer
+    portfolio_data = load_snapshot(CARD_FIELDS)
+    if portfolio_data is None:
+        # Load existing data
+        portfolio_data = load_portfolio()
+        
+        # Save updated data
+        save_portfolio(portfolio_data)
     
     # Generate HTML
     generate_html(portfolio_data)
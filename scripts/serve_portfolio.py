@@ -1,15 +1,22 @@
 #!/usr/bin/env python3
 """
 Serve the portfolio website on an available port with improved error handling.
+
+Requests are served concurrently by a bounded worker pool with HTTP/1.1
+keep-alive; SIGTERM or Ctrl+C drains open connections before exiting.
 """
 
 import os
 import sys
 import socket
-import signal
 import webbrowser
 import logging
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import SimpleHTTPRequestHandler
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from digitname.httpd import KeepAliveMixin, PooledHTTPServer, serve
+from digitname.static import StaticFileMixin
 
 # Configure logging
 logging.basicConfig(
@@ -22,7 +29,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class CustomHTTPRequestHandler(SimpleHTTPRequestHandler):
+class CustomHTTPRequestHandler(KeepAliveMixin, StaticFileMixin,
+                               SimpleHTTPRequestHandler):
     """Custom request handler with improved error handling."""
     
     def log_message(self, format, *args):
@@ -62,16 +70,7 @@ def find_available_port(start_port=8000, max_port=9000):
             continue
     raise OSError(f"No available ports found between {start_port} and {max_port}")
 
-def signal_handler(sig, frame):
-    """Handle interrupt signals gracefully."""
-    print("\n👋 Shutting down server...")
-    sys.exit(0)
-
 def main():
-    # Set up signal handling
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     try:
         # Change to the project root directory
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -83,10 +82,7 @@ def main():
         
         # Start the server with our custom handler
         server_address = ('', port)
-        httpd = HTTPServer(server_address, CustomHTTPRequestHandler)
-        
-        # Set socket options to allow address reuse
-        httpd.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        httpd = PooledHTTPServer(server_address, CustomHTTPRequestHandler)
         
         print(f"🚀 Serving portfolio at http://localhost:{port}")
         print("📄 Access logs are being written to portfolio_server.log")
@@ -98,9 +94,9 @@ def main():
         except Exception as e:
             logger.warning("Could not open browser: %s", e)
         
-        # Start serving
-        logger.info("Starting server on port %d", port)
-        httpd.serve_forever()
+        # Start serving until SIGTERM/Ctrl+C, then drain open connections
+        logger.info("Starting server on port %d with %d workers", port, httpd.workers)
+        serve(httpd)
         
     except Exception as e:
         logger.critical("Server error: %s", str(e), exc_info=True)
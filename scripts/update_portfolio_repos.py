@@ -5,17 +5,26 @@ based on accounts configured in .env file.
 """
 
 import os
+import argparse
+import functools
 import json
 import sys
 import time
 import re
 import subprocess
-import requests
 from pathlib import Path
 from datetime import datetime, timezone
 from urllib.parse import urlencode
 from dotenv import load_dotenv
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from digitname.changes import diff_projects, merge_projects
+from digitname.fetch import FetchEngine, IncompleteFetch, fetch_each
+from digitname.jsonstream import write_json, write_portfolio
+from digitname.pagination import paginate
+from digitname.snapshot import write_snapshot
+from digitname.transport import HTTPStatusError, TransportError, get_transport
 
 # Load environment variables
 load_dotenv()
@@ -24,6 +33,12 @@ load_dotenv()
 PORTFOLIO_DIR = Path(__file__).parent.parent / "portfolio"
 CACHE_DIR = PORTFOLIO_DIR / "cache"
 PORTFOLIO_JSON = PORTFOLIO_DIR / "portfolio.json"
+PORTFOLIO_SNAPSHOT = PORTFOLIO_DIR / "portfolio.snap"
+CHANGES_LOG = PORTFOLIO_DIR / "changes.jsonl"
+
+# Concurrency settings for the fetch engine
+FETCH_WORKERS = int(os.getenv("PORTFOLIO_FETCH_WORKERS", "8"))
+FETCH_DEADLINE = float(os.getenv("PORTFOLIO_FETCH_DEADLINE", "300"))
 
 # Create necessary directories
 PORTFOLIO_DIR.mkdir(exist_ok=True)
@@ -37,6 +52,7 @@ APIS = {
         "token_env": "GITHUB_TOKEN",
         "endpoint": "/users/{username}/repos?per_page=100&sort=updated&type=owner",
         "auth_header": "token {token}",
+        "concurrency": 4,
         "enabled": True
     },
     "gitlab": {
@@ -46,12 +62,14 @@ APIS = {
         "endpoint": "/users?username={username}",
         "projects_endpoint": "/users/{user_id}/projects?per_page=100&order_by=last_activity_at",
         "auth_header": "Bearer {token}",
+        "concurrency": 4,
         "enabled": True
     },
     "npm": {
         "base_url": "https://registry.npmjs.org",
         "username_env": "NPM_USERNAME",
         "endpoint": "/-/user/{username}/packages",
+        "concurrency": 2,
         "enabled": True
     },
     "pypi": {
@@ -59,33 +77,46 @@ APIS = {
         "username_env": "PYPI_USERNAME",
         "endpoint": "/{package_name}/json",
         "search_endpoint": "https://pypi.org/search/?q=author%3A{username}",
+        "concurrency": 8,
         "enabled": True
     },
     "dockerhub": {
         "base_url": "https://hub.docker.com/v2",
         "username_env": "DOCKERHUB_USERNAME",
         "endpoint": "/repositories/{username}",
+        "concurrency": 2,
         "enabled": True
     },
     "huggingface": {
         "base_url": "https://huggingface.co/api",
         "username_env": "HUGGINGFACE_USERNAME",
-        "endpoint": "/models?author={username}",
+        "endpoint": "/models?author={username}&limit=100",
         "auth_header": "Bearer {token}",
+        "concurrency": 4,
         "enabled": True
     },
     "packagist": {
         "base_url": "https://packagist.org",
         "username_env": "PACKAGIST_USERNAME",
         "endpoint": "/users/{username}/packages.json",
+        "concurrency": 8,
         "enabled": True
     }
 }
 
 class PortfolioUpdater:
-    def __init__(self):
+    def __init__(self, incremental: bool = False, compact: bool = False):
         self.portfolio_data = self._load_portfolio()
         self.updated = False
+        self.incremental = incremental
+        self.compact = compact
+        self.changes = None
+        self.transport = get_transport(cache_dir=CACHE_DIR)
+        self.engine = FetchEngine(
+            max_workers=FETCH_WORKERS,
+            deadline=FETCH_DEADLINE,
+            limits={name: self._concurrency(name) for name in APIS}
+        )
 
     def _load_portfolio(self) -> Dict[str, Any]:
         """Load existing portfolio data or create a new one."""
@@ -98,157 +129,188 @@ class PortfolioUpdater:
             "metadata": {}
         }
 
-    def _save_portfolio(self):
-        """Save the portfolio data to JSON files, with separate files for each account type."""
-        os.makedirs(os.path.dirname(PORTFOLIO_JSON), exist_ok=True)
-        
-        # Save the main portfolio file
-        with open(PORTFOLIO_JSON, 'w', encoding='utf-8') as f:
-            json.dump(self.portfolio_data, f, indent=2)
-        print(f"✅ Main portfolio updated and saved to {PORTFOLIO_JSON}")
-        
-        # Save separate files for each account type
-        if 'projects' in self.portfolio_data:
-            projects_by_source = {}
-            
-            # Group projects by source
-            for project in self.portfolio_data['projects']:
-                source = project.get('source')
-                if source not in projects_by_source:
-                    projects_by_source[source] = []
-                projects_by_source[source].append(project)
-            
-            # Save each source to a separate file
-            for source, projects in projects_by_source.items():
-                if not source:
-                    continue
-                    
-                # Create a clean data structure for this source
-                source_data = {
-                    'source': source,
-                    'last_updated': self.portfolio_data.get('last_updated'),
-                    'projects': projects,
-                    'stats': {
-                        'total_projects': len(projects)
-                    }
-                }
-                
-                # Save to a separate file
-                source_filename = f"portfolio_{source.lower().replace(' ', '_')}.json"
-                source_path = os.path.join(os.path.dirname(PORTFOLIO_JSON), source_filename)
-                
-                with open(source_path, 'w', encoding='utf-8') as f:
-                    json.dump(source_data, f, indent=2)
-                print(f"✅ {source} portfolio saved to {source_path}")
+    def _save_portfolio(self, sources: Optional[set] = None):
+        """Save the portfolio data to JSON files, one per account type as well.
+        
+        Projects are streamed to the main file and their per-source file in a
+        single pass, and every file is replaced atomically.
+        
+        Args:
+            sources: Only rewrite the per-source files of these sources. All
+                sources are written when not given.
+        """
+        def report(source, path):
+            if source:
+                print(f"✅ {source} portfolio saved to {path}")
+            else:
+                print(f"✅ Main portfolio updated and saved to {path}")
+        
+        write_portfolio(
+            PORTFOLIO_JSON,
+            self.portfolio_data,
+            indent=None if self.compact else 2,
+            sources=sources,
+            on_write=report
+        )
+        
+        # Columnar copy for readers that only need a few fields
+        write_snapshot(PORTFOLIO_SNAPSHOT, self.portfolio_data)
+        print(f"✅ Portfolio snapshot saved to {PORTFOLIO_SNAPSHOT}")
 
-    def _make_api_request(self, url: str, headers: Optional[Dict] = None, method: str = 'GET', 
-                         data: Optional[Dict] = None, params: Optional[Dict] = None) -> Optional[Dict]:
-        """Make an HTTP request to the specified URL with error handling and rate limiting."""
+    def _get_json(self, url: str, headers: Optional[Dict] = None,
+                  missing_ok: bool = False) -> Any:
+        """Fetch a JSON document, raising on HTTP and transport errors.
+        
+        A failed request must fail its source: in incremental mode a source
+        that returns normally is taken as its complete listing, and anything
+        missing from it as removed.
+        
+        Args:
+            url: URL to fetch.
+            headers: Extra request headers.
+            missing_ok: Return None instead of raising on 404.
+        """
         try:
-            headers = headers or {}
-            
-            # Add default headers if not present
-            if 'User-Agent' not in headers:
-                headers['User-Agent'] = 'PortfolioUpdater/1.0 (https://github.com/tom-sapletta-com/portfolio)'
-            
-            if 'Accept' not in headers:
-                headers['Accept'] = 'application/json'
-            
-            # Make the request
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=data,
-                params=params,
-                timeout=15
+            return self._fetch_page(url, headers).json()
+        except HTTPStatusError as e:
+            if missing_ok and e.response.status_code == 404:
+                return None
+            raise
+
+    def _fetch_page(self, url: str, headers: Optional[Dict] = None):
+        """Fetch one page of a paginated listing, raising on HTTP errors."""
+        headers = dict(headers or {})
+        headers.setdefault('Accept', 'application/json')
+        response = self.transport.get(url, headers=headers)
+        response.raise_for_status()
+        return response
+
+    def _concurrency(self, source: str) -> int:
+        """Requests a source may have in flight; <SOURCE>_CONCURRENCY overrides it."""
+        default = APIS[source].get("concurrency", 4)
+        return int(os.getenv(f"{source.upper()}_CONCURRENCY", default))
+
+    def _base_url(self, source: str) -> str:
+        """API root of a source; <SOURCE>_BASE_URL overrides it (e.g. a fake server)."""
+        default = APIS[source]["base_url"]
+        return os.getenv(f"{source.upper()}_BASE_URL", default).rstrip("/")
+
+    def _endpoint(self, source: str, key: str = "endpoint", **fields: Any) -> str:
+        """URL of ``APIS[source][key]`` formatted with ``fields``, under the root."""
+        return self._base_url(source) + APIS[source][key].format(**fields)
+
+    def _fetch_details(self, source: str, fetch_one,
+                       names) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """Fetch per-package details over the source's worker pool, in input order.
+        
+        Raises:
+            IncompleteFetch: After the other packages, if any of them failed.
+        """
+        failed = []
+        
+        def report(name, error):
+            failed.append(name)
+            print(f"⚠️  Error processing {source} package {name}: {error}")
+        
+        yield from fetch_each(
+            fetch_one,
+            names,
+            workers=self._concurrency(source),
+            submit=functools.partial(self.engine.submit, source),
+            on_error=report
+        )
+        if failed:
+            raise IncompleteFetch(
+                f"{len(failed)} {source} packages could not be fetched")
+
+    def _paginate(self, source: str, url: str,
+                  headers: Optional[Dict] = None) -> Iterator[Dict]:
+        """Stream every item of a paginated listing, fetching known pages concurrently.
+        
+        A page that fails raises after the items before it, so a truncated
+        listing fails its source rather than passing for the whole listing.
+        """
+        try:
+            yield from paginate(
+                lambda page_url: self._fetch_page(page_url, headers),
+                url,
+                workers=self._concurrency(source),
+                submit=functools.partial(self.engine.submit, source)
             )
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', 60))
-                print(f"⚠️  Rate limited. Waiting {retry_after} seconds...")
-                time.sleep(retry_after + 1)
-                return self._make_api_request(url, headers, method, data, params)
-                
-            response.raise_for_status()
-            
-            # Handle different content types
-            content_type = response.headers.get('Content-Type', '')
-            if 'application/json' in content_type:
-                return response.json()
-            elif 'text/html' in content_type:
-                return {'html': response.text}
-            else:
-                return {'content': response.text}
-                
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                print(f"🔍 Resource not found: {url}")
-            elif e.response.status_code == 403:
-                print(f"🔒 Access forbidden. Check your API token: {url}")
-            else:
-                print(f"❌ HTTP Error {e.response.status_code} for {url}: {e}")
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error making request to {url}: {e}")
-        except Exception as e:
-            print(f"❌ Unexpected error for {url}: {e}")
-            
-        return None
+        except HTTPStatusError as e:
+            print(f"❌ HTTP Error {e.response.status_code} for {e.response.url}")
+            raise
+        except (TransportError, ValueError) as e:
+            print(f"❌ Error fetching {url}: {e}")
+            raise
 
-    def _get_github_repos(self) -> List[Dict]:
-        """Fetch repositories from GitHub."""
+    def _get_github_repos(self) -> Iterator[Dict]:
+        """Fetch repositories from GitHub, following every page."""
         config = APIS["github"]
         username = os.getenv(config["username_env"])
         token = os.getenv(config["token_env"])
         
         if not username:
             print("⚠️  GitHub username not found in .env")
-            return []
+            return
             
-        url = f"{config['base_url']}{config['endpoint'].format(username=username)}"
-        headers = {"Authorization": f"token {token}"} if token else {}
+        url = self._endpoint("github", username=username)
+        headers = ({"Authorization": config["auth_header"].format(token=token)}
+                   if token else {})
         
         print(f"🔍 Fetching GitHub repositories for {username}...")
-        repos = self._make_api_request(url, headers) or []
-        return [{
-            "name": repo["name"],
-            "full_name": repo["full_name"],
-            "description": repo.get("description", ""),
-            "url": repo["html_url"],
-            "language": repo.get("language"),
-            "stars": repo.get("stargazers_count", 0),
-            "forks": repo.get("forks_count", 0),
-            "updated_at": repo["updated_at"],
-            "source": "github"
-        } for repo in repos if not repo.get("fork", False)]
+        for repo in self._paginate("github", url, headers):
+            if repo.get("fork", False):
+                continue
+            yield {
+                "name": repo["name"],
+                "full_name": repo["full_name"],
+                "description": repo.get("description", ""),
+                "url": repo["html_url"],
+                "language": repo.get("language"),
+                "stars": repo.get("stargazers_count", 0),
+                "forks": repo.get("forks_count", 0),
+                "updated_at": repo["updated_at"],
+                "source": "github"
+            }
 
-    def _get_gitlab_repos(self) -> List[Dict]:
-        """Fetch repositories from GitLab."""
+    def _get_gitlab_repos(self) -> Iterator[Dict]:
+        """Fetch repositories from GitLab, following every page."""
         config = APIS["gitlab"]
         username = os.getenv(config["username_env"])
         token = os.getenv(config["token_env"])
         
         if not username:
             print("⚠️  GitLab username not found in .env")
-            return []
+            return
             
-        url = f"{config['base_url']}{config['endpoint'].format(username=username)}"
+        url = self._endpoint("gitlab", username=username)
         headers = {"PRIVATE-TOKEN": token} if token else {}
         
         print(f"🔍 Fetching GitLab repositories for {username}...")
-        repos = self._make_api_request(url, headers) or []
-        return [{
-            "name": repo["name"],
-            "full_name": repo["path_with_namespace"],
-            "description": repo.get("description", ""),
-            "url": repo["web_url"],
-            "language": repo.get("language"),
-            "stars": repo.get("star_count", 0),
-            "forks": repo.get("forks_count", 0),
-            "updated_at": repo["last_activity_at"],
-            "source": "gitlab"
-        } for repo in repos if not repo.get("forked_from_project")]
+        
+        # Resolve the numeric user id first; projects are listed per id
+        users = self._get_json(url, headers)
+        if not isinstance(users, list) or not users:
+            print(f"🔍 GitLab user not found: {username}")
+            return
+        projects_url = self._endpoint("gitlab", "projects_endpoint",
+                                      user_id=users[0]["id"])
+        
+        for repo in self._paginate("gitlab", projects_url, headers):
+            if repo.get("forked_from_project"):
+                continue
+            yield {
+                "name": repo["name"],
+                "full_name": repo["path_with_namespace"],
+                "description": repo.get("description", ""),
+                "url": repo["web_url"],
+                "language": repo.get("language"),
+                "stars": repo.get("star_count", 0),
+                "forks": repo.get("forks_count", 0),
+                "updated_at": repo["last_activity_at"],
+                "source": "gitlab"
+            }
 
     def _get_npm_packages(self) -> List[Dict]:
         """Fetch packages from npm registry."""
@@ -261,92 +323,92 @@ class PortfolioUpdater:
             
         # Note: npm registry doesn't have a direct endpoint to list packages by user
         # This is a workaround using the npm CLI
-        try:
-            print(f"🔍 Fetching npm packages for {username}...")
-            result = subprocess.run(
-                ["npm", "search", f"maintainer:{username}", "--json"],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            packages = json.loads(result.stdout) if result.stdout else []
+        print(f"🔍 Fetching npm packages for {username}...")
+        result = subprocess.run(
+            ["npm", "search", f"maintainer:{username}", "--json",
+             "--registry", self._base_url("npm")],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        if result.returncode != 0:
+            reason = result.stderr.strip() or result.returncode
+            raise RuntimeError(f"npm search failed: {reason}")
+        packages = json.loads(result.stdout) if result.stdout else []
+        
+        return [{
+            "name": pkg["name"],
+            "full_name": pkg["name"],
+            "description": pkg.get("description", ""),
+            "url": f"https://www.npmjs.com/package/{pkg['name']}",
+            "version": pkg.get("version", ""),
+            "downloads": pkg.get("downloads", 0),
+            "updated_at": pkg.get("date", ""),
+            "source": "npm"
+        } for pkg in packages if isinstance(pkg, dict)]
+
+    def _get_pypi_package(self, package_name: str, username: str) -> Optional[Dict]:
+        """Fetch the details of one PyPI package, or None if it is not the user's."""
+        pkg_url = self._endpoint("pypi", package_name=package_name)
+        # Release names that are not packages of their own are simply skipped
+        pkg_data = self._get_json(pkg_url, missing_ok=True)
+        
+        if not pkg_data or 'info' not in pkg_data:
+            return None
             
-            return [{
-                "name": pkg["name"],
-                "full_name": pkg["name"],
-                "description": pkg.get("description", ""),
-                "url": f"https://www.npmjs.com/package/{pkg['name']}",
-                "version": pkg.get("version", ""),
-                "downloads": pkg.get("downloads", 0),
-                "updated_at": datetime.utcnow().isoformat(),
-                "source": "npm"
-            } for pkg in packages if isinstance(pkg, dict)]
+        info = pkg_data['info']
+        
+        # Skip if not the author
+        maintainers = info.get('maintainer') or ''
+        if info.get('author') != username and username not in maintainers:
+            return None
             
-        except (subprocess.SubprocessError, json.JSONDecodeError) as e:
-            print(f"❌ Error fetching npm packages: {e}")
-            return []
+        # Get latest release info
+        releases = pkg_data.get('releases', {})
+        latest_release = max(releases.keys()) if releases else ""
+        
+        return {
+            "name": package_name,
+            "full_name": package_name,
+            "description": info.get('summary', info.get('description', '')),
+            "url": info.get('package_url', f"https://pypi.org/project/{package_name}/"),
+            "version": info.get('version', ''),
+            "downloads": info.get('downloads', {}).get('last_month', 0),
+            "created_at": (info['release_url'].split('/')[-2]
+                           if info.get('release_url') else ""),
+            "updated_at": latest_release or info.get('upload_time', ''),
+            "source": "pypi"
+        }
 
-    def _get_pypi_packages(self) -> List[Dict]:
-        """Fetch packages from PyPI."""
+    def _get_pypi_packages(self) -> Iterator[Dict]:
+        """Fetch packages from PyPI, yielding each one as soon as it is resolved."""
         config = APIS["pypi"]
         username = os.getenv(config["username_env"])
         
         if not username:
             print("⚠️  PyPI username not found in .env")
-            return []
-            
-        try:
-            print(f"🔍 Fetching PyPI packages for {username}...")
-            
-            # First, get all packages by the user
-            url = f"https://pypi.org/pypi/{username}/json"
-            user_data = self._make_api_request(url)
-            
-            packages = []
-            if user_data and 'releases' in user_data:
-                for package_name in user_data.get('releases', {}).keys():
-                    try:
-                        # Get package details
-                        pkg_url = f"https://pypi.org/pypi/{package_name}/json"
-                        pkg_data = self._make_api_request(pkg_url)
-                        
-                        if not pkg_data or 'info' not in pkg_data:
-                            continue
-                            
-                        info = pkg_data['info']
-                        
-                        # Skip if not the author
-                        if info.get('author') != username and username not in (info.get('maintainer') or ''):
-                            continue
-                            
-                        # Get latest release info
-                        releases = pkg_data.get('releases', {})
-                        latest_release = max(releases.keys()) if releases else ""
-                        
-                        packages.append({
-                            "name": package_name,
-                            "full_name": package_name,
-                            "description": info.get('summary', info.get('description', '')),
-                            "url": info.get('package_url', f"https://pypi.org/project/{package_name}/"),
-                            "version": info.get('version', ''),
-                            "downloads": info.get('downloads', {}).get('last_month', 0),
-                            "created_at": info.get('release_url', '').split('/')[-2] if info.get('release_url') else "",
-                            "updated_at": latest_release or info.get('upload_time', ''),
-                            "source": "pypi"
-                        })
-                        
-                    except Exception as pkg_error:
-                        print(f"⚠️  Error processing PyPI package {package_name}: {pkg_error}")
-                        continue
-            
-            print(f"✅ Found {len(packages)} PyPI packages")
-            return packages
-            
-        except Exception as e:
-            print(f"❌ Error fetching PyPI packages: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+            return
+            
+        print(f"🔍 Fetching PyPI packages for {username}...")
+        
+        # First, get all packages by the user; most users have no package
+        # named after them, which means they have none to list this way
+        url = self._endpoint("pypi", package_name=username)
+        user_data = self._get_json(url, missing_ok=True)
+        
+        found = 0
+        if user_data and 'releases' in user_data:
+            # Package details are fetched concurrently, results keep their order
+            for _, package in self._fetch_details(
+                "pypi",
+                lambda package_name: self._get_pypi_package(package_name, username),
+                user_data.get('releases', {}).keys()
+            ):
+                if package:
+                    found += 1
+                    yield package
+        
+        print(f"✅ Found {found} PyPI packages")
     
     def _get_dockerhub_repos(self) -> List[Dict]:
         """Fetch repositories from Docker Hub."""
@@ -357,56 +419,52 @@ class PortfolioUpdater:
             print("⚠️  Docker Hub username not found in .env")
             return []
             
-        try:
-            print(f"🔍 Fetching Docker Hub repositories for {username}...")
-            url = f"{config['base_url']}{config['endpoint'].format(username=username)}"
-            
-            # Docker Hub API is paginated, so we need to handle pagination
-            all_repos = []
-            next_url = f"{url}?page=1&page_size=100"
-            
-            while next_url:
-                response = requests.get(next_url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                
-                all_repos.extend(data.get("results", []))
-                next_url = data.get("next")
-            
-            return [{
-                "name": repo["name"],
-                "full_name": f"{username}/{repo['name']}",
-                "description": repo.get("description", ""),
-                "url": f"https://hub.docker.com/r/{username}/{repo['name']}",
-                "stars": repo.get("star_count", 0),
-                "pulls": repo.get("pull_count", 0),
-                "created_at": repo.get("last_updated", ""),
-                "updated_at": repo.get("last_updated", ""),
-                "source": "dockerhub"
-            } for repo in all_repos]
+        print(f"🔍 Fetching Docker Hub repositories for {username}...")
+        url = self._endpoint("dockerhub", username=username)
+        
+        # Docker Hub API is paginated, so we need to handle pagination
+        all_repos = []
+        next_url = f"{url}?page=1&page_size=100"
+        
+        while next_url:
+            response = self.transport.get(next_url, timeout=10)
+            response.raise_for_status()
+            data = response.json()
             
-        except requests.RequestException as e:
-            print(f"❌ Error fetching Docker Hub repositories: {e}")
-            return []
+            all_repos.extend(data.get("results", []))
+            next_url = data.get("next")
+        
+        return [{
+            "name": repo["name"],
+            "full_name": f"{username}/{repo['name']}",
+            "description": repo.get("description", ""),
+            "url": f"https://hub.docker.com/r/{username}/{repo['name']}",
+            "stars": repo.get("star_count", 0),
+            "pulls": repo.get("pull_count", 0),
+            "created_at": repo.get("last_updated", ""),
+            "updated_at": repo.get("last_updated", ""),
+            "source": "dockerhub"
+        } for repo in all_repos]
     
-    def _get_huggingface_models(self) -> List[Dict]:
-        """Fetch models from Hugging Face."""
+    def _get_huggingface_models(self) -> Iterator[Dict]:
+        """Fetch models from Hugging Face, following every page."""
         config = APIS["huggingface"]
         username = os.getenv(config["username_env"])
         token = os.getenv("HUGGINGFACE_TOKEN")
         
         if not username:
             print("⚠️  Hugging Face username not found in .env")
-            return []
+            return
             
-        try:
-            print(f"🔍 Fetching Hugging Face models for {username}...")
-            url = f"{config['base_url']}{config['endpoint'].format(username=username)}"
-            headers = {"Authorization": config["auth_header"].format(token=token)} if token else {}
-            
-            models = self._make_api_request(url, headers) or []
-            
-            return [{
+        print(f"🔍 Fetching Hugging Face models for {username}...")
+        url = self._endpoint("huggingface", username=username)
+        headers = ({"Authorization": config["auth_header"].format(token=token)}
+                   if token else {})
+        
+        for model in self._paginate("huggingface", url, headers):
+            if not isinstance(model, dict):
+                continue
+            yield {
                 "name": model["modelId"].split("/")[-1],
                 "full_name": model["modelId"],
                 "description": model.get("pipeline_tag", ""),
@@ -416,87 +474,79 @@ class PortfolioUpdater:
                 "created_at": "",
                 "updated_at": model.get("lastModified", ""),
                 "source": "huggingface"
-            } for model in models if isinstance(model, dict)]
-            
-        except Exception as e:
-            print(f"❌ Error fetching Hugging Face models: {e}")
-            return []
+            }
     
-    def _get_packagist_packages(self) -> List[Dict]:
-        """Fetch packages from Packagist (PHP)."""
+    def _get_packagist_package(self, package_name: str) -> Optional[Dict]:
+        """Fetch the details of one Packagist package."""
+        pkg_url = f"{self._base_url('packagist')}/packages/{package_name}.json"
+        pkg_data = self._get_json(pkg_url)
+        
+        if not isinstance(pkg_data, dict) or "package" not in pkg_data:
+            raise ValueError(f"invalid response for {package_name}")
+            
+        pkg_info = pkg_data["package"]
+        versions = pkg_info.get("versions", {})
+        latest_version = next(iter(versions.values()), {}) if versions else {}
+        
+        # Get repository URL from package data
+        repo_url = ""
+        if "repository" in pkg_info:
+            repo_url = pkg_info["repository"]
+        elif "source" in latest_version and isinstance(latest_version["source"], dict):
+            repo_url = latest_version["source"].get("url", "")
+        
+        # Format package data
+        return {
+            "name": package_name.split('/')[-1],
+            "full_name": package_name,
+            "description": pkg_info.get("description", ""),
+            "url": f"https://packagist.org/packages/{package_name}",
+            "repository_url": repo_url,
+            "version": next(iter(versions.keys()), ""),
+            "downloads": pkg_info.get("downloads", {}).get("total", 0),
+            "favers": pkg_info.get("favers", 0),
+            "created_at": "",
+            "updated_at": latest_version.get("time", ""),
+            "source": "packagist",
+            "language": "PHP",
+            "topics": (pkg_info["keywords"]
+                       if isinstance(pkg_info.get("keywords"), list) else []),
+            "license": latest_version.get("license", [])
+        }
+
+    def _get_packagist_packages(self) -> Iterator[Dict]:
+        """Fetch packages from Packagist (PHP), yielding each one when resolved."""
         config = APIS["packagist"]
         username = os.getenv(config["username_env"])
         
         if not username:
             print("⚠️  Packagist username not found in .env")
-            return []
+            return
         
-        try:
-            print(f"🔍 Fetching Packagist packages for {username}...")
-            url = f"{config['base_url']}/users/{username}/packages.json"
-            data = self._make_api_request(url)
-            
-            if not data or "packageNames" not in data:
-                print("ℹ️  No packages found or invalid response from Packagist")
-                return []
-            
-            packages = []
-            for package_name in data["packageNames"]:
-                try:
-                    # Fetch detailed package information
-                    pkg_url = f"{config['base_url']}/packages/{package_name}.json"
-                    pkg_data = self._make_api_request(pkg_url)
-                    
-                    if not pkg_data or "package" not in pkg_data:
-                        continue
-                        
-                    pkg_info = pkg_data["package"]
-                    versions = pkg_info.get("versions", {})
-                    latest_version = next(iter(versions.values()), {}) if versions else {}
-                    
-                    # Get repository URL from package data
-                    repo_url = ""
-                    if "repository" in pkg_info:
-                        repo_url = pkg_info["repository"]
-                    elif "source" in latest_version and isinstance(latest_version["source"], dict):
-                        repo_url = latest_version["source"].get("url", "")
-                    
-                    # Format package data
-                    package = {
-                        "name": package_name.split('/')[-1],
-                        "full_name": package_name,
-                        "description": pkg_info.get("description", ""),
-                        "url": f"https://packagist.org/packages/{package_name}",
-                        "repository_url": repo_url,
-                        "version": next(iter(versions.keys()), ""),
-                        "downloads": pkg_info.get("downloads", {}).get("total", 0),
-                        "favers": pkg_info.get("favers", 0),
-                        "created_at": "",
-                        "updated_at": latest_version.get("time", ""),
-                        "source": "packagist",
-                        "language": "PHP",
-                        "topics": pkg_info.get("keywords", []) if isinstance(pkg_info.get("keywords"), list) else [],
-                        "license": latest_version.get("license", [])
-                    }
-                    packages.append(package)
-                    
-                except Exception as pkg_error:
-                    print(f"⚠️  Error processing package {package_name}: {pkg_error}")
-                    continue
-            
-            print(f"✅ Found {len(packages)} Packagist packages")
-            return packages
-            
-        except Exception as e:
-            print(f"❌ Error fetching Packagist packages: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+        print(f"🔍 Fetching Packagist packages for {username}...")
+        url = f"{self._base_url('packagist')}/users/{username}/packages.json"
+        data = self._get_json(url)
+        
+        if not isinstance(data, dict) or "packageNames" not in data:
+            raise ValueError("invalid response from Packagist")
+        
+        found = 0
+        # Package details are fetched concurrently, results keep their order
+        for _, package in self._fetch_details("packagist", self._get_packagist_package,
+                                              data["packageNames"]):
+            if package:
+                found += 1
+                yield package
+        
+        print(f"✅ Found {found} Packagist packages")
     
     def update_repositories(self):
-        """Update repositories from all sources."""
-        self.portfolio_data["last_updated"] = datetime.utcnow().isoformat()
+        """Update repositories from all sources.
         
+        In incremental mode, sources that failed or missed the deadline keep
+        their previous records, and only files whose projects changed are
+        rewritten. Nothing is written when nothing changed.
+        """
         # Get repositories from all enabled sources
         all_projects = []
         stats = {
@@ -506,32 +556,54 @@ class PortfolioUpdater:
         
         # Define the order of sources to process
         sources = [
-            ("GitHub", self._get_github_repos),
-            ("GitLab", self._get_gitlab_repos),
-            ("npm", self._get_npm_packages),
-            ("PyPI", self._get_pypi_packages),
-            ("Docker Hub", self._get_dockerhub_repos),
-            ("Hugging Face", self._get_huggingface_models),
-            ("Packagist", self._get_packagist_packages)
+            ("GitHub", "github", self._get_github_repos),
+            ("GitLab", "gitlab", self._get_gitlab_repos),
+            ("npm", "npm", self._get_npm_packages),
+            ("PyPI", "pypi", self._get_pypi_packages),
+            ("Docker Hub", "dockerhub", self._get_dockerhub_repos),
+            ("Hugging Face", "huggingface", self._get_huggingface_models),
+            ("Packagist", "packagist", self._get_packagist_packages)
         ]
         
         print("\n🚀 Starting portfolio update...")
         print("=" * 50)
-        
-        for source_name, fetch_func in sources:
-            try:
-                print(f"\n🔄 Fetching {source_name} projects...")
-                projects = fetch_func()
-                if projects:
-                    all_projects.extend(projects)
-                    stats["sources"][source_name.lower().replace(" ", "_")] = len(projects)
-                    print(f"✅ Found {len(projects)} {source_name} projects")
-                else:
-                    print(f"ℹ️  No {source_name} projects found or error occurred")
-            except Exception as e:
-                print(f"❌ Error fetching {source_name} projects: {e}")
+        print(f"🔄 Fetching {len(sources)} sources concurrently "
+              f"(deadline {self.engine.deadline:.0f}s)...")
+        
+        # Fetch all sources at once; slow sources contribute what they have so far
+        results = self.engine.run({key: fetch_func for _, key, fetch_func in sources})
+        self.engine.close()
+        
+        complete_sources = set()
+        for source_name, key, _ in sources:
+            result = results[key]
+            projects = result.items
+            if result.complete:
+                complete_sources.add(key)
+            if result.status == "error":
+                print(f"❌ Error fetching {source_name} projects: {result.error}")
+            elif result.status in ("partial", "timeout"):
+                print(f"⏱️  {source_name} did not finish before the deadline "
+                      f"({len(projects)} projects collected so far)")
+            
+            if projects:
+                all_projects.extend(projects)
+                print(f"✅ Found {len(projects)} {source_name} projects "
+                      f"in {result.elapsed:.2f}s")
+            elif result.complete:
+                print(f"ℹ️  No {source_name} projects found")
+        
+        previous_projects = self.portfolio_data.get("projects", [])
+        if self.incremental:
+            all_projects = merge_projects(previous_projects, all_projects,
+                                          complete_sources)
         
         # Update stats
+        stat_keys = {key: source_name.lower().replace(" ", "_")
+                     for source_name, key, _ in sources}
+        for project in all_projects:
+            stat_key = stat_keys.get(project.get("source"), project.get("source"))
+            stats["sources"][stat_key] = stats["sources"].get(stat_key, 0) + 1
         stats["total_projects"] = len(all_projects)
         
         # Sort projects by update date (newest first)
@@ -540,16 +612,33 @@ class PortfolioUpdater:
             reverse=True
         )
         
+        self.changes = diff_projects(previous_projects, all_projects)
+        print(f"\n📝 Changes since last update: {self.changes.summary()}")
+        if self.incremental and self.changes.empty:
+            print("✨ Portfolio is up to date, nothing to write")
+            return
+        
         # Update the portfolio data
+        self.portfolio_data["last_updated"] = datetime.utcnow().isoformat()
         self.portfolio_data["projects"] = all_projects
         self.portfolio_data["stats"] = stats
         
         # Save the updated portfolio
-        self._save_portfolio()
+        self._save_portfolio(sources=self.changes.sources if self.incremental else None)
+        self._log_changes()
         
         print("\n" + "=" * 50)
         print(f"🎉 Portfolio update complete! Found {len(all_projects)} projects across {len(stats['sources'])} sources")
 
+    def _log_changes(self):
+        """Append the changes of this run to the change log."""
+        if not self.changes or self.changes.empty:
+            return
+        entry = self.changes.to_log_entry(self.portfolio_data.get("last_updated"))
+        with open(CHANGES_LOG, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"📝 Change log appended to {CHANGES_LOG}")
+
 
 def generate_user_portal_data(portfolio_data):
     """Generate separate JSON data for each user portal account."""
@@ -596,11 +685,18 @@ def generate_user_portal_data(portfolio_data):
     
     return accounts
 
-def save_user_portal_data(accounts, output_dir):
-    """Save user portal data to separate JSON files."""
+def save_user_portal_data(accounts, output_dir, sources=None):
+    """Save user portal data to separate JSON files.
+    
+    When ``sources`` is given, only accounts with projects from one of those
+    sources are written.
+    """
     os.makedirs(output_dir, exist_ok=True)
     
     for username, data in accounts.items():
+        if sources is not None and not sources & set(data['sources']):
+            continue
+        
         # Create a clean data structure for this user
         user_data = {
             'username': username,
@@ -617,12 +713,25 @@ def save_user_portal_data(accounts, output_dir):
         filename = f"user_{username.lower().replace('.', '_')}_portfolio.json"
         filepath = os.path.join(output_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(user_data, f, indent=2)
+        write_json(filepath, user_data)
         print(f"✅ User portfolio saved for {username} to {filepath}")
 
 def main():
     """Main function to update the portfolio."""
+    parser = argparse.ArgumentParser(
+        description="Update portfolio repositories from all configured sources.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only rewrite the records and files that changed since the last run"
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="write compact (non-indented) JSON files"
+    )
+    args = parser.parse_args()
+    
     try:
         start_time = time.time()
         
@@ -631,16 +740,20 @@ def main():
         print("=" * 50)
         
         # Initialize and run the updater
-        updater = PortfolioUpdater()
+        updater = PortfolioUpdater(incremental=args.incremental, compact=args.compact)
         updater.update_repositories()
         
-        # Generate user portal data
-        print("\n🔧 Generating user portal data...")
-        accounts = generate_user_portal_data(updater.portfolio_data)
+        # In incremental mode only accounts with changed sources are rewritten
+        changed_sources = updater.changes.sources if args.incremental else None
         
-        # Save user portal data
-        output_dir = os.path.join(os.path.dirname(PORTFOLIO_JSON), 'user_portals')
-        save_user_portal_data(accounts, output_dir)
+        # Generate user portal data
+        if changed_sources is None or changed_sources:
+            print("\n🔧 Generating user portal data...")
+            accounts = generate_user_portal_data(updater.portfolio_data)
+            
+            # Save user portal data
+            output_dir = os.path.join(os.path.dirname(PORTFOLIO_JSON), 'user_portals')
+            save_user_portal_data(accounts, output_dir, sources=changed_sources)
         
         # Calculate and display execution time
         elapsed_time = time.time() - start_time
@@ -2,10 +2,19 @@
 """
 Robust HTTP server to serve static files for the portfolio.
 Automatically finds an available port if the default is in use.
+
+Usage: server.py [PORT] [--prod]
+
+Connections are served by a bounded worker pool with HTTP/1.1 keep-alive
+(HTTP_WORKERS sets the pool size); SIGTERM or Ctrl+C stops accepting and
+lets in-flight requests finish.
+
+With --prod, responses carry strong ETags and are revalidated with 304s,
+precompressed .gz/.br siblings are generated at startup and served to
+clients that accept them, and fingerprinted assets are cached as immutable.
 """
 
 import http.server
-import socketserver
 import os
 import sys
 import socket
@@ -13,61 +22,99 @@ import webbrowser
 from pathlib import Path
 from typing import Tuple, Optional
 
+from digitname.httpd import KeepAliveMixin, PooledHTTPServer, serve
+from digitname.static import (
+    FileCache,
+    ProductionStaticMixin,
+    StaticFileMixin,
+    precompress,
+    url_to_path,
+)
+
 # Configuration
 DEFAULT_PORTS = [8000, 8001, 8002, 8003, 8080, 3000, 5000, 3001, 5001]
 HOST = '0.0.0.0'
+ROOT = Path(__file__).parent
 
-class StaticHandler(http.server.SimpleHTTPRequestHandler):
+# Precompressed at startup in production mode; the root itself only one level deep
+PRECOMPRESS_DIRS = [ROOT / 'static', ROOT / 'views', ROOT / 'data', ROOT / 'assets']
+
+# Route table, resolved once: URL prefix -> directory. Other paths are looked
+# up in views/ first and fall back to the project root.
+ROUTES = [
+    ('/static/', str(ROOT / 'static')),
+    ('/data/', str(ROOT / 'data')),
+]
+ALIASES = {'': '/portfolio.html', '/': '/portfolio.html',
+           '/portfolio': '/portfolio.html'}
+VIEWS_DIR = str(ROOT / 'views')
+ROOT_DIR = str(ROOT)
+CONTENT_TYPES = {'.js': 'application/javascript', '.css': 'text/css',
+                 '.json': 'application/json'}
+
+# Stat results and small files shared by all connections
+FILE_CACHE = FileCache(
+    max_bytes=int(os.getenv('STATIC_CACHE_MB', '32')) << 20,
+    max_file_size=256 << 10,
+    check_interval=1.0
+)
+
+class StaticHandler(KeepAliveMixin, StaticFileMixin,
+                    http.server.SimpleHTTPRequestHandler):
     """Custom handler to serve static files with proper headers."""
     
+    production = False
+    file_cache = FILE_CACHE
+    
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=str(Path(__file__).parent), **kwargs)
+        super().__init__(*args, directory=ROOT_DIR, **kwargs)
     
-    def do_GET(self):
-        # Route requests to the appropriate directory
-        if self.path.startswith('/static/'):
-            self.directory = str(Path(__file__).parent / 'static')
-            self.path = self.path[7:]  # Remove '/static' prefix
-        elif self.path.startswith('/data/'):
-            self.directory = str(Path(__file__).parent / 'data')
-            self.path = self.path[5:]  # Remove '/data' prefix
-        else:
-            # Default to views directory for HTML files
-            if not self.path or self.path == '/' or self.path == '/portfolio':
-                self.path = '/portfolio.html'
-            if not self.path.startswith('/'):
-                self.path = '/' + self.path
-            self.directory = str(Path(__file__).parent / 'views')
-            
-            # If the file doesn't exist, try serving from root
-            if not os.path.exists(os.path.join(self.directory, self.path.lstrip('/'))):
-                self.directory = str(Path(__file__).parent)
+    def translate_path(self, path):
+        """Resolve a request path through the route table."""
+        path = ALIASES.get(path.split('?', 1)[0].split('#', 1)[0], path)
+        for prefix, directory in ROUTES:
+            if path.startswith(prefix):
+                return url_to_path(path[len(prefix) - 1:], directory)
         
-        print(f"Serving {self.path} from {self.directory}")  # Debug log
-        
-        return http.server.SimpleHTTPRequestHandler.do_GET(self)
+        # Default to views directory for HTML files, then the root
+        candidate = url_to_path(path, VIEWS_DIR)
+        if self.stat_file(candidate.rstrip('/')) is not None:
+            return candidate
+        return url_to_path(path, ROOT_DIR)
+    
+    def guess_type(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        return CONTENT_TYPES.get(extension) or super().guess_type(path)
     
     def end_headers(self):
-        # Enable CORS and disable caching
         self.send_header('Access-Control-Allow-Origin', '*')
+        if self.production:
+            # Caching headers are set by ProductionStaticMixin
+            super().end_headers()
+            return
+        
+        # Disable caching during development
         self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
         self.send_header('Pragma', 'no-cache')
         self.send_header('Expires', '0')
-        
-        # Set correct content types
-        if self.path.endswith('.js'):
-            self.send_header('Content-Type', 'application/javascript')
-        elif self.path.endswith('.css'):
-            self.send_header('Content-Type', 'text/css')
-        elif self.path.endswith('.json'):
-            self.send_header('Content-Type', 'application/json')
-            
         super().end_headers()
     
     def log_message(self, format, *args):
         # Custom logging to reduce noise
         pass
 
+class ProductionStaticHandler(ProductionStaticMixin, StaticHandler):
+    """Static handler with ETags, precompressed variants and long-lived caching."""
+    
+    production = True
+
+def precompress_assets() -> None:
+    """Create missing or stale .gz/.br siblings of the served text assets."""
+    roots = [d for d in PRECOMPRESS_DIRS if d.is_dir()]
+    written = precompress(roots)
+    written += precompress([ROOT], recursive=False)
+    print(f"🗜️  Precompressed {len(written)} asset variant(s)")
+
 def is_port_available(port: int) -> bool:
     """Check if a port is available."""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -91,24 +138,30 @@ def find_available_port(start_port: Optional[int] = None) -> int:
         s.bind((HOST, 0))
         return s.getsockname()[1]
 
-def run_server(port: int, host: str = HOST) -> Tuple[socketserver.TCPServer, int]:
+def run_server(port: int, host: str = HOST,
+               production: bool = False) -> Tuple[PooledHTTPServer, int]:
     """Run the HTTP server on the specified port."""
     handler = StaticHandler
+    if production:
+        handler = ProductionStaticHandler
+        precompress_assets()
     
     # Try to use the requested port, or find an available one
     available_port = find_available_port(port)
     
     try:
-        httpd = socketserver.TCPServer((host, available_port), handler)
-        print(f"\n🚀 Serving portfolio at http://{host}:{available_port}")
+        httpd = PooledHTTPServer((host, available_port), handler)
+        print(f"\n🚀 Serving portfolio at http://{host}:{available_port}"
+              f"{' (production)' if production else ''}")
         print(f"📁 Serving from: {os.getcwd()}")
         print("🛑 Press Ctrl+C to stop\n")
         
         # Try to open the browser automatically
-        try:
-            webbrowser.open(f"http://{host}:{available_port}")
-        except Exception as e:
-            print(f"⚠️  Could not open browser: {e}")
+        if not production:
+            try:
+                webbrowser.open(f"http://{host}:{available_port}")
+            except Exception as e:
+                print(f"⚠️  Could not open browser: {e}")
         
         return httpd, available_port
     except Exception as e:
@@ -120,20 +173,19 @@ if __name__ == '__main__':
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
     
     # Get port from command line or use None to auto-find
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    production = '--prod' in sys.argv[1:]
     try:
-        port = int(sys.argv[1]) if len(sys.argv) > 1 else None
+        port = int(args[0]) if args else None
     except ValueError:
         print("⚠️  Invalid port number. Using automatic port selection.")
         port = None
     
     # Run the server
-    httpd, actual_port = run_server(port if port else 8000)
+    httpd, actual_port = run_server(port if port else 8000, production=production)
     
     try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\n🛑 Server stopped by user")
+        serve(httpd)
     finally:
-        httpd.shutdown()
         httpd.server_close()
         print("👋 Server has been stopped")
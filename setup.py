@@ -23,6 +23,9 @@ setup(
             "flake8>=6.1.0",
             "mypy>=1.4.1",
         ],
+        "images": [
+            "Pillow>=10.0.0",
+        ],
     },
     entry_points={
         "console_scripts": [
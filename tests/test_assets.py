@@ -0,0 +1,57 @@
+"""Tests for fingerprinted static asset export."""
+
+import json
+
+from digitname.assets import MANIFEST_NAME, export_assets, rewrite_references
+from digitname.static import FINGERPRINT_RE
+
+
+def _source(tmp_path):
+    src = tmp_path / "src"
+    (src / "css").mkdir(parents=True)
+    (src / "js").mkdir()
+    (src / "css" / "style.css").write_text("body { color: red; }")
+    (src / "js" / "main.js").write_text("console.log(1);")
+    return src
+
+
+def test_export_fingerprints_and_writes_manifest(tmp_path):
+    """Test that files get content-hashed names listed in the manifest."""
+    src, out = _source(tmp_path), tmp_path / "out"
+    manifest = export_assets(src, out)
+
+    assert set(manifest) == {"static/css/style.css", "static/js/main.js"}
+    for logical, hashed in manifest.items():
+        assert FINGERPRINT_RE.search(hashed)
+        assert (out / hashed).read_bytes() == (src / logical[len("static/"):]).read_bytes()
+    assert json.loads((out / MANIFEST_NAME).read_text()) == manifest
+
+
+def test_export_copies_only_changed_files_and_prunes(tmp_path):
+    """Test that unchanged assets are left alone and replaced ones removed."""
+    src, out = _source(tmp_path), tmp_path / "out"
+    first = export_assets(src, out)
+    js_mtime = (out / first["static/js/main.js"]).stat().st_mtime_ns
+
+    (src / "css" / "style.css").write_text("body { color: blue; }")
+    second = export_assets(src, out)
+
+    assert second["static/js/main.js"] == first["static/js/main.js"]
+    assert (out / second["static/js/main.js"]).stat().st_mtime_ns == js_mtime
+    assert second["static/css/style.css"] != first["static/css/style.css"]
+    assert not (out / first["static/css/style.css"]).exists()
+
+
+def test_rewrite_references():
+    """Test that src/href attributes are mapped, keeping queries and other links."""
+    manifest = {"static/css/style.css": "static/css/style.abcdef1234.css"}
+    html = ('<link href="static/css/style.css?v=1"><link href=\'/static/css/style.css\'>'
+            '<a href="https://example.com/static/css/style.css">x</a>')
+
+    assert rewrite_references(html, manifest) == (
+        '<link href="static/css/style.abcdef1234.css?v=1">'
+        '<link href=\'/static/css/style.abcdef1234.css\'>'
+        '<a href="https://example.com/static/css/style.css">x</a>'
+    )
+    assert rewrite_references('<link href="../static/css/style.css">', manifest, "projects") == \
+        '<link href="../static/css/style.abcdef1234.css">'
@@ -0,0 +1,90 @@
+"""Tests for the on-disk HTTP response cache."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from digitname.cache import CacheEntry, ResponseCache
+from digitname.transport import Transport
+
+
+class _ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b'{"name": "digitname"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ETagHandler)
+    httpd.not_modified = 0
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_not_modified_is_served_from_disk(tmp_path, server):
+    """Test that a 304 revalidation returns the cached body."""
+    transport = Transport(cache=ResponseCache(tmp_path))
+    url = f"http://127.0.0.1:{server.server_address[1]}/repos"
+
+    first = transport.get(url)
+    second = transport.get(url)
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.status_code == 200
+    assert second.json() == {"name": "digitname"}
+    assert server.not_modified == 1
+
+
+def test_entries_survive_reopening(tmp_path):
+    """Test that cached entries are found by a new cache instance."""
+    ResponseCache(tmp_path).put(CacheEntry("https://example.com/a", 200, {"ETag": "x"}, b"body"))
+
+    entry = ResponseCache(tmp_path).get("https://example.com/a")
+
+    assert entry.body == b"body"
+    assert entry.validators() == {"If-None-Match": "x"}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Test that the cache stays within its size bound."""
+    cache = ResponseCache(tmp_path, max_bytes=750)
+    for name in ("a", "b", "c"):
+        cache.put(CacheEntry(f"https://example.com/{name}", 200, {}, b"x" * 150))
+        if name == "b":
+            cache.get("https://example.com/a")
+
+    cache.put(CacheEntry("https://example.com/d", 200, {}, b"x" * 150))
+
+    assert cache.size <= 750
+    assert cache.get("https://example.com/a") is not None
+    assert cache.get("https://example.com/b") is None
+
+
+def test_credentials_vary_the_key(tmp_path):
+    """Test that responses cached under one token are not shared with another."""
+    cache = ResponseCache(tmp_path)
+    cache.put(CacheEntry("https://example.com/a", 200, {}, b"private"), vary="token-a")
+
+    assert cache.get("https://example.com/a", vary="token-b") is None
@@ -0,0 +1,41 @@
+"""Tests for portfolio change detection."""
+
+from digitname.changes import diff_projects, merge_projects
+
+
+def _project(source, name, **fields):
+    return {"source": source, "full_name": name, "name": name.split("/")[-1], **fields}
+
+
+def test_diff_detects_added_updated_and_removed():
+    """Test that projects are matched by (source, full_name)."""
+    old = [_project("github", "u/a", stars=1), _project("github", "u/b"), _project("pypi", "c")]
+    new = [_project("github", "u/a", stars=2), _project("pypi", "c"), _project("npm", "d")]
+
+    changes = diff_projects(old, new)
+
+    assert changes.added == [("npm", "d")]
+    assert changes.updated == [("github", "u/a")]
+    assert changes.removed == [("github", "u/b")]
+    assert changes.sources == {"github", "npm"}
+    assert changes.to_log_entry("now")["removed"] == ["github:u/b"]
+
+
+def test_identical_fetch_has_no_changes():
+    """Test that an unchanged fetch produces an empty diff."""
+    projects = [_project("github", "u/a", stars=1)]
+
+    assert diff_projects(projects, [dict(p) for p in projects]).empty
+
+
+def test_merge_keeps_incomplete_sources():
+    """Test that failed sources keep their previous records."""
+    old = [_project("github", "u/a"), _project("pypi", "c"), _project("pypi", "gone")]
+    new = [_project("github", "u/b"), _project("pypi", "c", version="2")]
+
+    merged = merge_projects(old, new, complete_sources={"github"})
+
+    assert {(p["source"], p["full_name"]) for p in merged} == {
+        ("github", "u/b"), ("pypi", "c"), ("pypi", "gone")
+    }
+    assert next(p for p in merged if p["full_name"] == "c")["version"] == "2"
@@ -0,0 +1,113 @@
+"""Tests for the fake provider APIs."""
+
+import json
+import threading
+
+import pytest
+
+from digitname.fakeapi import FakeProviders, FakeProviderServer, Fixtures
+from digitname.pagination import paginate
+from digitname.portfolio import PortfolioGenerator
+from digitname.transport import Transport
+
+BASE = "http://fake"
+
+
+def _get(providers, target, **headers):
+    status, reply, body = providers.handle(target, headers, BASE)
+    return status, reply, json.loads(body) if body else None
+
+
+@pytest.fixture
+def server():
+    counts = {"github": 250, "gitlab": 45, "huggingface": 120}
+    fixtures = Fixtures("me", counts=counts, orgs=2, org_repos=3)
+    server = FakeProviderServer(("127.0.0.1", 0), FakeProviders(fixtures), workers=4)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.drain(1)
+    server.server_close()
+
+
+def test_fixtures_are_deterministic_and_lazy():
+    """Test that items depend only on seed and index, and touch changes them."""
+    fixtures = Fixtures("me", default_count=1_000_000)
+
+    small = Fixtures("me", default_count=10)
+    assert fixtures.github_repo(999_999) == small.github_repo(999_999)
+    assert fixtures.package_index("pypi", fixtures.name("pypi", 123_456)) == 123_456
+    assert fixtures.package_index("pypi", "other-pypi-00001") is None
+
+    stars = fixtures.github_repo(5)["stargazers_count"]
+    fixtures.touch("github", 5)
+    assert fixtures.github_repo(5)["stargazers_count"] == stars + 1
+
+
+def test_listings_paginate_like_each_provider(server):
+    """Test Link, X-Total-Pages and cursor pagination through the real client."""
+    transport = Transport()
+    urls = server.base_urls()
+
+    def fetch(url):
+        response = transport.get(url)
+        response.raise_for_status()
+        return response
+
+    github, gitlab = urls["GITHUB_BASE_URL"], urls["GITLAB_BASE_URL"]
+    repos = list(paginate(fetch, f"{github}/users/me/repos?per_page=100"))
+    projects = list(paginate(fetch, f"{gitlab}/users/1000/projects?per_page=10"))
+    models = list(paginate(
+        fetch, f"{urls['HUGGINGFACE_BASE_URL']}/models?author=me&limit=50"))
+
+    names = [Fixtures("me").name("github", i) for i in range(250)]
+    assert [repo["name"] for repo in repos] == names
+    assert len(projects) == 45 and len(models) == 120
+    assert server.providers.requests["huggingface"] == 3
+
+
+def test_etag_answers_304_until_the_item_changes():
+    """Test conditional requests against unchanged and touched fixtures."""
+    providers = FakeProviders(Fixtures("me", default_count=3))
+    status, reply, _ = _get(providers, "/dockerhub/repositories/me")
+    assert status == 200
+    conditional = {"If-None-Match": reply["ETag"]}
+
+    assert _get(providers, "/dockerhub/repositories/me", **conditional)[0] == 304
+    providers.fixtures.touch("dockerhub", 1)
+    assert _get(providers, "/dockerhub/repositories/me", **conditional)[0] == 200
+
+
+def test_rate_limit_headers_and_429():
+    """Test the budget countdown, 429 with Retry-After, and free 304 answers."""
+    providers = FakeProviders(Fixtures("me", default_count=3), rate_limit=2,
+                              rate_window=60)
+    listing = "/packagist/users/me/packages.json"
+    status, reply, _ = _get(providers, listing)
+    assert status == 200
+    assert (reply["X-RateLimit-Limit"], reply["X-RateLimit-Remaining"]) == ("2", "1")
+
+    assert _get(providers, listing, **{"If-None-Match": reply["ETag"]})[0] == 304
+    assert _get(providers, listing)[0] == 200
+
+    status, reply, body = _get(providers, listing)
+    assert status == 429
+    assert reply["X-RateLimit-Remaining"] == "0"
+    assert 1 <= int(reply["Retry-After"]) <= 61
+    assert body["message"] == "API rate limit exceeded"
+    # Budgets are per source
+    assert _get(providers, "/pypi/me/json")[0] == 200
+
+
+def test_portfolio_generator_fetches_from_overridden_base_url(server, tmp_path):
+    """Test that the generator's GitHub fetcher follows its configured API root."""
+    generator = PortfolioGenerator({
+        "output_dir": tmp_path / "site", "cache_dir": tmp_path / "cache",
+        "github_api_url": server.base_urls()["GITHUB_BASE_URL"],
+    })
+
+    projects = generator._fetch_github_projects("me")
+
+    assert len(projects) == 250 + 2 * 3
+    owners = {p["owner"] for p in projects if p["owner_type"] == "organization"}
+    assert owners == {"me-org-0", "me-org-1"}
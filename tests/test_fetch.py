@@ -0,0 +1,97 @@
+"""Tests for the concurrent fetch engine."""
+
+import threading
+import time
+
+from digitname.fetch import FetchEngine, fetch_each
+
+
+def test_sources_run_concurrently():
+    """Test that wall-clock time tracks the slowest source, not the sum."""
+    def slow(value):
+        def fetch():
+            time.sleep(0.2)
+            return [value]
+        return fetch
+
+    engine = FetchEngine(max_workers=4)
+    started = time.monotonic()
+    results = engine.run({"a": slow(1), "b": slow(2), "c": slow(3)})
+
+    assert time.monotonic() - started < 0.5
+    assert [r.items for r in results.values()] == [[1], [2], [3]]
+    assert all(r.complete for r in results.values())
+
+
+def test_deadline_keeps_partial_results():
+    """Test that a slow generator contributes the items it produced in time."""
+    def slow_generator():
+        yield "first"
+        time.sleep(1)
+        yield "second"
+
+    engine = FetchEngine(deadline=0.2)
+    results = engine.run({"fast": lambda: ["done"], "slow": slow_generator})
+
+    assert results["fast"].status == "ok"
+    assert results["slow"].status == "partial"
+    assert results["slow"].items == ["first"]
+
+
+def test_errors_are_isolated_per_source():
+    """Test that one failing source does not affect the others."""
+    def broken():
+        raise RuntimeError("boom")
+
+    results = FetchEngine().run({"ok": lambda: [1], "broken": broken})
+
+    assert results["ok"].items == [1]
+    assert results["broken"].status == "error"
+    assert isinstance(results["broken"].error, RuntimeError)
+
+
+def test_submit_respects_per_source_limit():
+    """Test that fanned-out requests never exceed the source's limit."""
+    engine = FetchEngine(max_workers=8, limits={"pypi": 2})
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def request():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+
+    futures = [engine.submit("pypi", request) for _ in range(6)]
+    for future in futures:
+        future.result()
+    engine.close()
+
+    assert max(peak) == 2
+
+
+def test_fetch_each_keeps_order_and_isolates_errors():
+    """Test that per-item failures are reported and skipped, order kept."""
+    def details(name):
+        time.sleep(0.05 if name == "a" else 0.01)
+        if name == "bad":
+            raise ValueError(name)
+        return name.upper()
+
+    failures = []
+    results = list(fetch_each(details, ["a", "bad", "b", "c"], workers=4,
+                              on_error=lambda name, e: failures.append(name)))
+
+    assert results == [("a", "A"), ("b", "B"), ("c", "C")]
+    assert failures == ["bad"]
+
+
+def test_fetch_each_fans_out():
+    """Test that items are fetched concurrently up to the worker count."""
+    started = time.monotonic()
+    list(fetch_each(lambda n: time.sleep(0.1), range(8), workers=8))
+
+    assert time.monotonic() - started < 0.5
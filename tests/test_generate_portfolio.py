@@ -0,0 +1,61 @@
+"""Tests for the single-page site in scripts/generate_portfolio.py."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from digitname.jsonstream import write_json
+from digitname.snapshot import write_snapshot
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import generate_portfolio  # noqa: E402
+
+PORTFOLIO = {
+    "last_updated": "2024-01-01T00:00:00",
+    "projects": [{"name": "a", "source": "github", "stars": 3, "topics": ["x"]}],
+}
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    (tmp_path / "template.html").write_text("{{LAST_UPDATED}}|{{PROJECTS}}")
+    for name, filename in (("TEMPLATE_HTML", "template.html"),
+                           ("OUTPUT_HTML", "index.html")):
+        monkeypatch.setattr(generate_portfolio, name, str(tmp_path / filename))
+    for name, filename in (("PORTFOLIO_JSON", "portfolio.json"),
+                           ("PORTFOLIO_SNAPSHOT", "portfolio.snap")):
+        monkeypatch.setattr(generate_portfolio, name, tmp_path / filename)
+    return tmp_path
+
+
+def test_cards_are_read_from_a_fresh_snapshot(site, monkeypatch):
+    """Test that only the card columns are loaded, and the JSON is left alone."""
+    write_json(site / "portfolio.json", PORTFOLIO)
+    write_snapshot(site / "portfolio.snap", PORTFOLIO)
+    before = (site / "portfolio.json").read_bytes()
+    monkeypatch.setattr(generate_portfolio, "load_portfolio", pytest.fail)
+
+    generate_portfolio.main()
+
+    html = (site / "index.html").read_text()
+    assert html.startswith("2024-01-01T00:00:00|")
+    assert "⭐ 3" in html and ">a</a>" in html and "Source: GITHUB • N/A" in html
+    assert (site / "portfolio.json").read_bytes() == before
+    data = generate_portfolio.load_snapshot(generate_portfolio.CARD_FIELDS)
+    assert set(data["projects"][0]) == set(generate_portfolio.CARD_FIELDS)
+
+
+def test_stale_snapshot_falls_back_to_json(site):
+    """Test that a snapshot older than the JSON is ignored, then rewritten."""
+    write_snapshot(site / "portfolio.snap", {"projects": [{"name": "old"}]})
+    write_json(site / "portfolio.json", PORTFOLIO)
+    stat = (site / "portfolio.snap").stat()
+    os.utime(site / "portfolio.snap", ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+
+    assert generate_portfolio.load_snapshot(["name"]) is None
+    generate_portfolio.main()
+
+    assert ">a</a>" in (site / "index.html").read_text()
+    assert generate_portfolio.load_snapshot(["name"])["projects"] == [{"name": "a"}]
@@ -0,0 +1,106 @@
+"""Tests for the pooled keep-alive HTTP server."""
+
+import http.client
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler
+
+from digitname.httpd import KeepAliveMixin, PooledHTTPServer
+
+
+class Handler(KeepAliveMixin, SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class SlowHandler(KeepAliveMixin, BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(1.0)
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server.server_address[1]
+
+
+def test_keep_alive_reuses_connection(tmp_path):
+    """Test that several requests are served over one HTTP/1.1 connection."""
+    (tmp_path / "a.txt").write_text("hello")
+    server = PooledHTTPServer(("127.0.0.1", 0), partial(Handler, directory=str(tmp_path)), workers=2)
+    port = _start(server)
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        for _ in range(3):
+            connection.request("GET", "/a.txt")
+            response = connection.getresponse()
+            assert response.read() == b"hello"
+            assert response.version == 11
+            assert not response.will_close
+        connection.close()
+    finally:
+        server.shutdown()
+        server.drain(1)
+        server.server_close()
+
+
+def test_slow_client_does_not_block_others_and_drain_waits():
+    """Test concurrent serving and that draining lets in-flight requests finish."""
+    server = PooledHTTPServer(("127.0.0.1", 0), SlowHandler, workers=4)
+    port = _start(server)
+    slow = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    idle = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        idle.request("GET", "/idle")
+        assert idle.getresponse().read() == b"/idle"
+
+        slow.request("GET", "/slow")
+        started = time.monotonic()
+        fast = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        fast.request("GET", "/fast")
+        assert fast.getresponse().read() == b"/fast"
+        assert time.monotonic() - started < 0.4
+
+        server.shutdown()
+        assert server.drain(5)
+        response = slow.getresponse()
+        assert response.read() == b"/slow"
+        assert response.will_close
+    finally:
+        server.server_close()
+        slow.close()
+        idle.close()
+
+
+def test_idle_keep_alive_connections_yield_their_workers():
+    """Test that idle connections holding every worker make way for a new one."""
+    server = PooledHTTPServer(("127.0.0.1", 0), SlowHandler, workers=2)
+    port = _start(server)
+    idle = [http.client.HTTPConnection("127.0.0.1", port, timeout=5) for _ in range(2)]
+    try:
+        for connection in idle:
+            connection.request("GET", "/idle")
+            assert connection.getresponse().read() == b"/idle"
+
+        started = time.monotonic()
+        fresh = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        fresh.request("GET", "/fresh")
+        assert fresh.getresponse().read() == b"/fresh"
+        assert time.monotonic() - started < 1.0
+        fresh.close()
+    finally:
+        server.shutdown()
+        server.drain(1)
+        server.server_close()
+        for connection in idle:
+            connection.close()
@@ -0,0 +1,208 @@
+"""Tests for responsive thumbnail variants."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from digitname.images import (MANIFEST_NAME, DerivativeCache, add_placeholders, add_srcsets, build_variants,
+                              srcsets)
+
+ENTRY = {
+    "variants": [
+        {"file": "a-640w.0123456789.webp", "type": "image/webp", "width": 640, "height": 400},
+        {"file": "a-320w.0123456789.webp", "type": "image/webp", "width": 320, "height": 200},
+        {"file": "a-320w.0123456789.avif", "type": "image/avif", "width": 320, "height": 200},
+    ]
+}
+
+
+def test_srcsets_by_type():
+    """Test that variants become srcset strings per MIME type, narrowest first."""
+    assert srcsets(ENTRY, "v/") == {
+        "image/webp": "v/a-320w.0123456789.webp 320w, v/a-640w.0123456789.webp 640w",
+        "image/avif": "v/a-320w.0123456789.avif 320w",
+    }
+
+
+def test_add_srcsets_updates_matching_records():
+    """Test that records get srcsets by thumbnail file name and lose stale ones."""
+    records = [
+        {"domain": "a.com", "thumbnail": "thumbnails/a.png"},
+        {"domain": "b.com", "thumbnail": "thumbnails/b.png", "thumbnail_srcset": {"image/webp": "x"}},
+    ]
+
+    assert add_srcsets(records, {"a.png": ENTRY}, "v/") == 2
+    assert records[0]["thumbnail_srcset"] == srcsets(ENTRY, "v/")
+    assert "thumbnail_srcset" not in records[1]
+    assert add_srcsets(records, {"a.png": ENTRY}, "v/") == 0
+
+
+def test_add_placeholders():
+    """Test that dimensions, colour and placeholder are copied onto records."""
+    records = [{"thumbnail": "thumbnails/a.png"}]
+    entry = {"width": 800, "height": 600, "color": "#102030", "placeholder": "data:image/webp;base64,AA", "variants": []}
+
+    assert add_placeholders(records, {"a.png": entry}) == 1
+    assert records[0] == {
+        "thumbnail": "thumbnails/a.png",
+        "thumbnail_width": 800,
+        "thumbnail_height": 600,
+        "thumbnail_color": "#102030",
+        "thumbnail_placeholder": "data:image/webp;base64,AA",
+    }
+    assert add_placeholders(records, {}) == 1
+    assert records[0] == {"thumbnail": "thumbnails/a.png"}
+
+
+def test_build_variants_skips_unchanged_sources(tmp_path):
+    """Test that variants are resized without upscaling and rebuilt only on change."""
+    Image = pytest.importorskip("PIL.Image")
+    source = tmp_path / "shot.png"
+    Image.new("RGB", (500, 250), "red").save(source)
+    out = tmp_path / "variants"
+
+    images = build_variants([source], out, widths=(320, 640), formats=("webp",), workers=1)
+    entry = images["shot.png"]
+    assert [(v["width"], v["height"]) for v in entry["variants"]] == [(500, 250), (320, 160)]
+    assert all((out / v["file"]).exists() for v in entry["variants"])
+    assert (out / MANIFEST_NAME).exists()
+    assert (entry["width"], entry["height"], entry["color"]) == (500, 250, "#ff0000")
+    assert entry["placeholder"].startswith("data:image/")
+
+    first = out / entry["variants"][0]["file"]
+    mtime = first.stat().st_mtime_ns
+    assert build_variants([source], out, widths=(320, 640), formats=("webp",), workers=1) == images
+    assert first.stat().st_mtime_ns == mtime
+
+    Image.new("RGB", (500, 250), "blue").save(source)
+    changed = build_variants([source], out, widths=(320, 640), formats=("webp",), workers=1)
+    assert changed["shot.png"]["hash"] != entry["hash"]
+    assert not first.exists()
+
+
+def _cache(tmp_path, **kwargs):
+    Image = pytest.importorskip("PIL.Image")
+    sources = tmp_path / "thumbs"
+    sources.mkdir()
+    Image.new("RGB", (400, 200), "red").save(sources / "a.png")
+    return DerivativeCache(sources, tmp_path / "cache", **kwargs)
+
+
+def test_derivative_cache_renders_each_key_once(tmp_path, monkeypatch):
+    """Test that concurrent first requests for one derivative render it once."""
+    cache = _cache(tmp_path)
+    calls = []
+    render = cache._render
+
+    def slow_render(*args):
+        calls.append(args)
+        time.sleep(0.05)
+        return render(*args)
+
+    monkeypatch.setattr(cache, "_render", slow_render)
+    with ThreadPoolExecutor(8) as pool:
+        paths = set(pool.map(lambda _: cache.get("a.png", 100, "webp"), range(8)))
+
+    assert len(calls) == 1 and len(paths) == 1
+    path = paths.pop()
+    assert path.name.startswith("a-112w.")
+    assert DerivativeCache(cache.source_dir, cache.cache_dir).size == path.stat().st_size
+
+
+def test_derivative_cache_is_bounded(tmp_path):
+    """Test that the least recently used derivatives are evicted."""
+    cache = _cache(tmp_path, max_bytes=1)
+    first = cache.get("a.png", 64, "png")
+    second = cache.get("a.png", 128, "png")
+
+    assert not first.exists() and second.exists()
+    with pytest.raises(FileNotFoundError):
+        cache.get("../a.png", 64)
+
+
+def test_derivative_cache_hits_touch_no_files(tmp_path, monkeypatch):
+    """Test that hits update recency in memory and flush() persists it."""
+    cache = _cache(tmp_path)
+    first = cache.get("a.png", 64, "png")
+    second = cache.get("a.png", 128, "png")
+
+    def utime(*args, **kwargs):
+        raise AssertionError("hit touched the file")
+
+    monkeypatch.setattr("os.utime", utime)
+    assert cache.get("a.png", 64, "png") == first
+    monkeypatch.undo()
+
+    cache.flush()
+    reloaded = DerivativeCache(cache.source_dir, cache.cache_dir)
+    assert list(reloaded._entries) == [second.name, first.name]
+
+
+def test_thumb_endpoint(tmp_path, monkeypatch):
+    """Test that /thumb serves resized images with a validator."""
+    from fastapi.testclient import TestClient
+
+    from digitname import main
+
+    monkeypatch.setattr(main, "thumb_cache", _cache(tmp_path))
+    client = TestClient(main.app)
+
+    response = client.get("/thumb/a.png", params={"w": 100, "fmt": "webp"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    etag = response.headers["etag"]
+    assert client.get("/thumb/a.png", params={"w": 100}, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/thumb/missing.png").status_code == 404
+    assert client.get("/thumb/a.png", params={"fmt": "gif"}).status_code == 422
+
+
+def test_thumb_endpoint_rerenders_an_entry_evicted_after_get(tmp_path, monkeypatch):
+    """Test that a derivative removed between get() and the read is rendered again."""
+    from fastapi.testclient import TestClient
+
+    from digitname import main
+
+    cache = _cache(tmp_path)
+    monkeypatch.setattr(main, "thumb_cache", cache)
+    get = cache.get
+    evicted = []
+
+    def get_then_evict(*args):
+        path = get(*args)
+        if not evicted:
+            evicted.append(path)
+            path.unlink()
+        return path
+
+    monkeypatch.setattr(cache, "get", get_then_evict)
+    response = TestClient(main.app).get("/thumb/a.png", params={"w": 100})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{evicted[0].name}"'
+    assert evicted[0].exists() and cache.size == evicted[0].stat().st_size
+
+
+def test_thumb_endpoint_streams_an_entry_evicted_mid_response(tmp_path, monkeypatch):
+    """Test that unlinking a derivative while it is sent does not cut it short."""
+    from fastapi.testclient import TestClient
+
+    from digitname import main
+
+    cache = _cache(tmp_path)
+    monkeypatch.setattr(main, "thumb_cache", cache)
+    read_chunks = main._read_chunks
+
+    def evict_then_read(file, chunk_size=64 * 1024):
+        path = cache.get("a.png", 100, "webp")
+        expected = path.read_bytes()
+        path.unlink()
+        chunks = b"".join(read_chunks(file, chunk_size=16))
+        assert chunks == expected
+        yield chunks
+
+    monkeypatch.setattr(main, "_read_chunks", evict_then_read)
+    response = TestClient(main.app).get("/thumb/a.png", params={"w": 100})
+
+    assert response.status_code == 200
+    assert int(response.headers["content-length"]) == len(response.content) > 0
@@ -0,0 +1,73 @@
+"""Tests for streaming, atomic portfolio JSON output."""
+
+import json
+
+import pytest
+
+from digitname.jsonstream import write_json, write_portfolio
+
+
+def _portfolio():
+    return {
+        "last_updated": "2024-01-01T00:00:00",
+        "projects": [
+            {"source": "github", "name": "a", "topics": ["x", "y"], "meta": {"stars": 1}},
+            {"source": "pypi", "name": "b", "description": "Zażółć gęślą jaźń", "topics": []},
+            {"source": "github", "name": "c", "homepage": None},
+        ],
+        "stats": {"total_projects": 3, "by_source": {}},
+    }
+
+
+def test_indented_output_matches_json_dump(tmp_path):
+    """Test that indent=2 output is byte-for-byte what json.dump writes."""
+    data = _portfolio()
+    write_portfolio(tmp_path / "portfolio.json", data)
+
+    assert (tmp_path / "portfolio.json").read_text(encoding="utf-8") == json.dumps(data, indent=2)
+    github = [p for p in data["projects"] if p["source"] == "github"]
+    expected = {
+        "source": "github",
+        "last_updated": data["last_updated"],
+        "projects": github,
+        "stats": {"total_projects": 2},
+    }
+    assert (tmp_path / "portfolio_github.json").read_text(encoding="utf-8") == json.dumps(expected, indent=2)
+
+
+def test_selected_sources_and_empty_split_files(tmp_path):
+    """Test that only listed sources are split, including now-empty ones."""
+    data = {"last_updated": None, "projects": [{"source": "github", "name": "a"}]}
+    write_portfolio(tmp_path / "portfolio.json", data, sources={"npm"})
+
+    assert not (tmp_path / "portfolio_github.json").exists()
+    npm = (tmp_path / "portfolio_npm.json").read_text(encoding="utf-8")
+    assert npm == json.dumps(
+        {"source": "npm", "last_updated": None, "projects": [], "stats": {"total_projects": 0}},
+        indent=2,
+    )
+
+
+def test_compact_output_round_trips(tmp_path):
+    """Test that compact output parses back to the same document."""
+    data = _portfolio()
+    written = []
+    write_portfolio(tmp_path / "portfolio.json", data, indent=None,
+                    on_write=lambda source, path: written.append(source))
+
+    text = (tmp_path / "portfolio.json").read_text(encoding="utf-8")
+    assert "\n" not in text
+    assert json.loads(text) == data
+    assert written == ["", "github", "pypi"]
+
+
+def test_failed_write_keeps_previous_files(tmp_path):
+    """Test that an encoding error leaves the existing files untouched."""
+    write_json(tmp_path / "portfolio.json", {"projects": []})
+    data = {"projects": [{"source": "github"}, {"source": "github", "bad": object()}]}
+
+    with pytest.raises(TypeError):
+        write_portfolio(tmp_path / "portfolio.json", data)
+
+    assert json.loads((tmp_path / "portfolio.json").read_text()) == {"projects": []}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["portfolio.json"]
@@ -0,0 +1,69 @@
+"""Tests for automatic pagination."""
+
+import json
+import threading
+from urllib.parse import parse_qsl, urlsplit
+
+from digitname.pagination import paginate, parse_link_header, with_page
+from digitname.transport import Response
+
+BASE = "https://api.example.com/users/me/repos?per_page=2"
+
+
+def _page_number(url):
+    return int(dict(parse_qsl(urlsplit(url).query)).get("page", "1"))
+
+
+def _response(url, items, headers):
+    return Response(200, headers, json.dumps(items).encode(), url)
+
+
+def test_parse_link_header():
+    """Test parsing of GitHub style Link headers."""
+    links = parse_link_header('<https://x/?page=2>; rel="next", <https://x/?page=5>; rel="last"')
+
+    assert links == {"next": "https://x/?page=2", "last": "https://x/?page=5"}
+
+
+def test_with_page_replaces_existing_parameter():
+    """Test that the page parameter is replaced, other parameters kept."""
+    assert with_page("https://x/r?per_page=2&page=1", 3) == "https://x/r?per_page=2&page=3"
+
+
+def test_known_page_count_is_fetched_concurrently_in_order():
+    """Test that rel="last" pages are all fetched and yielded in order."""
+    threads = set()
+
+    def fetch(url):
+        threads.add(threading.get_ident())
+        page = _page_number(url)
+        headers = {}
+        if page == 1:
+            headers["Link"] = f'<{with_page(url, 2)}>; rel="next", <{with_page(url, 4)}>; rel="last"'
+        return _response(url, [page * 10, page * 10 + 1], headers)
+
+    items = list(paginate(fetch, BASE, workers=3))
+
+    assert items == [10, 11, 20, 21, 30, 31, 40, 41]
+    assert len(threads) > 1
+
+
+def test_gitlab_total_pages_header():
+    """Test that X-Total-Pages drives pagination."""
+    def fetch(url):
+        page = _page_number(url)
+        return _response(url, [page], {"X-Total-Pages": "3"})
+
+    assert list(paginate(fetch, BASE)) == [1, 2, 3]
+
+
+def test_cursor_links_are_followed_sequentially():
+    """Test that APIs without a page count are walked through next links."""
+    def fetch(url):
+        cursor = dict(parse_qsl(urlsplit(url).query)).get("cursor", "a")
+        following = {"a": "b", "b": "c"}.get(cursor)
+        headers = {"Link": f'<{BASE}&cursor={following}>; rel="next"'} if following else {}
+        return _response(url, [cursor], headers)
+
+    assert list(paginate(fetch, BASE)) == ["a", "b", "c"]
+    assert list(paginate(fetch, BASE, max_pages=2)) == ["a", "b"]
@@ -0,0 +1,72 @@
+"""Tests for the generated portfolio site layout."""
+
+import pytest
+
+from digitname.portfolio import PortfolioGenerator
+
+
+def _projects(count):
+    return [
+        {"name": f"p{i}", "owner": "me", "owner_type": "user", "description": "d.",
+         "url": f"https://example.com/{i}", "language": "Python", "stars": i, "forks": 0,
+         "updated_at": f"2024-01-{i + 1:02d}T00:00:00Z", "provider": "GitHub", "is_fork": False}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def generate(tmp_path):
+    def run(projects):
+        generator = PortfolioGenerator({
+            "output_dir": tmp_path / "site", "cache_dir": tmp_path / "cache",
+            "page_size": 2, "render_workers": 1,
+        })
+        generator._fetch_github_projects = lambda username: [dict(p) for p in projects]
+        generator.generate({"github": {"username": "me"}})
+        return generator
+    return run
+
+
+def test_paginated_index_and_detail_pages(tmp_path, generate):
+    """Test that projects are split over index pages and get a page each."""
+    generate(_projects(5))
+    site = tmp_path / "site"
+
+    assert (site / "index.html").exists()
+    assert sorted(p.name for p in (site / "page").iterdir()) == ["2.html", "3.html"]
+    assert len(list((site / "projects").iterdir())) == 5
+
+    page = (site / "page" / "2.html").read_text()
+    assert 'href="../projects/github-me-p2.html"' in page
+    assert 'href="../index.html" class="btn" rel="prev"' in page
+    assert '"../static/css/style.' in page and 'style.css"' not in page
+
+
+def test_regenerate_renders_only_changed_pages(tmp_path, generate):
+    """Test that a one-project change re-renders its detail and index page only."""
+    projects = _projects(5)
+    generate(projects)
+    projects[0]["stars"] = 100
+
+    generator = generate(projects)
+
+    assert sorted(generator.renderer.rendered) == ["page/3.html", "projects/github-me-p0.html"]
+
+
+def test_removed_projects_lose_their_pages(tmp_path, generate):
+    """Test that pages of dropped projects and surplus index pages are deleted."""
+    generate(_projects(5))
+    generate(_projects(2))
+    site = tmp_path / "site"
+
+    assert not (site / "page" / "2.html").exists()
+    assert sorted(p.name for p in (site / "projects").iterdir()) == ["github-me-p0.html", "github-me-p1.html"]
+
+
+def test_default_cache_is_per_output_dir(tmp_path):
+    """Test that generators for different output directories keep separate state."""
+    one = PortfolioGenerator({"output_dir": tmp_path / "one"})
+    two = PortfolioGenerator({"output_dir": tmp_path / "two"})
+
+    assert one.cache_dir != two.cache_dir
+    assert tmp_path / "one" not in one.cache_dir.parents
@@ -0,0 +1,62 @@
+"""Tests for project filtering, sorting and cursor pagination."""
+
+import pytest
+
+from digitname.query import ProjectIndex
+
+
+def _projects():
+    return [
+        {"name": "alpha", "source": "github", "language": "Python", "stars": 50,
+         "updated_at": "2024-03-01T00:00:00Z", "topics": ["cli"]},
+        {"name": "beta", "source": "github", "language": "Rust", "stars": 5,
+         "updated_at": "2023-01-01T00:00:00Z", "description": "Fast parser"},
+        {"name": "gamma", "source": "pypi", "language": "Python", "stars": 20,
+         "updated_at": "2024-06-01T00:00:00Z"},
+        {"name": "delta", "source": "npm", "stars": None, "updated_at": ""},
+    ]
+
+
+def _names(result):
+    return [p["name"] for p in result.items]
+
+
+def test_filters_and_default_sort():
+    """Test equality, range and text filters against the default -stars order."""
+    index = ProjectIndex(_projects())
+
+    assert _names(index.query()) == ["alpha", "gamma", "beta", "delta"]
+    assert _names(index.query(source="github")) == ["alpha", "beta"]
+    assert _names(index.query(source="github,pypi", language="python")) == ["alpha", "gamma"]
+    assert _names(index.query(min_stars=10)) == ["alpha", "gamma"]
+    assert _names(index.query(updated_since="2024-01-01", sort="-updated")) == ["gamma", "alpha"]
+    assert _names(index.query(q="PARSER")) == ["beta"]
+    assert _names(index.query(q="cli", min_stars=10, sort="name")) == ["alpha"]
+    assert index.query(min_stars=10).total == 2
+
+
+def test_cursor_pagination():
+    """Test that pages resume where the previous one stopped."""
+    index = ProjectIndex(_projects(), version="v1")
+
+    first = index.query(sort="name", limit=3)
+    assert _names(first) == ["alpha", "beta", "delta"]
+    assert first.total == 4
+
+    second = index.query(sort="name", limit=3, cursor=first.next_cursor)
+    assert _names(second) == ["gamma"]
+    assert second.next_cursor is None
+
+
+def test_bad_cursor_and_sort():
+    """Test that stale or mismatched cursors and unknown sorts are rejected."""
+    cursor = ProjectIndex(_projects(), version="v1").query(limit=1).next_cursor
+
+    with pytest.raises(ValueError):
+        ProjectIndex(_projects(), version="v2").query(limit=1, cursor=cursor)
+    with pytest.raises(ValueError):
+        ProjectIndex(_projects(), version="v1").query(sort="name", cursor=cursor)
+    with pytest.raises(ValueError):
+        ProjectIndex(_projects()).query(sort="size")
+    with pytest.raises(ValueError):
+        ProjectIndex(_projects()).query(cursor="garbage")
@@ -0,0 +1,98 @@
+"""Tests for rate limiting and retries."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from digitname.ratelimit import (RateLimiter, RateLimitExceeded, RetryPolicy, TokenBucket,
+                                 parse_retry_after)
+from digitname.transport import Transport
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.hits += 1
+        if self.server.hits == 1:
+            self.send_response(503)
+        elif self.server.hits == 2:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+        else:
+            self.send_response(200)
+            self.send_header("X-RateLimit-Remaining", "41")
+            self.send_header("X-RateLimit-Reset", str(int(time.time()) + 60))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    httpd.hits = 0
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_parse_retry_after():
+    """Test delta-seconds and HTTP-date forms of Retry-After."""
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now=1445412470) == 10
+    assert parse_retry_after(None) is None
+
+
+def test_bucket_waits_for_reset_when_budget_is_spent():
+    """Test that an exhausted budget holds requests until the window resets."""
+    bucket = TokenBucket(rate=100, capacity=10)
+    bucket.update(remaining=1, reset_at=time.time() + 1)
+
+    bucket.acquire()
+    started = time.monotonic()
+    bucket.acquire()
+
+    assert time.monotonic() - started > 0.2
+
+
+def test_bucket_fails_fast_beyond_max_wait():
+    """Test that a far-away reset raises instead of blocking."""
+    bucket = TokenBucket(rate=100, capacity=10)
+    bucket.update(remaining=0, reset_at=time.time() + 3600)
+
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire(max_wait=5)
+
+
+def test_retry_policy_is_bounded():
+    """Test which responses are retried and that attempts are capped."""
+    policy = RetryPolicy(max_attempts=3)
+
+    assert policy.should_retry(0, 503)
+    assert policy.should_retry(0, None)
+    assert not policy.should_retry(0, 404)
+    assert not policy.should_retry(0, 403)
+    assert policy.should_retry(0, 403, retry_after=10)
+    assert not policy.should_retry(0, 429, retry_after=3600)
+    assert not policy.should_retry(2, 503)
+    assert all(0 <= policy.backoff(n) <= policy.max_delay for n in range(10))
+
+
+def test_transport_retries_transient_failures(server):
+    """Test that 503 and 429 responses are retried and headers learned."""
+    limiter = RateLimiter()
+    transport = Transport(rate_limiter=limiter, retry=RetryPolicy(base_delay=0.01))
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    response = transport.get(url)
+
+    assert response.status_code == 200
+    assert server.hits == 3
+    assert limiter.bucket(url)._budget == 41
+    transport.close()
@@ -0,0 +1,92 @@
+"""Tests for dependency-tracked incremental rendering."""
+
+from jinja2 import DictLoader, Environment
+
+from digitname.render import IncrementalRenderer, RenderJob
+
+
+def _env(templates):
+    return Environment(loader=DictLoader(templates))
+
+
+TEMPLATES = {
+    "base.html": "<title>{{ title }}</title>{% block body %}{% endblock %}<p>{{ built }}</p>",
+    "page.html": "{% extends 'base.html' %}{% block body %}{{ project.name }}{% endblock %}",
+}
+
+
+def _render(tmp_path, env, context, **kwargs):
+    renderer = IncrementalRenderer(env, tmp_path / "out", tmp_path / "state.json", volatile={"built"}, **kwargs)
+    rendered = renderer.render("page.html", "p/a.html", context)
+    renderer.save()
+    return rendered
+
+
+def test_dependencies_follow_extends():
+    """Test that variables of parent templates are tracked too."""
+    renderer = IncrementalRenderer(_env(TEMPLATES), "out", "state.json")
+    templates, variables = renderer.dependencies("page.html")
+
+    assert set(templates) == {"page.html", "base.html"}
+    assert variables == {"title", "project", "built"}
+
+
+def test_skips_unchanged_outputs(tmp_path):
+    """Test that only changes to used inputs trigger a re-render."""
+    env = _env(dict(TEMPLATES))
+    context = {"title": "T", "project": {"name": "a"}, "built": 1, "unused": [1]}
+
+    assert _render(tmp_path, env, context)
+    assert (tmp_path / "out" / "p" / "a.html").read_text() == "<title>T</title>a<p>1</p>"
+    assert not _render(tmp_path, env, dict(context, built=2, unused=[2]))
+    assert _render(tmp_path, env, dict(context, project={"name": "b"}))
+
+    env.loader.mapping["base.html"] = "{% block body %}{% endblock %}!"
+    assert _render(tmp_path, env, dict(context, project={"name": "b"}))
+    assert (tmp_path / "out" / "p" / "a.html").read_text() == "b!"
+
+
+def test_identical_output_is_not_rewritten(tmp_path):
+    """Test that re-rendering to the same bytes leaves the file untouched."""
+    env = _env(TEMPLATES)
+    context = {"title": "T", "project": {"name": "a"}, "built": 1}
+    _render(tmp_path, env, context)
+    output = tmp_path / "out" / "p" / "a.html"
+    inode = output.stat().st_ino
+
+    assert _render(tmp_path, env, context, enabled=False)
+    assert output.stat().st_ino == inode
+
+
+def _pool_env():
+    return _env(TEMPLATES)
+
+
+def test_render_all_on_process_pool(tmp_path, monkeypatch):
+    """Test that a batch rendered by worker processes is written and recorded."""
+    monkeypatch.setattr("digitname.render.PARALLEL_THRESHOLD", 1)
+    renderer = IncrementalRenderer(_pool_env(), tmp_path / "out", tmp_path / "state.json")
+    jobs = [
+        RenderJob("page.html", f"p/{i}.html", {"title": "T", "project": {"name": str(i)}, "built": 1})
+        for i in range(4)
+    ]
+
+    rendered = renderer.render_all(jobs, workers=2, env_factory=_pool_env)
+
+    assert sorted(rendered) == [f"p/{i}.html" for i in range(4)]
+    assert (tmp_path / "out" / "p" / "3.html").read_text() == "<title>T</title>3<p>1</p>"
+    assert renderer.render_all(jobs, workers=2, env_factory=_pool_env) == []
+
+
+def test_state_of_another_output_dir_is_ignored(tmp_path):
+    """Test that a shared state file never skips or prunes pages of another tree."""
+    context = {"title": "T", "project": {"name": "a"}, "built": 1}
+    first = IncrementalRenderer(_env(TEMPLATES), tmp_path / "one", tmp_path / "state.json")
+    first.render("page.html", "p/a.html", context)
+    first.save()
+
+    second = IncrementalRenderer(_env(TEMPLATES), tmp_path / "two", tmp_path / "state.json")
+    assert second.render("page.html", "p/a.html", context)
+    assert (tmp_path / "two" / "p" / "a.html").exists()
+    assert second.prune([]) == ["p/a.html"]
+    assert (tmp_path / "one" / "p" / "a.html").exists()
@@ -0,0 +1,81 @@
+"""Tests for the full-text search index."""
+
+import json
+import time
+from pathlib import Path
+
+from digitname.search import build_index, fold, tokenize
+
+DATA_JSON = Path(__file__).parent.parent / "data.json"
+
+
+def test_tokenizer_folds_polish_diacritics():
+    """Test that diacritics, including ł, fold to ASCII."""
+    assert fold("Prywatności ŁÓDŹ moduł") == "prywatnosci lodz modul"
+    assert tokenize("Three.js, Node.js & Zażółć!") == ["three", "js", "node", "js", "zazolc"]
+
+
+def test_ranking_and_prefix():
+    """Test BM25 ranking, field weights, prefix matching and type filters."""
+    index = build_index(
+        [
+            {"domain": "anonimizacja.pl", "keywords": ["prywatności", "danych"],
+             "description": "Ochrona danych"},
+            {"domain": "example.com", "description": "Notes about prywatności"},
+        ],
+        [{"name": "parser", "description": "Fast moduł parser", "language": "Rust"}],
+    )
+
+    hits = index.search("prywatnosci")
+    assert [h.record.get("domain") for h in hits] == ["anonimizacja.pl", "example.com"]
+    assert hits[0].score > hits[1].score
+
+    assert index.search("pryw")[0].record["domain"] == "anonimizacja.pl"
+    assert index.search("pryw", prefix=False) == []
+    assert [h.record["name"] for h in index.search("modul", kind="project")] == ["parser"]
+    assert index.search("   ") == []
+
+
+def test_type_filter_applies_before_the_postings_cap(monkeypatch):
+    """Test that a filtered query finds matches ranked past the cut."""
+    monkeypatch.setattr("digitname.search.MAX_POSTINGS", 5)
+    index = build_index(
+        [{"domain": f"web{i}.pl", "keywords": ["web"]} for i in range(10)],
+        [{"name": "tool", "description": "A web scraper and more words"}],
+    )
+
+    assert [h.record["name"] for h in index.search("web", kind="project")] == ["tool"]
+    assert len(index.search("web", limit=20, prefix=False)) == 5
+
+
+def test_search_over_repository_data_is_fast():
+    """Test lookups over data.json stay well under a millisecond each."""
+    domains = json.loads(DATA_JSON.read_text(encoding="utf-8"))
+    index = build_index(domains * 200, [])
+
+    assert index.search("anonimizacja")[0].record["domain"] == "anonimizacja.pl"
+    started = time.perf_counter()
+    for _ in range(100):
+        index.search("ochrona dan", limit=10)
+    assert (time.perf_counter() - started) / 100 < 0.05
+
+
+def test_search_endpoint(tmp_path, monkeypatch):
+    """Test /api/search over both files."""
+    from fastapi.testclient import TestClient
+
+    from digitname import main
+    from digitname.search import SearchService
+    from digitname.store import PortfolioStore
+
+    (tmp_path / "portfolio.json").write_text(json.dumps({"projects": [{"name": "anonymizer"}]}))
+    (tmp_path / "data.json").write_text(json.dumps([{"domain": "anonimizacja.pl"}]))
+    service = SearchService(PortfolioStore(tmp_path / "portfolio.json", check_interval=0),
+                            PortfolioStore(tmp_path / "data.json", check_interval=0))
+    monkeypatch.setattr(main, "search_service", service)
+    client = TestClient(main.app)
+
+    results = client.get("/api/search", params={"q": "anon"}).json()["results"]
+    assert {r["type"] for r in results} == {"domain", "project"}
+    only = client.get("/api/search", params={"q": "anon", "type": "project"}).json()["results"]
+    assert [r["name"] for r in only] == ["anonymizer"]
@@ -0,0 +1,61 @@
+"""Tests for the columnar portfolio snapshot."""
+
+import pytest
+
+from digitname.snapshot import Snapshot, SnapshotError, write_snapshot
+
+
+def _portfolio():
+    return {
+        "last_updated": "2024-01-01T00:00:00",
+        "projects": [
+            {"name": "a", "source": "github", "stars": 12, "fork": False,
+             "topics": ["x"], "score": 0.5},
+            {"name": "b", "source": "pypi", "stars": None, "fork": True,
+             "description": "Zażółć gęślą jaźń"},
+            {"name": "c", "source": "github", "stars": 3, "score": 1.5},
+        ],
+        "stats": {"total_projects": 3},
+    }
+
+
+def test_round_trip(tmp_path):
+    """Test that every field reads back, with missing fields as None."""
+    data = _portfolio()
+    write_snapshot(tmp_path / "portfolio.snap", data)
+
+    with Snapshot(tmp_path / "portfolio.snap") as snap:
+        assert len(snap) == 3
+        assert snap.meta == {"last_updated": data["last_updated"], "stats": data["stats"]}
+        projects = snap.to_portfolio()["projects"]
+
+    for original, loaded in zip(data["projects"], projects):
+        assert {k: v for k, v in loaded.items() if v is not None} == \
+            {k: v for k, v in original.items() if v is not None}
+
+
+def test_selected_columns(tmp_path):
+    """Test that only the requested columns are loaded."""
+    write_snapshot(tmp_path / "portfolio.snap", _portfolio())
+
+    with Snapshot(tmp_path / "portfolio.snap") as snap:
+        assert snap.column("stars") == [12, None, 3]
+        assert snap.column("fork") == [False, True, None]
+        rows = list(snap.rows(["name", "stars", "missing"]))
+        stars = snap.raw("stars")
+        assert list(stars)[0] == 12
+        stars.release()
+
+    assert rows[0] == {"name": "a", "stars": 12, "missing": None}
+
+
+def test_empty_portfolio_and_bad_file(tmp_path):
+    """Test an empty project list and a file that is not a snapshot."""
+    write_snapshot(tmp_path / "empty.snap", {"projects": []})
+    with Snapshot(tmp_path / "empty.snap") as snap:
+        assert len(snap) == 0
+        assert snap.columns == []
+
+    (tmp_path / "bad.snap").write_bytes(b"{}" * 32)
+    with pytest.raises(SnapshotError):
+        Snapshot(tmp_path / "bad.snap")
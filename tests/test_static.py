@@ -0,0 +1,189 @@
+"""Tests for production static file serving."""
+
+import gzip
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from digitname import static
+from digitname.static import (
+    FileCache,
+    ProductionStaticMixin,
+    StaticFileMixin,
+    accepted_encodings,
+    parse_range,
+    precompress,
+    url_to_path,
+)
+
+
+class Handler(ProductionStaticMixin, SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class PlainHandler(StaticFileMixin, SimpleHTTPRequestHandler):
+    file_cache = FileCache()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(params=[Handler])
+def site(request, tmp_path):
+    (tmp_path / "app.js").write_text("console.log('hello');\n" * 100)
+    (tmp_path / "style.0123abcd89.css").write_text("body { color: red; }\n")
+    (tmp_path / "image.bin").write_bytes(bytes(range(256)) * 64)
+    handler = partial(request.param, directory=str(tmp_path))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield tmp_path, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url, **headers):
+    try:
+        with urlopen(Request(url, headers=headers)) as response:
+            return response.status, response.headers, response.read()
+    except HTTPError as e:
+        return e.code, e.headers, b""
+
+
+def test_etag_and_not_modified(site):
+    """Test strong ETags, 304 revalidation and cache headers."""
+    root, base = site
+    status, headers, body = _get(f"{base}/app.js")
+    assert status == 200
+    assert body == (root / "app.js").read_bytes()
+    assert headers["Cache-Control"] == "no-cache"
+
+    status, _, body = _get(f"{base}/app.js", **{"If-None-Match": headers["ETag"]})
+    assert (status, body) == (304, b"")
+    status, _, _ = _get(f"{base}/app.js", **{"If-None-Match": f'"x", W/{headers["ETag"]}'})
+    assert status == 304
+
+    _, headers, _ = _get(f"{base}/style.0123abcd89.css")
+    assert "immutable" in headers["Cache-Control"]
+
+
+def test_precompressed_variant(site):
+    """Test that a fresh .gz sibling is served to clients accepting gzip."""
+    root, base = site
+    written = precompress([root])
+    assert str(root / "app.js.gz") in written
+    assert precompress([root]) == []
+
+    status, headers, body = _get(f"{base}/app.js", **{"Accept-Encoding": "br;q=0, gzip"})
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == (root / "app.js").read_bytes()
+
+    _, headers, _ = _get(f"{base}/app.js")
+    assert "Content-Encoding" not in headers
+
+
+def test_accepted_encodings():
+    """Test parsing of Accept-Encoding."""
+    assert accepted_encodings("gzip, deflate, br;q=0") == ["gzip", "deflate"]
+    assert accepted_encodings(None) == []
+
+
+@pytest.mark.parametrize("site", [Handler, PlainHandler], indirect=True)
+def test_range_requests(site):
+    """Test 206 partial content, suffix ranges and unsatisfiable ranges."""
+    root, base = site
+    data = (root / "image.bin").read_bytes()
+
+    status, headers, body = _get(f"{base}/image.bin")
+    assert (status, body) == (200, data)
+    assert headers["Accept-Ranges"] == "bytes"
+
+    status, headers, body = _get(f"{base}/image.bin", Range="bytes=100-199")
+    assert (status, body) == (206, data[100:200])
+    assert headers["Content-Range"] == f"bytes 100-199/{len(data)}"
+
+    status, _, body = _get(f"{base}/image.bin", Range="bytes=-10")
+    assert (status, body) == (206, data[-10:])
+
+    status, headers, _ = _get(f"{base}/image.bin", Range=f"bytes={len(data)}-")
+    assert status == 416
+    assert headers["Content-Range"] == f"bytes */{len(data)}"
+
+    status, _, body = _get(f"{base}/image.bin", Range="bytes=0-9", **{"If-Range": '"stale"'})
+    assert (status, body) == (200, data)
+
+
+def test_parse_range():
+    """Test Range header parsing edge cases."""
+    assert parse_range("bytes=0-", 10) == (0, 9)
+    assert parse_range("bytes=5-100", 10) == (5, 9)
+    assert parse_range("bytes=0-1,4-5", 10) is None
+    assert parse_range("items=0-1", 10) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=-0", 10)
+
+
+def test_file_cache_serves_from_memory_until_checked(tmp_path):
+    """Test that stat results and contents are reused until the interval passes."""
+    path = tmp_path / "page.html"
+    path.write_text("v1")
+    cache = FileCache(check_interval=3600)
+
+    stat = cache.stat(str(path))
+    assert cache.read(str(path), stat) == b"v1"
+
+    path.unlink()
+    assert cache.stat(str(path)) is stat
+    assert cache.read(str(path), stat) == b"v1"
+
+    path.write_text("version 2")
+    cache.check_interval = 0
+    fresh = cache.stat(str(path))
+    assert cache.read(str(path), fresh) == b"version 2"
+    assert cache.stat(str(tmp_path / "missing")) is None
+
+
+def test_file_cache_bounds(tmp_path):
+    """Test the LRU byte budget and the per-file size limit."""
+    cache = FileCache(max_bytes=10, max_file_size=8)
+    paths = []
+    for name in "abc":
+        path = tmp_path / name
+        path.write_bytes(name.encode() * 5)
+        paths.append(str(path))
+        cache.read(str(path), cache.stat(str(path)))
+
+    assert list(cache._contents) == paths[1:]
+    big = tmp_path / "big"
+    big.write_bytes(b"x" * 9)
+    assert cache.read(str(big), cache.stat(str(big))) is None
+
+
+def test_file_etags_are_bounded(tmp_path, monkeypatch):
+    """Test that remembered ETags are capped, least recently used first."""
+    monkeypatch.setattr(static, "_etags", static.OrderedDict())
+    monkeypatch.setattr(static, "MAX_ETAGS", 2)
+    paths = []
+    for name in "abc":
+        (tmp_path / name).write_text(name)
+        paths.append(str(tmp_path / name))
+
+    static.file_etag(paths[0])
+    static.file_etag(paths[1])
+    static.file_etag(paths[0])
+    static.file_etag(paths[2])
+
+    assert [key[0] for key in static._etags] == [paths[0], paths[2]]
+
+
+def test_url_to_path_stays_in_base():
+    """Test that request paths cannot escape the served directory."""
+    assert url_to_path("/a/../../etc/passwd?x=1", "/srv") == "/srv/etc/passwd"
+    assert url_to_path("/dir/", "/srv") == "/srv/dir/"
+    assert url_to_path("/a%20b.txt", "/srv") == "/srv/a b.txt"
@@ -0,0 +1,114 @@
+"""Tests for the in-memory portfolio store."""
+
+import asyncio
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from digitname import main
+from digitname.store import NOT_FOUND, PortfolioStore
+
+
+def _write(path, data):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def test_store_loads_once_and_hot_reloads(tmp_path):
+    """Test that the file is reloaded only after it is replaced."""
+    path = tmp_path / "portfolio.json"
+    store = PortfolioStore(path, check_interval=0)
+    assert store.get().data == NOT_FOUND
+    assert not store.get().found
+
+    _write(path, {"projects": [{"name": "a"}]})
+    first = store.get()
+    assert first.data == {"projects": [{"name": "a"}]}
+    assert json.loads(first.body) == first.data
+    assert store.get() is first
+
+    _write(path, {"projects": [{"name": "b"}]})
+    assert store.get().data == {"projects": [{"name": "b"}]}
+    assert store.get().etag != first.etag
+
+
+def test_store_keeps_last_good_copy(tmp_path, caplog):
+    """Test that an unparsable file does not replace the loaded data."""
+    path = tmp_path / "portfolio.json"
+    _write(path, {"projects": []})
+    store = PortfolioStore(path, check_interval=0)
+    good = store.get()
+
+    path.write_text("{not json")
+    assert store.get() is good
+    assert "Could not reload" in caplog.text
+
+
+def test_check_interval_skips_stat(tmp_path):
+    """Test that changes are picked up only once the interval passed."""
+    path = tmp_path / "portfolio.json"
+    _write(path, {"projects": []})
+    store = PortfolioStore(path, check_interval=3600)
+    store.get()
+
+    _write(path, {"projects": [{"name": "a"}]})
+    assert store.get().data == {"projects": []}
+    assert store.refresh().data == {"projects": [{"name": "a"}]}
+
+
+def test_portfolio_endpoint(tmp_path, monkeypatch):
+    """Test the pre-serialised response and conditional requests."""
+    path = tmp_path / "portfolio.json"
+    _write(path, {"projects": [{"name": "zażółć"}]})
+    monkeypatch.setattr(main, "portfolio_store", PortfolioStore(path, check_interval=0))
+    client = TestClient(main.app)
+
+    response = client.get("/api/portfolio")
+    assert response.status_code == 200
+    assert response.json() == {"projects": [{"name": "zażółć"}]}
+
+    cached = client.get("/api/portfolio", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_projects_endpoint(tmp_path, monkeypatch):
+    """Test filtering and rejected parameters on /api/projects."""
+    path = tmp_path / "portfolio.json"
+    _write(path, {"projects": [
+        {"name": "a", "source": "github", "stars": 3},
+        {"name": "b", "source": "pypi", "stars": 7},
+    ]})
+    monkeypatch.setattr(main, "portfolio_store", PortfolioStore(path, check_interval=0))
+    client = TestClient(main.app)
+
+    body = client.get("/api/projects", params={"source": "pypi"}).json()
+    assert [p["name"] for p in body["projects"]] == ["b"]
+    assert body["total"] == 1
+    assert client.get("/api/projects", params={"sort": "size"}).status_code == 400
+
+
+def test_reloads_run_off_the_event_loop(tmp_path, monkeypatch):
+    """Test that the data routes reload on the thread pool, not the event loop."""
+    path = tmp_path / "portfolio.json"
+    _write(path, {"projects": [{"name": "a", "source": "github"}]})
+    store = PortfolioStore(path, check_interval=0)
+    monkeypatch.setattr(main, "portfolio_store", store)
+    monkeypatch.setattr(main.search_service, "portfolio_store", store)
+    on_loop = []
+
+    def refresh(refresh=store.refresh):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return refresh()
+
+    monkeypatch.setattr(store, "refresh", refresh)
+    client = TestClient(main.app)
+    for url in ("/api/portfolio", "/api/projects", "/api/search?q=a"):
+        assert client.get(url).status_code == 200
+
+    assert on_loop and not any(on_loop)
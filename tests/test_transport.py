@@ -0,0 +1,72 @@
+"""Tests for the shared HTTP transport."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from digitname.ratelimit import RetryPolicy
+from digitname.transport import HTTPStatusError, Transport, TransportError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.client_ports.add(self.client_address[1])
+        status = 404 if self.path == "/missing" else 200
+        body = json.dumps({"path": self.path, "agent": self.headers["User-Agent"]}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.client_ports = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_connections_are_reused(server):
+    """Test that sequential requests to one host share a keep-alive connection."""
+    transport = Transport()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    for i in range(5):
+        response = transport.get(f"{base}/item/{i}")
+        assert response.json()["path"] == f"/item/{i}"
+    transport.close()
+
+    assert len(server.client_ports) == 1
+
+
+def test_default_user_agent_and_status_errors(server):
+    """Test default headers and raise_for_status on error responses."""
+    transport = Transport(user_agent="digitname-test")
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    assert transport.get(f"{base}/").json()["agent"] == "digitname-test"
+
+    response = transport.get(f"{base}/missing")
+    with pytest.raises(HTTPStatusError) as excinfo:
+        response.raise_for_status()
+    assert excinfo.value.response.status_code == 404
+    transport.close()
+
+
+def test_connection_failures_raise_transport_error():
+    """Test that unreachable hosts surface as TransportError."""
+    transport = Transport(timeout=1, retry=RetryPolicy(max_attempts=2, base_delay=0.01))
+    with pytest.raises(TransportError):
+        transport.get("http://127.0.0.1:9/")
@@ -0,0 +1,112 @@
+"""Tests for incremental refreshes in scripts/update_portfolio_repos.py."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from digitname.jsonstream import write_json
+from digitname.transport import Response
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import update_portfolio_repos as updater_module  # noqa: E402
+
+GITLAB = "https://gitlab.com/api/v4"
+PACKAGIST = "https://packagist.org"
+
+
+class FakeTransport:
+    """Answers GET requests from ``{url without query: (status, body[, headers])}``."""
+
+    def __init__(self, routes):
+        self.routes = routes
+
+    def get(self, url, headers=None, **kwargs):
+        status, body, *extra = self.routes.get(url.split("?")[0], (404, {}))
+        headers = {"Content-Type": "application/json", **(extra[0] if extra else {})}
+        return Response(status, headers, json.dumps(body).encode(), url)
+
+
+def _project(source, name, **fields):
+    return {"name": name.split("/")[-1], "full_name": name, "source": source,
+            "updated_at": "2024-01-01T00:00:00Z", **fields}
+
+
+@pytest.fixture
+def refresh(tmp_path, monkeypatch):
+    for name, filename in (("PORTFOLIO_JSON", "portfolio.json"),
+                           ("PORTFOLIO_SNAPSHOT", "portfolio.snap"),
+                           ("CHANGES_LOG", "changes.jsonl")):
+        monkeypatch.setattr(updater_module, name, tmp_path / filename)
+    for source, config in updater_module.APIS.items():
+        monkeypatch.delenv(config["username_env"], raising=False)
+        monkeypatch.delenv(f"{source.upper()}_BASE_URL", raising=False)
+
+    def run(previous, routes, **usernames):
+        write_json(tmp_path / "portfolio.json", {"projects": previous})
+        for source, username in usernames.items():
+            monkeypatch.setenv(updater_module.APIS[source]["username_env"], username)
+        updater = updater_module.PortfolioUpdater(incremental=True)
+        updater.transport = FakeTransport(routes)
+        updater.update_repositories()
+        return updater
+    return run
+
+
+def test_failed_listing_keeps_previous_records(refresh, tmp_path):
+    """Test that a 403 on a source's listing is not read as every project removed."""
+    previous = [_project("gitlab", "me/a"), _project("gitlab", "me/b")]
+
+    routes = {f"{GITLAB}/users": (403, {"message": "Forbidden"})}
+
+    updater = refresh(previous, routes, gitlab="me")
+
+    assert updater.changes.empty
+    assert not (tmp_path / "changes.jsonl").exists()
+    assert json.loads((tmp_path / "portfolio.json").read_text())["projects"] == previous
+
+
+def test_failed_package_keeps_its_record(refresh):
+    """Test that one failed detail request leaves that package in place."""
+    previous = [_project("packagist", "me/a", favers=1), _project("packagist", "me/b")]
+    routes = {
+        f"{PACKAGIST}/users/me/packages.json": (
+            200, {"packageNames": ["me/a", "me/b"]}),
+        f"{PACKAGIST}/packages/me/a.json": (
+            200, {"package": {"favers": 2, "versions": {}}}),
+        f"{PACKAGIST}/packages/me/b.json": (500, {}),
+    }
+
+    updater = refresh(previous, routes, packagist="me")
+
+    assert updater.changes.removed == []
+    assert updater.changes.updated == [("packagist", "me/a")]
+    projects = {p["full_name"]: p for p in updater.portfolio_data["projects"]}
+    assert set(projects) == {"me/a", "me/b"} and projects["me/a"]["favers"] == 2
+
+
+def test_page_failing_part_way_keeps_previous_records(refresh):
+    """Test that a listing cut short by a failed page does not remove the rest."""
+    previous = [_project("huggingface", f"me/m{i}") for i in range(3)]
+    models = "https://huggingface.co/api/models"
+    routes = {
+        models: (200, [{"modelId": "me/m0", "lastModified": "2024-01-01T00:00:00Z"}],
+                 {"Link": f'<{models}/next>; rel="next"'}),
+        f"{models}/next": (503, {}),
+    }
+
+    updater = refresh(previous, routes, huggingface="me")
+
+    assert updater.changes.removed == []
+    assert len(updater.portfolio_data["projects"]) == 3
+
+
+def test_pypi_user_without_a_namesake_package_has_none(refresh):
+    """Test that a 404 for the package named after the user means no packages."""
+    previous = [_project("pypi", "me-tools")]
+
+    updater = refresh(previous, {}, pypi="me")
+
+    assert updater.changes.removed == [("pypi", "me-tools")]
+    assert updater.portfolio_data["projects"] == []